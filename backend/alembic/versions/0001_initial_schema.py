@@ -0,0 +1,246 @@
+"""Initial schema
+
+Creates every table as the models defined them before migrations were
+introduced. Databases created earlier by create_all are adopted in
+place: existing tables are kept, and any columns or indexes they are
+missing (e.g. vehicles.trim, image metadata) are added.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _create_table(name: str, *columns: sa.Column, **kwargs) -> None:
+    """Create a table, or add the columns an existing copy is missing."""
+    inspector = sa.inspect(op.get_bind())
+    if name not in inspector.get_table_names():
+        op.create_table(name, *columns, **kwargs)
+        return
+    
+    # Columns added to the models after the table was first created
+    # are all nullable, so a plain ADD COLUMN works on every backend
+    existing = {column["name"] for column in inspector.get_columns(name)}
+    for column in columns:
+        if isinstance(column, sa.Column) and column.name not in existing:
+            op.add_column(name, column)
+
+
+def _create_index(name: str, table: str, columns: list, unique: bool = False) -> None:
+    """Create an index unless it already exists."""
+    inspector = sa.inspect(op.get_bind())
+    if name not in {index["name"] for index in inspector.get_indexes(table)}:
+        op.create_index(name, table, columns, unique=unique)
+
+
+def upgrade() -> None:
+    _create_table(
+        "users",
+        sa.Column("id", sa.String(36), nullable=False),
+        sa.Column("username", sa.String(50), nullable=False),
+        sa.Column("email", sa.String(255), nullable=False),
+        sa.Column("hashed_password", sa.String(255), nullable=False),
+        sa.Column("full_name", sa.String(100), nullable=True),
+        sa.Column("role", sa.Enum("admin", "staff", name="user_role"), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("last_login", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id")
+    )
+    _create_index("ix_users_username", "users", ["username"], unique=True)
+    _create_index("ix_users_email", "users", ["email"], unique=True)
+    
+    _create_table(
+        "brands",
+        sa.Column("id", sa.String(36), nullable=False),
+        sa.Column("name", sa.String(100), nullable=False),
+        sa.Column("logo_url", sa.String(500), nullable=True),
+        sa.Column("display_order", sa.Integer(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.PrimaryKeyConstraint("id")
+    )
+    _create_index("ix_brands_name", "brands", ["name"], unique=True)
+    
+    _create_table(
+        "newsletter_subscribers",
+        sa.Column("id", sa.String(36), nullable=False),
+        sa.Column("email", sa.String(255), nullable=False),
+        sa.Column("subscribed_at", sa.DateTime(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.PrimaryKeyConstraint("id")
+    )
+    _create_index("ix_newsletter_subscribers_email", "newsletter_subscribers", ["email"], unique=True)
+    
+    _create_table(
+        "vehicles",
+        sa.Column("id", sa.String(36), nullable=False),
+        sa.Column("make", sa.String(100), nullable=False),
+        sa.Column("model", sa.String(100), nullable=False),
+        sa.Column("year", sa.Integer(), nullable=False),
+        sa.Column("trim", sa.String(50), nullable=True),
+        sa.Column("price", sa.Float(), nullable=False),
+        sa.Column("currency", sa.Enum("KSH", "USD", "GBP", "JPY", name="currency_type"), nullable=False),
+        sa.Column("mileage", sa.Integer(), nullable=True),
+        sa.Column(
+            "body_type",
+            sa.Enum("SUV", "Sedan", "Hatchback", "Pickup", "Convertible", "Van", "Wagon", "Coupe", name="body_type"),
+            nullable=True
+        ),
+        sa.Column("transmission", sa.Enum("Automatic", "Manual", name="transmission_type"), nullable=True),
+        sa.Column("fuel_type", sa.Enum("Petrol", "Diesel", "Hybrid", "Electric", name="fuel_type"), nullable=True),
+        sa.Column("condition", sa.Enum("Excellent", "Good", "Fair", name="condition_type"), nullable=True),
+        sa.Column("color", sa.String(50), nullable=True),
+        sa.Column("engine_capacity", sa.String(20), nullable=True),
+        sa.Column(
+            "availability_status",
+            sa.Enum("available", "direct_import", "sold", "reserved", name="availability_status"),
+            nullable=False
+        ),
+        sa.Column("location", sa.String(100), nullable=True),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("features", sa.JSON(), nullable=True),
+        sa.Column("is_featured", sa.Boolean(), nullable=True),
+        sa.Column("views_count", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id")
+    )
+    for column in ("make", "model", "year", "trim", "price", "body_type", "transmission",
+                   "fuel_type", "availability_status", "is_featured"):
+        _create_index(f"ix_vehicles_{column}", "vehicles", [column])
+    
+    _create_table(
+        "vehicle_images",
+        sa.Column("id", sa.String(36), nullable=False),
+        sa.Column("vehicle_id", sa.String(36), nullable=False),
+        sa.Column("image_url", sa.String(500), nullable=False),
+        sa.Column("is_primary", sa.Boolean(), nullable=True),
+        sa.Column("display_order", sa.Integer(), nullable=True),
+        sa.Column("uploaded_at", sa.DateTime(), nullable=False),
+        sa.Column("width", sa.Integer(), nullable=True),
+        sa.Column("height", sa.Integer(), nullable=True),
+        sa.Column("placeholder", sa.Text(), nullable=True),
+        sa.ForeignKeyConstraint(["vehicle_id"], ["vehicles.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    _create_index("ix_vehicle_images_vehicle_id", "vehicle_images", ["vehicle_id"])
+    
+    _create_table(
+        "enquiries",
+        sa.Column("id", sa.String(36), nullable=False),
+        sa.Column("vehicle_id", sa.String(36), nullable=True),
+        sa.Column("customer_name", sa.String(100), nullable=False),
+        sa.Column("customer_email", sa.String(255), nullable=False),
+        sa.Column("customer_phone", sa.String(20), nullable=False),
+        sa.Column("message", sa.Text(), nullable=True),
+        sa.Column(
+            "enquiry_type",
+            sa.Enum("purchase", "test_drive", "finance", "general", name="enquiry_type"),
+            nullable=False
+        ),
+        sa.Column(
+            "status",
+            sa.Enum("new", "contacted", "qualified", "closed", name="enquiry_status"),
+            nullable=False
+        ),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("responded_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["vehicle_id"], ["vehicles.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    _create_index("ix_enquiries_vehicle_id", "enquiries", ["vehicle_id"])
+    _create_index("ix_enquiries_status", "enquiries", ["status"])
+    
+    _create_table(
+        "sell_requests",
+        sa.Column("id", sa.String(36), nullable=False),
+        sa.Column("customer_name", sa.String(100), nullable=False),
+        sa.Column("customer_email", sa.String(255), nullable=False),
+        sa.Column("customer_phone", sa.String(20), nullable=False),
+        sa.Column("vehicle_make", sa.String(100), nullable=False),
+        sa.Column("vehicle_model", sa.String(100), nullable=False),
+        sa.Column("vehicle_year", sa.Integer(), nullable=False),
+        sa.Column("mileage", sa.Integer(), nullable=True),
+        sa.Column("condition", sa.String(50), nullable=True),
+        sa.Column("asking_price", sa.Float(), nullable=True),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column(
+            "service_type",
+            sa.Enum("sell_on_behalf", "direct_purchase", name="service_type"),
+            nullable=False
+        ),
+        sa.Column(
+            "status",
+            sa.Enum("pending", "reviewing", "valued", "accepted", "rejected", name="sell_request_status"),
+            nullable=False
+        ),
+        sa.Column("valuation_amount", sa.Float(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id")
+    )
+    _create_index("ix_sell_requests_status", "sell_requests", ["status"])
+    
+    _create_table(
+        "sell_request_images",
+        sa.Column("id", sa.String(36), nullable=False),
+        sa.Column("sell_request_id", sa.String(36), nullable=False),
+        sa.Column("image_url", sa.String(500), nullable=False),
+        sa.Column("uploaded_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["sell_request_id"], ["sell_requests.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    _create_index("ix_sell_request_images_sell_request_id", "sell_request_images", ["sell_request_id"])
+    
+    _create_table(
+        "refresh_tokens",
+        sa.Column("id", sa.String(36), nullable=False),
+        sa.Column("user_id", sa.String(36), nullable=False),
+        sa.Column("token_hash", sa.String(64), nullable=False),
+        sa.Column("family_id", sa.String(36), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+        sa.Column("revoked_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    _create_index("ix_refresh_tokens_user_id", "refresh_tokens", ["user_id"])
+    _create_index("ix_refresh_tokens_token_hash", "refresh_tokens", ["token_hash"], unique=True)
+    _create_index("ix_refresh_tokens_family_id", "refresh_tokens", ["family_id"])
+    
+    _create_table(
+        "revoked_tokens",
+        sa.Column("jti", sa.String(36), nullable=False),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+        sa.Column("revoked_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("jti")
+    )
+    _create_index("ix_revoked_tokens_expires_at", "revoked_tokens", ["expires_at"])
+    _create_index("ix_revoked_tokens_revoked_at", "revoked_tokens", ["revoked_at"])
+
+
+def downgrade() -> None:
+    for table in (
+        "revoked_tokens",
+        "refresh_tokens",
+        "sell_request_images",
+        "sell_requests",
+        "enquiries",
+        "vehicle_images",
+        "vehicles",
+        "newsletter_subscribers",
+        "brands",
+        "users",
+    ):
+        op.drop_table(table)
@@ -0,0 +1,43 @@
+"""Performance indexes
+
+Composite indexes matching the listing and dashboard query shapes:
+status filters ordered by created_at, and the enquiry date ranges
+behind the week-over-week stats.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_vehicles_status_created",
+        "vehicles",
+        ["availability_status", "created_at"]
+    )
+    op.create_index(
+        "ix_vehicles_featured_status_created",
+        "vehicles",
+        ["is_featured", "availability_status", "created_at"]
+    )
+    op.create_index("ix_enquiries_created_at", "enquiries", ["created_at"])
+    op.create_index("ix_enquiries_status_created", "enquiries", ["status", "created_at"])
+    op.create_index("ix_sell_requests_status_created", "sell_requests", ["status", "created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_sell_requests_status_created", table_name="sell_requests")
+    op.drop_index("ix_enquiries_status_created", table_name="enquiries")
+    op.drop_index("ix_enquiries_created_at", table_name="enquiries")
+    op.drop_index("ix_vehicles_featured_status_created", table_name="vehicles")
+    op.drop_index("ix_vehicles_status_created", table_name="vehicles")
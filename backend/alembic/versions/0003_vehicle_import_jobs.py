@@ -0,0 +1,51 @@
+"""Vehicle import jobs
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "vehicle_import_jobs",
+        sa.Column("id", sa.String(36), nullable=False),
+        sa.Column(
+            "status",
+            sa.Enum("pending", "running", "completed", "failed", name="import_job_status"),
+            nullable=False
+        ),
+        sa.Column("filename", sa.String(255), nullable=False),
+        sa.Column("file_format", sa.String(10), nullable=False),
+        sa.Column("source_path", sa.String(500), nullable=False),
+        sa.Column("images_path", sa.String(500), nullable=True),
+        sa.Column("total_rows", sa.Integer(), nullable=True),
+        sa.Column("processed_rows", sa.Integer(), nullable=False),
+        sa.Column("created_count", sa.Integer(), nullable=False),
+        sa.Column("updated_count", sa.Integer(), nullable=False),
+        sa.Column("failed_count", sa.Integer(), nullable=False),
+        sa.Column("images_attached", sa.Integer(), nullable=False),
+        sa.Column("errors", sa.JSON(), nullable=True),
+        sa.Column("error_message", sa.Text(), nullable=True),
+        sa.Column("created_by", sa.String(36), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_vehicle_import_jobs_status", "vehicle_import_jobs", ["status"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_vehicle_import_jobs_status", table_name="vehicle_import_jobs")
+    op.drop_table("vehicle_import_jobs")
@@ -0,0 +1,42 @@
+"""Vehicle change log
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "vehicle_changes",
+        sa.Column("seq", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("vehicle_id", sa.String(36), nullable=False),
+        sa.Column("op", sa.Enum("upsert", "delete", name="vehicle_change_op"), nullable=False),
+        sa.Column("changed_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("seq"),
+        sqlite_autoincrement=True
+    )
+    op.create_index("ix_vehicle_changes_vehicle_id", "vehicle_changes", ["vehicle_id"])
+    
+    # Baseline: one entry per existing vehicle, so syncing from seq 0
+    # yields the full current inventory
+    op.execute(
+        "INSERT INTO vehicle_changes (vehicle_id, op, changed_at) "
+        "SELECT id, 'upsert', COALESCE(updated_at, created_at) FROM vehicles "
+        "ORDER BY COALESCE(updated_at, created_at)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_vehicle_changes_vehicle_id", table_name="vehicle_changes")
+    op.drop_table("vehicle_changes")
@@ -0,0 +1,63 @@
+"""Vehicle analytics rollups
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19
+"""
+
+from collections import Counter
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    stats = op.create_table(
+        "vehicle_stats",
+        sa.Column("granularity", sa.String(4), nullable=False),
+        sa.Column("vehicle_id", sa.String(36), nullable=False),
+        sa.Column("bucket_start", sa.DateTime(), nullable=False),
+        sa.Column("views", sa.Integer(), nullable=False),
+        sa.Column("enquiries", sa.Integer(), nullable=False),
+        sa.Column("leads", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("granularity", "vehicle_id", "bucket_start")
+    )
+    op.create_index(
+        "ix_vehicle_stats_granularity_bucket", "vehicle_stats", ["granularity", "bucket_start"]
+    )
+    
+    # Backfill daily enquiry counts from existing enquiries (views only
+    # have a lifetime total, so their history starts now)
+    enquiries = sa.table(
+        "enquiries", sa.column("vehicle_id", sa.String), sa.column("created_at", sa.DateTime)
+    )
+    counts = Counter()
+    rows = op.get_bind().execute(
+        sa.select(enquiries.c.vehicle_id, enquiries.c.created_at).where(
+            enquiries.c.vehicle_id.isnot(None)
+        )
+    )
+    for vehicle_id, created_at in rows:
+        day = created_at.replace(hour=0, minute=0, second=0, microsecond=0)
+        counts[(vehicle_id, day)] += 1
+    
+    if counts:
+        op.bulk_insert(stats, [
+            {
+                "granularity": "day", "vehicle_id": vehicle_id, "bucket_start": day,
+                "views": 0, "enquiries": count, "leads": 0,
+            }
+            for (vehicle_id, day), count in counts.items()
+        ])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_vehicle_stats_granularity_bucket", table_name="vehicle_stats")
+    op.drop_table("vehicle_stats")
@@ -0,0 +1,53 @@
+"""Vehicle sold_at and status history
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("vehicles", sa.Column("sold_at", sa.DateTime(), nullable=True))
+    op.create_index("ix_vehicles_sold_at", "vehicles", ["sold_at"])
+    
+    # Best available estimate for cars sold before sold_at existed: the
+    # last edit, which is what the dashboard assumed until now
+    op.execute(
+        "UPDATE vehicles SET sold_at = updated_at WHERE availability_status = 'sold'"
+    )
+    
+    op.create_table(
+        "vehicle_status_events",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("vehicle_id", sa.String(36), nullable=False),
+        sa.Column("from_status", sa.String(20), nullable=True),
+        sa.Column("to_status", sa.String(20), nullable=False),
+        sa.Column("changed_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index(
+        "ix_vehicle_status_events_vehicle_id", "vehicle_status_events", ["vehicle_id"]
+    )
+    op.create_index(
+        "ix_vehicle_status_events_to_status_changed",
+        "vehicle_status_events", ["to_status", "changed_at"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_vehicle_status_events_to_status_changed", table_name="vehicle_status_events")
+    op.drop_index("ix_vehicle_status_events_vehicle_id", table_name="vehicle_status_events")
+    op.drop_table("vehicle_status_events")
+    op.drop_index("ix_vehicles_sold_at", table_name="vehicles")
+    with op.batch_alter_table("vehicles") as batch_op:
+        batch_op.drop_column("sold_at")
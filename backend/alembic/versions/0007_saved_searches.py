@@ -0,0 +1,89 @@
+"""Saved searches and alerts
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "saved_searches",
+        sa.Column("id", sa.String(36), nullable=False),
+        sa.Column("email", sa.String(255), nullable=False),
+        sa.Column("name", sa.String(100), nullable=True),
+        sa.Column("filters", sa.JSON(), nullable=False),
+        sa.Column("token", sa.String(64), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("last_alerted_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("token")
+    )
+    op.create_index("ix_saved_searches_email", "saved_searches", ["email"])
+    
+    op.create_table(
+        "saved_search_keys",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("saved_search_id", sa.String(36), nullable=False),
+        sa.Column("make_key", sa.String(100), nullable=False),
+        sa.Column("body_key", sa.String(20), nullable=False),
+        sa.Column("price_band", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["saved_search_id"], ["saved_searches.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index(
+        "ix_saved_search_keys_saved_search_id", "saved_search_keys", ["saved_search_id"]
+    )
+    op.create_index(
+        "ix_saved_search_keys_lookup", "saved_search_keys", ["make_key", "body_key", "price_band"]
+    )
+    
+    op.create_table(
+        "saved_search_alerts",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("saved_search_id", sa.String(36), nullable=False),
+        sa.Column("vehicle_id", sa.String(36), nullable=False),
+        sa.Column(
+            "kind",
+            sa.Enum("new_listing", "price_drop", name="saved_search_alert_kind"),
+            nullable=False
+        ),
+        sa.Column("price", sa.Float(), nullable=False),
+        sa.Column("old_price", sa.Float(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("sent_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["saved_search_id"], ["saved_searches.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "saved_search_id", "vehicle_id", "kind", "price",
+            name="uq_saved_search_alerts_search_vehicle_kind_price"
+        )
+    )
+    op.create_index(
+        "ix_saved_search_alerts_saved_search_id", "saved_search_alerts", ["saved_search_id"]
+    )
+    op.create_index(
+        "ix_saved_search_alerts_sent_created", "saved_search_alerts", ["sent_at", "created_at"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_saved_search_alerts_sent_created", table_name="saved_search_alerts")
+    op.drop_index("ix_saved_search_alerts_saved_search_id", table_name="saved_search_alerts")
+    op.drop_table("saved_search_alerts")
+    op.drop_index("ix_saved_search_keys_lookup", table_name="saved_search_keys")
+    op.drop_index("ix_saved_search_keys_saved_search_id", table_name="saved_search_keys")
+    op.drop_table("saved_search_keys")
+    op.drop_index("ix_saved_searches_email", table_name="saved_searches")
+    op.drop_table("saved_searches")
@@ -0,0 +1,52 @@
+"""FX rates and normalized KSH prices
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19
+"""
+
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    fx_rates = op.create_table(
+        "fx_rates",
+        sa.Column("currency", sa.String(3), nullable=False),
+        sa.Column("rate_to_ksh", sa.Float(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("currency")
+    )
+    # Starting rates only: keep them current via PUT /api/admin/fx-rates
+    now = datetime.utcnow()
+    op.bulk_insert(fx_rates, [
+        {"currency": "KSH", "rate_to_ksh": 1.0, "updated_at": now},
+        {"currency": "USD", "rate_to_ksh": 129.0, "updated_at": now},
+        {"currency": "GBP", "rate_to_ksh": 172.0, "updated_at": now},
+        {"currency": "JPY", "rate_to_ksh": 0.86, "updated_at": now},
+    ])
+    
+    op.add_column("vehicles", sa.Column("price_ksh", sa.Float(), nullable=True))
+    op.execute(
+        "UPDATE vehicles SET price_ksh = price * "
+        "(SELECT rate_to_ksh FROM fx_rates WHERE fx_rates.currency = vehicles.currency)"
+    )
+    op.create_index("ix_vehicles_price_ksh", "vehicles", ["price_ksh"])
+    op.create_index("ix_vehicles_status_price_ksh", "vehicles", ["availability_status", "price_ksh"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_vehicles_status_price_ksh", table_name="vehicles")
+    op.drop_index("ix_vehicles_price_ksh", table_name="vehicles")
+    with op.batch_alter_table("vehicles") as batch_op:
+        batch_op.drop_column("price_ksh")
+    op.drop_table("fx_rates")
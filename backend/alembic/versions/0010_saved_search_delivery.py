@@ -0,0 +1,36 @@
+"""Saved search alert leases and pending matches
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("saved_search_alerts", sa.Column("claimed_at", sa.DateTime(), nullable=True))
+    
+    op.create_table(
+        "saved_search_pending_matches",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("vehicle_id", sa.String(36), nullable=False),
+        sa.Column("old_status", sa.String(20), nullable=True),
+        sa.Column("old_price", sa.Float(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id")
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("saved_search_pending_matches")
+    with op.batch_alter_table("saved_search_alerts") as batch_op:
+        batch_op.drop_column("claimed_at")
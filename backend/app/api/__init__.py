@@ -4,10 +4,11 @@ API Package
 API initialization and exports.
 """
 
-from app.api.deps import get_current_user, get_current_admin, get_optional_user
+from app.api.deps import get_current_user, get_current_admin, get_optional_user, rate_limit
 
 __all__ = [
     "get_current_user",
     "get_current_admin",
     "get_optional_user",
+    "rate_limit",
 ]
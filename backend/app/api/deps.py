@@ -4,14 +4,17 @@ API Dependencies
 Common dependencies used across API endpoints.
 """
 
-from typing import Generator, Optional
-from fastapi import Depends, HTTPException, status
+from typing import Callable, Generator, Optional
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 
+from app.core.config import get_settings
 from app.core.database import get_db
+from app.core.rate_limit import get_rate_limiter
 from app.core.security import decode_access_token
 from app.models import User
+from app.services import AuthService
 
 # Security scheme for JWT
 security = HTTPBearer()
@@ -43,7 +46,7 @@ def get_current_user(
             detail="Invalid token payload"
         )
     
-    user = db.query(User).filter(User.id == user_id).first()
+    user = AuthService.get_active_user(db, user_id, payload.get("iat"))
     
     if not user:
         raise HTTPException(
@@ -100,4 +103,39 @@ def get_optional_user(
     if not user_id:
         return None
     
-    return db.query(User).filter(User.id == user_id, User.is_active == True).first()
+    user = AuthService.get_active_user(db, user_id, payload.get("iat"))
+    
+    if not user or not user.is_active:
+        return None
+    
+    return user
+
+
+def get_client_ip(request: Request) -> str:
+    """Get the client IP, honouring X-Forwarded-For only behind a trusted proxy."""
+    if get_settings().rate_limit_trust_proxy:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+def rate_limit(policy: str) -> Callable[[Request], None]:
+    """
+    Build a dependency that enforces a named rate limit policy per client IP.
+    
+    Usage: dependencies=[Depends(rate_limit("login"))] on a route.
+    """
+    def dependency(request: Request) -> None:
+        if not get_settings().rate_limit_enabled:
+            return
+        
+        allowed, retry_after = get_rate_limiter().check(policy, get_client_ip(request))
+        if not allowed:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests. Please try again later.",
+                headers={"Retry-After": str(max(1, round(retry_after)))}
+            )
+    
+    return dependency
@@ -12,6 +12,11 @@ from app.api.endpoints.auth import router as auth_router
 from app.api.endpoints.admin import router as admin_router
 from app.api.endpoints.public import router as public_router
 from app.api.endpoints.leads import router as leads_router
+from app.api.endpoints.renditions import router as renditions_router
+from app.api.endpoints.feeds import router as feeds_router
+from app.api.endpoints.saved_searches import router as saved_searches_router
+from app.api.endpoints.health import router as health_router
+from app.api.endpoints.metrics import router as metrics_router, register_app_metrics
 
 __all__ = [
     "vehicles_router",
@@ -21,4 +26,10 @@ __all__ = [
     "auth_router",
     "admin_router",
     "public_router",
+    "renditions_router",
+    "feeds_router",
+    "saved_searches_router",
+    "health_router",
+    "metrics_router",
+    "register_app_metrics",
 ]
@@ -5,27 +5,40 @@ Protected endpoints for managing vehicles, enquiries, and sell requests.
 """
 
 from typing import Optional, List
+from datetime import date
 from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
+from app.core.profiler import PROFILE_STORE
 from app.api.deps import get_current_user, get_current_admin
 from app.models import User, Vehicle, Brand, NewsletterSubscriber
-from app.services import VehicleService, EnquiryService, SellRequestService, AuthService, ImageService
+from app.services import (
+    VehicleService, EnquiryService, SellRequestService, AuthService, ImageService,
+    VehicleImportService, ExportService, FeedService, AnalyticsService, ValuationService,
+    FxService
+)
 from app.schemas import (
     # Vehicle
     VehicleCreate, VehicleUpdate, VehicleResponse, VehicleListResponse,
-    VehicleImageResponse, 
+    VehicleImageResponse, VehicleImageUploadResult, VehicleImageBatchResponse,
+    VehicleImportJobResponse, VehicleBulkUpdate,
     # Enquiry
-    EnquiryResponse, EnquiryListResponse, EnquiryUpdateStatus,
+    EnquiryResponse, EnquiryListResponse, EnquiryUpdateStatus, EnquiryBulkStatusUpdate,
     # Sell Request
     SellRequestResponse, SellRequestListResponse, SellRequestUpdateStatus, SellRequestValuation,
+    SellRequestBulkStatusUpdate, SellRequestValuationSuggestion,
     # Brand
     BrandCreate, BrandUpdate, BrandResponse, BrandListResponse,
     # User
     UserCreate, UserUpdate, UserResponse,
+    # Analytics
+    AnalyticsSeriesResponse, TimeToSellStats,
+    # FX Rates
+    FxRateResponse, FxRatesUpdate, FxRatesUpdateResponse,
     # Common
-    MessageResponse, DashboardStats
+    MessageResponse, DashboardStats, BulkActionResponse, FeedBuildResponse
 )
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
@@ -41,25 +54,29 @@ def get_dashboard_stats(
     """Get dashboard statistics for admin panel with Numerical Wisdom."""
     from datetime import datetime, timedelta
     from app.models import Enquiry, SellRequest, Vehicle
-    from sqlalchemy import func
+    from sqlalchemy import func, case
     
-    # 1. Base Stats
-    total_vehicles = db.query(Vehicle).count()
-    vehicles_available = db.query(Vehicle).filter(Vehicle.availability_status == "available").count()
-    vehicles_sold = db.query(Vehicle).filter(Vehicle.availability_status == "sold").count()
-    featured_vehicles = db.query(Vehicle).filter(Vehicle.is_featured == True).count()
+    # 1. Base Stats (one pass over vehicles)
+    is_available = Vehicle.availability_status == "available"
+    (
+        total_vehicles, vehicles_available, vehicles_sold, featured_vehicles,
+        total_views, total_inventory_value
+    ) = db.query(
+        func.count(Vehicle.id),
+        func.sum(case((is_available, 1), else_=0)),
+        func.sum(case((Vehicle.availability_status == "sold", 1), else_=0)),
+        func.sum(case((Vehicle.is_featured == True, 1), else_=0)),
+        func.sum(Vehicle.views_count),
+        # 2. Numerical Wisdom: Inventory Value
+        func.sum(case((is_available, Vehicle.price_ksh), else_=0))
+    ).one()
     
     new_enquiries = EnquiryService.get_new_enquiries_count(db)
     pending_sell_requests = SellRequestService.get_pending_count(db)
     
     total_enquiries = db.query(Enquiry).count()
     total_sell_requests = db.query(SellRequest).count()
-    total_views = db.query(func.sum(Vehicle.views_count)).scalar() or 0
-    
-    # 2. Numerical Wisdom: Inventory Value
-    total_inventory_value = db.query(func.sum(Vehicle.price)).filter(
-        Vehicle.availability_status == "available"
-    ).scalar() or 0
+    total_views = total_views or 0
     
     # 3. Numerical Wisdom: Enquiries WoW Growth
     now = datetime.utcnow()
@@ -77,19 +94,15 @@ def get_dashboard_stats(
         enquiries_wow = ((this_week_enquiries - last_week_enquiries) / last_week_enquiries) * 100
     elif this_week_enquiries > 0:
         enquiries_wow = 100.0 # First week growth
-        
+    
     # 4. Numerical Wisdom: Conversion Rate (Visitor to Lead)
     conversion_rate = 0.0
     if total_views > 0:
         conversion_rate = (total_enquiries / total_views) * 100
-        
-    # 5. Numerical Wisdom: Inventory Velocity (Avg Days to Sell)
-    # Using SQLite friendly calculation (difference in days)
-    sold_vehicles = db.query(Vehicle).filter(Vehicle.availability_status == "sold").all()
-    avg_days_to_sell = 0.0
-    if sold_vehicles:
-        total_days = sum([(v.updated_at - v.created_at).days for v in sold_vehicles])
-        avg_days_to_sell = total_days / len(sold_vehicles)
+    
+    # 5. Numerical Wisdom: Inventory Velocity (Avg Days to Sell, listing to sold_at)
+    velocity = AnalyticsService.time_to_sell(db)
+    avg_days_to_sell = velocity[0]["avg_days"] if velocity else 0.0
     
     return DashboardStats(
         total_vehicles=total_vehicles,
@@ -97,15 +110,15 @@ def get_dashboard_stats(
         total_sell_requests=total_sell_requests,
         new_enquiries=new_enquiries,
         pending_sell_requests=pending_sell_requests,
-        vehicles_available=vehicles_available,
-        vehicles_sold=vehicles_sold,
-        featured_vehicles=featured_vehicles,
+        vehicles_available=vehicles_available or 0,
+        vehicles_sold=vehicles_sold or 0,
+        featured_vehicles=featured_vehicles or 0,
         total_views=total_views,
         # Wisdom
         enquiries_wow=round(enquiries_wow, 1),
         conversion_rate=round(conversion_rate, 2),
         avg_days_to_sell=round(avg_days_to_sell, 1),
-        total_inventory_value=total_inventory_value
+        total_inventory_value=total_inventory_value or 0
     )
 
 
@@ -151,6 +164,67 @@ def create_vehicle(
     return vehicle
 
 
+@router.post(
+    "/vehicles/import",
+    response_model=VehicleImportJobResponse,
+    status_code=status.HTTP_202_ACCEPTED
+)
+def import_vehicles(
+    file: UploadFile = File(...),
+    images: Optional[UploadFile] = File(None),
+    current_user: User = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Bulk import vehicles from a CSV or JSON Lines file (admin only).
+    
+    Rows use the vehicle create fields. A row with the id of an existing
+    vehicle updates the fields it provides. In CSV, features and images are "|"-separated.
+    images may be a zip holding the files named in the images column.
+    
+    The import runs in the background; poll the returned job for progress.
+    """
+    job = VehicleImportService.create_job_from_upload(
+        db, file, images=images, created_by=current_user.id
+    )
+    VehicleImportService.start(job.id)
+    return job
+
+
+@router.get("/vehicles/import/{job_id}", response_model=VehicleImportJobResponse)
+def get_import_job(
+    job_id: str,
+    current_user: User = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """Get the progress and row errors of a bulk import (admin only)."""
+    job = VehicleImportService.get_job(db, job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Import job not found"
+        )
+    return job
+
+
+@router.post("/vehicles/bulk", response_model=BulkActionResponse)
+def bulk_update_vehicles(
+    data: VehicleBulkUpdate,
+    current_user: User = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Change status, featured flag or price of many vehicles at once (admin only).
+    
+    Target vehicles by ids or by a filter; the change is a single UPDATE.
+    """
+    updated = VehicleService.bulk_update(db, data)
+    return BulkActionResponse(
+        requested=len(set(data.ids)) if data.ids is not None else None,
+        updated=updated
+    )
+
+
 @router.get("/vehicles/{vehicle_id}", response_model=VehicleResponse)
 def admin_get_vehicle(
     vehicle_id: str,
@@ -239,7 +313,7 @@ def upload_vehicle_image(
         )
     
     # Save image
-    image_url = ImageService.save_image(file, subfolder="vehicles")
+    image_url, metadata = ImageService.save_image_with_metadata(file, subfolder="vehicles")
     
     # Get next display order
     display_order = len(vehicle.images)
@@ -250,12 +324,79 @@ def upload_vehicle_image(
         vehicle_id=vehicle_id,
         image_url=image_url,
         is_primary=is_primary,
-        display_order=display_order
+        display_order=display_order,
+        metadata=metadata
     )
     
     return image
 
 
+@router.post("/vehicles/{vehicle_id}/upload-images", response_model=VehicleImageBatchResponse)
+def upload_vehicle_images(
+    vehicle_id: str,
+    primary_index: Optional[int] = Query(None, ge=0),
+    files: List[UploadFile] = File(...),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Upload several images for a vehicle in one request.
+    
+    Files are processed concurrently and saved in a single transaction.
+    primary_index optionally marks one of the files as the primary image.
+    Returns a result for each file.
+    """
+    vehicle = VehicleService.get_vehicle_by_id(db, vehicle_id)
+    if not vehicle:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Vehicle not found"
+        )
+    
+    if len(files) > ImageService.MAX_UPLOAD_BATCH:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Too many files. Maximum per upload: {ImageService.MAX_UPLOAD_BATCH}"
+        )
+    
+    # Save images
+    results = ImageService.save_images(files, subfolder="vehicles")
+    image_urls = [url for url, _, _ in results if url]
+    metadata = [meta for url, meta, _ in results if url]
+    
+    # Map primary_index from submitted files onto the saved images
+    primary = None
+    if primary_index is not None and primary_index < len(results) and results[primary_index][0]:
+        primary = sum(1 for url, _, _ in results[:primary_index] if url)
+    
+    # Add to database
+    try:
+        images = VehicleService.add_images(
+            db, vehicle_id, image_urls, primary_index=primary, metadata=metadata
+        )
+    except Exception:
+        for url in image_urls:
+            ImageService.delete_image(url)
+        raise
+    
+    saved = iter(images)
+    items = [
+        VehicleImageUploadResult(
+            filename=file.filename,
+            success=url is not None,
+            image=VehicleImageResponse.model_validate(next(saved)) if url else None,
+            error=error
+        )
+        for file, (url, _, error) in zip(files, results)
+    ]
+    
+    return VehicleImageBatchResponse(
+        items=items,
+        uploaded=len(images),
+        failed=len(items) - len(images)
+    )
+
+
 @router.delete("/vehicles/images/{image_id}", response_model=MessageResponse)
 def delete_vehicle_image(
     image_id: str,
@@ -298,6 +439,22 @@ def list_enquiries(
     )
 
 
+@router.post("/enquiries/bulk-status", response_model=BulkActionResponse)
+def bulk_update_enquiry_status(
+    data: EnquiryBulkStatusUpdate,
+    current_user: User = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """Set the status of many enquiries by ids or filter (admin only)."""
+    updated = EnquiryService.bulk_update_status(
+        db, data.status.value, ids=data.ids, filters=data.filter
+    )
+    return BulkActionResponse(
+        requested=len(set(data.ids)) if data.ids is not None else None,
+        updated=updated
+    )
+
+
 @router.get("/enquiries/{enquiry_id}", response_model=EnquiryResponse)
 def get_enquiry(
     enquiry_id: str,
@@ -377,6 +534,22 @@ def list_sell_requests(
     )
 
 
+@router.post("/sell-requests/bulk-status", response_model=BulkActionResponse)
+def bulk_update_sell_request_status(
+    data: SellRequestBulkStatusUpdate,
+    current_user: User = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """Set the status of many sell requests by ids or filter (admin only)."""
+    updated = SellRequestService.bulk_update_status(
+        db, data.status.value, ids=data.ids, filters=data.filter
+    )
+    return BulkActionResponse(
+        requested=len(set(data.ids)) if data.ids is not None else None,
+        updated=updated
+    )
+
+
 @router.get("/sell-requests/{request_id}", response_model=SellRequestResponse)
 def get_sell_request(
     request_id: str,
@@ -412,6 +585,32 @@ def update_sell_request_status(
     return updated
 
 
+@router.get(
+    "/sell-requests/{request_id}/suggest-valuation",
+    response_model=SellRequestValuationSuggestion
+)
+def suggest_valuation(
+    request_id: str,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Suggest a valuation from the nearest comparable vehicles.
+    
+    Compares make, model, year, mileage and condition against inventory
+    and sold history. Returns the estimate, a low/high band and the
+    comparables behind it; nothing is saved.
+    """
+    sell_request = SellRequestService.get_sell_request_by_id(db, request_id)
+    if not sell_request:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Sell request not found"
+        )
+    
+    return ValuationService.suggest(db, sell_request)
+
+
 @router.patch("/sell-requests/{request_id}/valuation", response_model=SellRequestResponse)
 def add_valuation(
     request_id: str,
@@ -567,4 +766,168 @@ def update_user(
     
     db.commit()
     db.refresh(user)
+    
+    # Role or active status may have changed
+    AuthService.invalidate_user(user.id)
+    if data.is_active is False:
+        AuthService.revoke_user_refresh_tokens(db, user.id)
     return user
+
+
+# ============ Analytics ============
+
+@router.get("/analytics", response_model=AnalyticsSeriesResponse)
+def get_analytics(
+    granularity: str = Query("day", regex="^(hour|day)$"),
+    days: int = Query(30, ge=1, le=366),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Site-wide views, enquiries and leads per hour or day."""
+    return AnalyticsService.get_series(db, granularity=granularity, days=days)
+
+
+@router.get("/analytics/time-to-sell", response_model=List[TimeToSellStats])
+def get_time_to_sell(
+    group_by: Optional[str] = Query(None, regex="^(make|body_type)$"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Days from listing to sale (mean, median, 90th percentile), overall or by make/body type."""
+    return AnalyticsService.time_to_sell(db, group_by=group_by)
+
+
+@router.get("/analytics/vehicles/{vehicle_id}", response_model=AnalyticsSeriesResponse)
+def get_vehicle_analytics(
+    vehicle_id: str,
+    granularity: str = Query("day", regex="^(hour|day)$"),
+    days: int = Query(30, ge=1, le=366),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Views, enquiries and leads for one vehicle per hour or day.
+    
+    Hourly detail is kept for ANALYTICS_HOURLY_RETENTION_DAYS; older
+    hours only appear in daily series.
+    """
+    return AnalyticsService.get_series(
+        db, granularity=granularity, days=days, vehicle_id=vehicle_id
+    )
+
+
+# ============ FX Rates ============
+
+@router.get("/fx-rates", response_model=List[FxRateResponse])
+def list_fx_rates(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Exchange rates used for KSH prices (KSH per unit of each currency)."""
+    return FxService.list_rates(db)
+
+
+@router.put("/fx-rates", response_model=FxRatesUpdateResponse)
+def update_fx_rates(
+    data: FxRatesUpdate,
+    current_user: User = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Set exchange rates (admin only).
+    
+    KSH prices of every vehicle priced in a changed currency are
+    recomputed at once, so price filters and sorting stay correct.
+    """
+    updated = FxService.update_rates(
+        db, {currency.value: rate for currency, rate in data.rates.items()}
+    )
+    return FxRatesUpdateResponse(rates=FxService.list_rates(db), vehicles_updated=updated)
+
+
+# ============ Feeds ============
+
+@router.post("/feeds/{name}/build", response_model=FeedBuildResponse)
+def build_feed(
+    name: str,
+    full: bool = False,
+    current_user: User = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Bring a marketplace feed up to date now (admin only).
+    
+    Only changed vehicles are re-rendered unless full is set.
+    """
+    return FeedService.build(db, name, full=full)
+
+
+# ============ Exports ============
+
+@router.get("/export/{resource}")
+def export_data(
+    resource: str,
+    format: str = Query("csv", regex="^(csv|ndjson)$"),
+    gzip: bool = False,
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    current_user: User = Depends(get_current_admin)
+):
+    """
+    Download a full export (admin only).
+    
+    resource is vehicles, enquiries, sell-requests or subscribers.
+    Rows stream as they are read, so any size exports in constant memory.
+    since (inclusive) and until (exclusive) filter on the creation
+    (or subscription) date.
+    Vehicle CSV exports can be edited and re-imported.
+    """
+    ExportService.validate(resource, format)
+    
+    filename = ExportService.filename(resource, format, gzip)
+    return StreamingResponse(
+        ExportService.stream(resource, format, compress=gzip, since=since, until=until),
+        media_type="application/gzip" if gzip else ExportService.FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+# ============ Profiling ============
+
+@router.get("/profiles")
+def list_profiles(
+    current_user: User = Depends(get_current_admin)
+):
+    """List recent request profiles, newest first (admin only)."""
+    return {"items": PROFILE_STORE.list()}
+
+
+@router.get("/profiles/{profile_id}", response_class=PlainTextResponse)
+def get_profile(
+    profile_id: str,
+    current_user: User = Depends(get_current_admin)
+):
+    """
+    Get a request profile as folded stacks (admin only).
+    
+    Load into speedscope or pipe into flamegraph.pl to view.
+    """
+    profile = PROFILE_STORE.get(profile_id)
+    if not profile:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found"
+        )
+    return PlainTextResponse(
+        profile["folded"],
+        headers={"Content-Disposition": f'attachment; filename="profile-{profile_id}.folded"'}
+    )
+
+
+@router.delete("/profiles", response_model=MessageResponse)
+def clear_profiles(
+    current_user: User = Depends(get_current_admin)
+):
+    """Discard all stored request profiles (admin only)."""
+    PROFILE_STORE.clear()
+    return MessageResponse(message="Profiles cleared")
@@ -4,20 +4,25 @@ Authentication API Endpoints
 Login and token management for admin users.
 """
 
+from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
 from app.services import AuthService
-from app.schemas import LoginRequest, TokenResponse, MessageResponse, UserProfileUpdate, UserResponse
-from app.api.deps import get_current_user
+from app.schemas import (
+    LoginRequest, TokenResponse, MessageResponse, UserProfileUpdate, UserResponse,
+    RefreshTokenRequest, LogoutRequest
+)
+from app.api.deps import get_current_user, rate_limit
 from app.models import User
-from app.core.security import get_password_hash
+from app.core.security import get_password_hash, decode_access_token
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
-@router.post("/login", response_model=TokenResponse)
+@router.post("/login", response_model=TokenResponse, dependencies=[Depends(rate_limit("login"))])
 def login(
     data: LoginRequest,
     db: Session = Depends(get_db)
@@ -25,7 +30,8 @@ def login(
     """
     Authenticate admin user and get access token.
     
-    Returns JWT token for accessing protected endpoints.
+    Returns a JWT access token for protected endpoints and a refresh
+    token for obtaining new access tokens without logging in again.
     """
     user = AuthService.authenticate_user(db, data.email, data.password)
     
@@ -36,17 +42,54 @@ def login(
             headers={"WWW-Authenticate": "Bearer"}
         )
     
-    return AuthService.create_token(user)
+    return AuthService.create_token(db, user)
+
+
+@router.post("/refresh", response_model=TokenResponse)
+def refresh(
+    data: RefreshTokenRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Exchange a refresh token for a new access token.
+    
+    The refresh token is rotated: the response contains a new one and
+    the old one stops working.
+    """
+    tokens = AuthService.refresh_token(db, data.refresh_token)
+    
+    if not tokens:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired refresh token",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+    
+    return tokens
 
 
 @router.post("/logout", response_model=MessageResponse)
-def logout():
+def logout(
+    data: Optional[LogoutRequest] = None,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(
+        HTTPBearer(auto_error=False)
+    ),
+    db: Session = Depends(get_db)
+):
     """
-    Logout (client-side token removal).
+    Logout.
     
-    JWT tokens are stateless, so logout is handled client-side
-    by removing the stored token.
+    Revokes the bearer access token, if sent, and the refresh token
+    family, if provided in the body.
     """
+    if credentials:
+        payload = decode_access_token(credentials.credentials)
+        if payload:
+            AuthService.revoke_access_token(db, payload)
+    
+    if data and data.refresh_token:
+        AuthService.revoke_refresh_token(db, data.refresh_token)
+    
     return MessageResponse(message="Logged out successfully")
 
 
@@ -91,4 +134,10 @@ def update_profile(
     db.commit()
     db.refresh(current_user)
     
+    AuthService.invalidate_user(current_user.id)
+    
+    # A new password ends other sessions
+    if data.password:
+        AuthService.revoke_user_refresh_tokens(db, current_user.id)
+    
     return current_user
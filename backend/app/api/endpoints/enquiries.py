@@ -8,13 +8,19 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
+from app.api.deps import rate_limit
 from app.services import EnquiryService, VehicleService
 from app.schemas import EnquiryCreate, EnquiryResponse, MessageResponse
 
 router = APIRouter(prefix="/enquiries", tags=["Enquiries"])
 
 
-@router.post("", response_model=EnquiryResponse, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "",
+    response_model=EnquiryResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(rate_limit("enquiries"))]
+)
 def create_enquiry(
     data: EnquiryCreate,
     db: Session = Depends(get_db)
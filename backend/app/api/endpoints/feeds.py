@@ -0,0 +1,35 @@
+"""
+Feeds API Endpoints
+
+Marketplace feeds of available inventory for classifieds partners.
+"""
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import FileResponse
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.services import FeedService
+
+router = APIRouter(prefix="/feeds", tags=["Feeds"])
+
+
+@router.get("/{name}")
+def get_feed(
+    name: str,
+    db: Session = Depends(get_db)
+):
+    """
+    Get a marketplace feed (google: RSS/XML vehicle listings, csv).
+    
+    The file is regenerated first if inventory changed since it was built,
+    re-rendering only the changed vehicles.
+    """
+    feed = FeedService.get_format(name)
+    file_path = FeedService.get_feed(db, name)
+    return FileResponse(
+        file_path,
+        media_type=feed.media_type,
+        filename=file_path.name,
+        content_disposition_type="inline"
+    )
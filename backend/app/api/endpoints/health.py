@@ -0,0 +1,26 @@
+"""
+Health API Endpoints
+
+Readiness checks for load balancers and orchestrators.
+"""
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from app.services import HealthService
+
+router = APIRouter(prefix="/health", tags=["Health"])
+
+
+@router.get("/ready")
+def readiness_check():
+    """
+    Readiness check.
+    
+    Probes the database (including the SQLite write lock), upload
+    storage, image workers and migration version. Returns 503 if any
+    component fails, so the node is taken out of rotation.
+    """
+    report = HealthService.check_readiness()
+    status_code = 200 if report["status"] == "ready" else 503
+    return JSONResponse(report, status_code=status_code)
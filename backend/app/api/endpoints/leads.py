@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, status
 from sqlalchemy.orm import Session
 from app.core.database import get_db
+from app.api.deps import rate_limit
 from app.schemas.lead import LeadCaptureRequest, LeadCaptureResponse
 from app.services.lead_service import LeadService
 from app.services import EnquiryService
@@ -8,7 +9,11 @@ from app.schemas import EnquiryCreate
 
 router = APIRouter(prefix="/leads", tags=["Leads"])
 
-@router.post("/capture", response_model=LeadCaptureResponse)
+@router.post(
+    "/capture",
+    response_model=LeadCaptureResponse,
+    dependencies=[Depends(rate_limit("lead_capture"))]
+)
 def capture_lead(
     data: LeadCaptureRequest,
     db: Session = Depends(get_db)
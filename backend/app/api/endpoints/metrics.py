@@ -0,0 +1,157 @@
+"""
+Metrics API Endpoints
+
+Prometheus scrape target, plus the gauges read from app components.
+"""
+
+import time
+from typing import Optional
+
+import anyio.to_thread
+from fastapi import APIRouter, Header, HTTPException, status
+from fastapi.responses import PlainTextResponse
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import get_settings
+from app.core.metrics import REGISTRY, CallbackMetric, Counter, Histogram
+from app.services import AuthService, ImageService, RenditionService
+
+settings = get_settings()
+
+router = APIRouter(tags=["Metrics"])
+
+DB_POOL_CHECKOUTS = REGISTRY.register(Counter(
+    "db_pool_checkouts_total",
+    "Connections checked out of the database pool."
+))
+DB_POOL_HOLD = REGISTRY.register(Histogram(
+    "db_pool_checkout_duration_seconds",
+    "Time a database connection is held between checkout and checkin.",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+))
+
+
+def _pool_stats(engine: Engine) -> dict:
+    """Current pool occupancy (pools without a fixed size report nothing)."""
+    pool = engine.pool
+    if not hasattr(pool, "checkedout"):
+        return {}
+    return {
+        ("checked_out",): pool.checkedout(),
+        ("size",): pool.size(),
+        ("overflow",): max(0, pool.overflow()),
+    }
+
+
+def _threadpool_stats() -> dict:
+    """Occupancy of the threadpool that runs sync endpoints (call on the event loop)."""
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    return {
+        ("in_use",): limiter.borrowed_tokens,
+        ("capacity",): limiter.total_tokens,
+    }
+
+
+def _image_queue_stats() -> dict:
+    """Work waiting in the image pipelines."""
+    return {
+        ("uploads",): ImageService.queue_depth(),
+        ("renditions",): RenditionService.inflight_count(),
+    }
+
+
+def _cache_counters() -> dict:
+    """(hits, misses) per cache."""
+    return {
+        "users": AuthService.user_cache_stats(),
+        "renditions": RenditionService.cache_stats(),
+    }
+
+
+def _cache_hit_ratios() -> dict:
+    """Hit ratio per cache that has seen lookups."""
+    ratios = {}
+    for name, (hits, misses) in _cache_counters().items():
+        if hits + misses:
+            ratios[(name,)] = hits / (hits + misses)
+    return ratios
+
+
+def register_app_metrics(engine: Engine) -> None:
+    """Register component gauges and hook the database pool."""
+    REGISTRY.register(CallbackMetric(
+        "db_pool_connections",
+        "Database pool connections by state.",
+        lambda: _pool_stats(engine),
+        ("state",)
+    ))
+    REGISTRY.register(CallbackMetric(
+        "threadpool_workers",
+        "Worker threads for sync endpoints: in use and capacity.",
+        _threadpool_stats,
+        ("state",)
+    ))
+    REGISTRY.register(CallbackMetric(
+        "image_queue_depth",
+        "Image jobs waiting for a worker (uploads) or in flight (renditions).",
+        _image_queue_stats,
+        ("pipeline",)
+    ))
+    REGISTRY.register(CallbackMetric(
+        "cache_hits_total",
+        "Cache lookups served from cache.",
+        lambda: {(name,): hits for name, (hits, _) in _cache_counters().items()},
+        ("cache",),
+        type_name="counter"
+    ))
+    REGISTRY.register(CallbackMetric(
+        "cache_misses_total",
+        "Cache lookups that missed.",
+        lambda: {(name,): misses for name, (_, misses) in _cache_counters().items()},
+        ("cache",),
+        type_name="counter"
+    ))
+    REGISTRY.register(CallbackMetric(
+        "cache_hit_ratio",
+        "Share of cache lookups served from cache since startup.",
+        _cache_hit_ratios,
+        ("cache",)
+    ))
+    
+    # Pool events are set on the engine, so they survive pool recreate/dispose.
+    # SQLAlchemy has no event before a checkout starts waiting, so saturation
+    # shows as checked_out reaching size + overflow and long hold times.
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        DB_POOL_CHECKOUTS.inc()
+        connection_record.info["checked_out_at"] = time.perf_counter()
+    
+    def on_checkin(dbapi_connection, connection_record):
+        if connection_record is None:
+            return  # Invalidated connection
+        started = connection_record.info.pop("checked_out_at", None)
+        if started is not None:
+            DB_POOL_HOLD.observe(time.perf_counter() - started)
+    
+    event.listen(engine, "checkout", on_checkout)
+    event.listen(engine, "checkin", on_checkin)
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics(authorization: Optional[str] = Header(None)):
+    """
+    Prometheus scrape endpoint.
+    
+    Runs on the event loop (not the threadpool) so it still answers, and
+    reports threadpool usage, when every worker thread is busy.
+    """
+    if settings.metrics_token and authorization != f"Bearer {settings.metrics_token}":
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token"
+        )
+    
+    return PlainTextResponse(
+        REGISTRY.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -0,0 +1,50 @@
+"""
+Renditions API Endpoints
+
+Resized copies of uploaded images, generated on first request.
+"""
+
+import os
+import mimetypes
+from typing import BinaryIO, Iterator
+
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+
+from app.services import RenditionService
+
+router = APIRouter(prefix="/uploads/r", tags=["Renditions"])
+
+CHUNK_SIZE = 64 * 1024
+
+
+def _read_chunks(handle: BinaryIO) -> Iterator[bytes]:
+    """Stream an open file, closing it when done."""
+    try:
+        while chunk := handle.read(CHUNK_SIZE):
+            yield chunk
+    finally:
+        handle.close()
+
+
+@router.get("/{size}/{path:path}")
+def get_rendition(size: str, path: str):
+    """
+    Get an uploaded image resized to fit within WIDTHxHEIGHT.
+    
+    Only whitelisted sizes are served. Results are cached on disk,
+    so only the first request for a size pays for the resize.
+    """
+    handle = RenditionService.get_rendition(size, path)
+    
+    # Served from the handle opened by the service: the cache may evict
+    # the file meanwhile, but an open file stays readable
+    return StreamingResponse(
+        _read_chunks(handle),
+        media_type=mimetypes.guess_type(handle.name)[0] or "application/octet-stream",
+        headers={
+            "Content-Length": str(os.fstat(handle.fileno()).st_size),
+            # Upload filenames are unique, so renditions never change
+            "Cache-Control": "public, max-age=31536000, immutable",
+        }
+    )
@@ -0,0 +1,57 @@
+"""
+Saved Searches API Endpoints
+
+Public endpoints for saving searches and managing them by token.
+"""
+
+from fastapi import APIRouter, Depends, Query, status
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.api.deps import rate_limit
+from app.services import SavedSearchService
+from app.schemas import SavedSearchCreate, SavedSearchResponse, MessageResponse
+
+router = APIRouter(prefix="/saved-searches", tags=["Saved Searches"])
+
+
+@router.post(
+    "",
+    response_model=SavedSearchResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(rate_limit("saved_searches"))]
+)
+def create_saved_search(
+    data: SavedSearchCreate,
+    db: Session = Depends(get_db)
+):
+    """
+    Save a search and get alerted about matching cars.
+    
+    Takes the same filters as the vehicle list. An alert is sent when a
+    matching car is listed, or when a matching car's price drops. Keep
+    the returned token: it is needed to view or delete the search.
+    """
+    return SavedSearchService.create_saved_search(db, data)
+
+
+@router.get("/{search_id}", response_model=SavedSearchResponse)
+def get_saved_search(
+    search_id: str,
+    token: str = Query(...),
+    db: Session = Depends(get_db)
+):
+    """Get a saved search."""
+    return SavedSearchService.get_by_token(db, search_id, token)
+
+
+@router.delete("/{search_id}", response_model=MessageResponse)
+def delete_saved_search(
+    search_id: str,
+    token: str = Query(...),
+    db: Session = Depends(get_db)
+):
+    """Delete a saved search and stop its alerts."""
+    saved_search = SavedSearchService.get_by_token(db, search_id, token)
+    SavedSearchService.delete_saved_search(db, saved_search)
+    return MessageResponse(message="Saved search deleted")
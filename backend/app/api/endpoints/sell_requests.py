@@ -4,17 +4,27 @@ Sell Requests API Endpoints
 Public endpoints for submitting sell requests.
 """
 
+from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
+from app.api.deps import rate_limit
 from app.services import SellRequestService, ImageService
-from app.schemas import SellRequestCreate, SellRequestResponse, MessageResponse
+from app.schemas import (
+    SellRequestCreate, SellRequestResponse, MessageResponse,
+    SellRequestImageResponse, SellRequestImageUploadResult, SellRequestImageBatchResponse
+)
 
 router = APIRouter(prefix="/sell-requests", tags=["Sell Requests"])
 
 
-@router.post("", response_model=SellRequestResponse, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "",
+    response_model=SellRequestResponse,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(rate_limit("sell_requests"))]
+)
 def create_sell_request(
     data: SellRequestCreate,
     db: Session = Depends(get_db)
@@ -28,7 +38,11 @@ def create_sell_request(
     return sell_request
 
 
-@router.post("/{request_id}/upload-image", response_model=MessageResponse)
+@router.post(
+    "/{request_id}/upload-image",
+    response_model=MessageResponse,
+    dependencies=[Depends(rate_limit("uploads"))]
+)
 def upload_sell_request_image(
     request_id: str,
     file: UploadFile = File(...),
@@ -54,3 +68,63 @@ def upload_sell_request_image(
     SellRequestService.add_image(db, request_id, image_url)
     
     return MessageResponse(message="Image uploaded successfully")
+
+
+@router.post(
+    "/{request_id}/upload-images",
+    response_model=SellRequestImageBatchResponse,
+    dependencies=[Depends(rate_limit("uploads"))]
+)
+def upload_sell_request_images(
+    request_id: str,
+    files: List[UploadFile] = File(...),
+    db: Session = Depends(get_db)
+):
+    """
+    Upload several images for a sell request in one request.
+    
+    Files are processed concurrently and saved in a single transaction.
+    Returns a result for each file.
+    """
+    # Verify sell request exists
+    sell_request = SellRequestService.get_sell_request_by_id(db, request_id)
+    if not sell_request:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Sell request not found"
+        )
+    
+    if len(files) > ImageService.MAX_UPLOAD_BATCH:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Too many files. Maximum per upload: {ImageService.MAX_UPLOAD_BATCH}"
+        )
+    
+    # Save images
+    results = ImageService.save_images(files, subfolder="sell-requests")
+    image_urls = [url for url, _, _ in results if url]
+    
+    # Add to database
+    try:
+        images = SellRequestService.add_images(db, request_id, image_urls)
+    except Exception:
+        for url in image_urls:
+            ImageService.delete_image(url)
+        raise
+    
+    saved = iter(images)
+    items = [
+        SellRequestImageUploadResult(
+            filename=file.filename,
+            success=url is not None,
+            image=SellRequestImageResponse.model_validate(next(saved)) if url else None,
+            error=error
+        )
+        for file, (url, _, error) in zip(files, results)
+    ]
+    
+    return SellRequestImageBatchResponse(
+        items=items,
+        uploaded=len(images),
+        failed=len(items) - len(images)
+    )
@@ -9,12 +9,15 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
-from app.services import VehicleService
+from app.core.config import get_settings
+from app.services import VehicleService, SimilarityService
 from app.schemas import (
-    VehicleResponse, VehicleListResponse,
+    VehicleResponse, VehicleListResponse, VehicleChangeFeedResponse,
     BodyType, TransmissionType, FuelType, AvailabilityStatus
 )
 
+settings = get_settings()
+
 router = APIRouter(prefix="/vehicles", tags=["Vehicles"])
 
 
@@ -93,6 +96,27 @@ def get_recent_vehicles(
     return VehicleService.get_recent_vehicles(db, limit)
 
 
+@router.get("/changes", response_model=VehicleChangeFeedResponse)
+def get_vehicle_changes(
+    since: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    db: Session = Depends(get_db)
+):
+    """
+    Get vehicles changed after sequence number since, for incremental sync.
+    
+    Each vehicle appears once with its current state, or as a tombstone
+    (op "delete") if it was removed. Start from since=0 for a full copy,
+    then pass next_since back until has_more is false.
+    """
+    changes, next_since, has_more = VehicleService.get_changes(db, since=since, limit=limit)
+    return VehicleChangeFeedResponse(
+        items=changes,
+        next_since=next_since,
+        has_more=has_more
+    )
+
+
 @router.get("/makes", response_model=List[str])
 def get_vehicle_makes(db: Session = Depends(get_db)):
     """Get list of all vehicle makes."""
@@ -130,3 +154,18 @@ def get_vehicle(
     VehicleService.increment_views(db, vehicle)
     
     return vehicle
+
+
+@router.get("/{vehicle_id}/similar", response_model=List[VehicleResponse])
+def get_similar_vehicles(
+    vehicle_id: str,
+    limit: int = Query(6, ge=1, le=settings.similar_vehicles_neighbors),
+    db: Session = Depends(get_db)
+):
+    """
+    Get listed vehicles similar to a vehicle, most similar first.
+    
+    Similarity weighs price, year, mileage, body type and make. Works for
+    sold vehicles too, so their pages can point to what is still for sale.
+    """
+    return SimilarityService.get_similar(db, vehicle_id, limit)
@@ -6,11 +6,14 @@ Exports core functionality for the application.
 
 from app.core.config import get_settings, Settings
 from app.core.database import get_db, init_db, Base, engine, SessionLocal
+from app.core.cache import TTLCache
 from app.core.security import (
     verify_password,
     get_password_hash,
     create_access_token,
-    decode_access_token
+    decode_access_token,
+    revoke_token_id,
+    is_token_revoked
 )
 
 __all__ = [
@@ -21,8 +24,11 @@ __all__ = [
     "Base",
     "engine",
     "SessionLocal",
+    "TTLCache",
     "verify_password",
     "get_password_hash",
     "create_access_token",
     "decode_access_token",
+    "revoke_token_id",
+    "is_token_revoked",
 ]
@@ -6,7 +6,7 @@ All configuration is loaded from environment variables.
 """
 
 from functools import lru_cache
-from typing import List
+from typing import Dict, List, Tuple
 
 from pydantic_settings import BaseSettings
 
@@ -16,16 +16,79 @@ class Settings(BaseSettings):
     
     # Database
     database_url: str = "sqlite:///./joram_cars.db"
+    migrate_on_startup: bool = True  # Run "alembic upgrade head" when the app starts
     
     # Security
     secret_key: str = "your-super-secret-key-change-in-production"
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 60
+    refresh_token_expire_days: int = 14
+    revocation_sync_seconds: int = 10  # How often revoked tokens are reloaded from the DB
+    user_cache_ttl_seconds: int = 30  # How long an authenticated user is reused
+    user_cache_max_size: int = 1024
     
     # File Uploads
     upload_dir: str = "uploads"
     max_file_size: int = 5242880  # 5MB
     allowed_extensions: str = "jpg,jpeg,png,webp"
+    max_upload_batch: int = 30  # Files per batch upload request
+    image_workers: int = 4  # Threads in the image processing pool
+    
+    # Bulk Vehicle Import
+    import_dir: str = "imports"  # Uploaded import files wait here until processed
+    import_batch_size: int = 500
+    import_max_errors: int = 1000  # Row errors kept per job
+    import_stale_seconds: int = 600  # Unfinished jobs without progress for this long are resumed at startup
+    
+    # Marketplace Feeds (served at /api/feeds/{name}, rebuilt incrementally)
+    feed_dir: str = "feeds"
+    feed_formats: str = "google,csv"
+    feed_site_url: str = "http://localhost:5173"  # Public site, for listing links
+    feed_api_url: str = "http://localhost:8000"  # Serves /uploads, for image links
+    
+    # Analytics Rollups
+    analytics_hourly_retention_days: int = 7  # Older hourly buckets are merged into daily ones
+    analytics_compact_interval_seconds: int = 3600  # 0 disables background compaction
+    
+    # Sell Request Valuations
+    valuation_neighbors: int = 10  # Comparables behind each suggested valuation
+    
+    # Similar Vehicles
+    similar_vehicles_neighbors: int = 12  # Neighbors precomputed per listed vehicle
+    
+    # Saved Search Alerts
+    saved_search_webhook_url: str = ""  # Alerts are POSTed here as JSON; logged if unset
+    saved_search_delivery_interval_seconds: int = 60  # Retry matching and delivery; 0 disables
+    saved_search_claim_seconds: int = 300  # Unsent alerts claimed longer ago are sent again
+    
+    # On-demand Renditions
+    rendition_sizes: str = "300x200,640x480,800x600,1200x900"
+    rendition_cache_dir: str = "cache/renditions"
+    rendition_cache_max_bytes: int = 536870912  # 512MB
+    rendition_workers: int = 2  # Processes in the resize pool
+    
+    # Rate Limiting (policy:requests/seconds, per client IP)
+    rate_limit_enabled: bool = True
+    rate_limit_policies: str = "login:5/60,lead_capture:10/60,enquiries:10/60,sell_requests:5/60,uploads:30/60,saved_searches:5/60"
+    rate_limit_store: str = "memory"  # memory or sqlite (shared by workers)
+    rate_limit_sqlite_path: str = "rate_limits.db"
+    rate_limit_trust_proxy: bool = False  # Use X-Forwarded-For for the client IP
+    
+    # Request Instrumentation
+    query_stats_enabled: bool = True  # Server-Timing header with SQL count and time
+    slow_query_ms: float = 200.0  # Log statements slower than this
+    log_requests: bool = False  # Log one line per request with its SQL totals
+    metrics_enabled: bool = True  # Prometheus text format at /metrics
+    health_cache_seconds: float = 5.0  # Reuse readiness results for this long
+    health_probe_timeout_seconds: float = 2.0
+    health_min_free_mb: int = 512  # Upload disk space below this fails readiness
+    metrics_token: str = ""  # If set, scrapers must send "Authorization: Bearer <token>"
+    
+    # Request Profiling (admins send "X-Profile: 1"; results at /api/admin/profiles)
+    profiler_enabled: bool = False
+    profiler_sample_rate: float = 0.0  # Also profile this fraction of all requests
+    profiler_interval_ms: float = 5.0
+    profiler_buffer_size: int = 50  # Profiles kept in memory
     
     # CORS
     cors_origins: str = "http://localhost:5173,http://localhost:3000,http://127.0.0.1:5173,http://127.0.0.1:3000"
@@ -39,6 +102,28 @@ class Settings(BaseSettings):
         """Get allowed extensions as a list."""
         return [ext.strip() for ext in self.allowed_extensions.split(",")]
     
+    @property
+    def rendition_sizes_list(self) -> List[str]:
+        """Get allowed rendition sizes as a list."""
+        return [size.strip() for size in self.rendition_sizes.split(",")]
+    
+    @property
+    def feed_formats_list(self) -> List[str]:
+        """Get enabled feed names as a list."""
+        return [name.strip() for name in self.feed_formats.split(",") if name.strip()]
+    
+    @property
+    def rate_limit_policies_dict(self) -> Dict[str, Tuple[int, float]]:
+        """Get rate limit policies as {name: (requests, per_seconds)}."""
+        policies = {}
+        for item in self.rate_limit_policies.split(","):
+            if not item.strip():
+                continue
+            name, rate = item.split(":")
+            requests, seconds = rate.split("/")
+            policies[name.strip()] = (int(requests), float(seconds))
+        return policies
+    
     @property
     def cors_origins_list(self) -> List[str]:
         """Get CORS origins as a list."""
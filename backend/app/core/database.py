@@ -4,6 +4,8 @@ Database Configuration Module
 Handles database connection, session management, and base model.
 """
 
+from pathlib import Path
+
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 
@@ -44,10 +46,24 @@ def get_db():
         db.close()
 
 
+def get_alembic_config():
+    """Get the Alembic config for this backend, independent of the working directory."""
+    from alembic.config import Config
+    
+    backend_dir = Path(__file__).resolve().parents[2]
+    config = Config(str(backend_dir / "alembic.ini"))
+    config.set_main_option("script_location", str(backend_dir / "alembic"))
+    config.attributes["configure_logger"] = False
+    return config
+
+
 def init_db():
     """
     Initialize database tables.
     
-    Creates all tables defined in models if they don't exist.
+    Upgrades the schema to the latest Alembic migration. Equivalent to
+    running "alembic upgrade head" from the backend directory.
     """
-    Base.metadata.create_all(bind=engine)
+    from alembic import command
+    
+    command.upgrade(get_alembic_config(), "head")
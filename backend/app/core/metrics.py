@@ -0,0 +1,228 @@
+"""
+Metrics Module
+
+Minimal Prometheus-style metrics with text exposition.
+
+Counters and histograms write to a per-thread shard, so recording a value
+never takes a lock; shards are summed only when /metrics is scraped.
+Gauges are computed by callbacks at scrape time.
+"""
+
+import bisect
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Default latency buckets in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the text format."""
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    """Render {name="value",...}, or nothing without labels."""
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    """Render a sample value, keeping integers integral."""
+    if value == int(value):
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Shards:
+    """One dict per thread, registered on first use and merged on scrape."""
+    
+    def __init__(self):
+        self._local = threading.local()
+        self._shards: List[dict] = []
+        self._lock = threading.Lock()
+    
+    def get(self) -> dict:
+        """Get this thread's shard."""
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = {}
+            with self._lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+        return shard
+    
+    def all(self) -> List[dict]:
+        """Get every shard (copied, so threads can keep writing)."""
+        with self._lock:
+            return [dict(shard) for shard in self._shards]
+
+
+class Counter:
+    """Monotonic counter, optionally labelled."""
+    
+    type_name = "counter"
+    
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._shards = _Shards()
+    
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        """Add amount to the series for label_values."""
+        shard = self._shards.get()
+        shard[label_values] = shard.get(label_values, 0) + amount
+    
+    def values(self) -> Dict[LabelValues, float]:
+        """Get the total per label set across all threads."""
+        totals: Dict[LabelValues, float] = {}
+        for shard in self._shards.all():
+            for labels, value in shard.items():
+                totals[labels] = totals.get(labels, 0) + value
+        return totals
+    
+    def render(self) -> Iterable[str]:
+        for labels, value in sorted(self.values().items()):
+            yield f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(value)}"
+
+
+class UpDownCounter(Counter):
+    """Counter that may also go down, exposed as a gauge (e.g. in-flight requests)."""
+    
+    type_name = "gauge"
+    
+    def dec(self, *label_values: str, amount: float = 1) -> None:
+        """Subtract amount from the series for label_values."""
+        self.inc(*label_values, amount=-amount)
+
+
+class Histogram:
+    """Distribution of observed values in fixed buckets."""
+    
+    type_name = "histogram"
+    
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        self._shards = _Shards()
+    
+    def observe(self, value: float, *label_values: str) -> None:
+        """Record one observation."""
+        shard = self._shards.get()
+        series = shard.get(label_values)
+        if series is None:
+            # Per-bucket counts (last slot is +Inf), then sum
+            series = shard[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+    
+    def render(self) -> Iterable[str]:
+        merged: Dict[LabelValues, list] = {}
+        for shard in self._shards.all():
+            for labels, series in shard.items():
+                total = merged.setdefault(labels, [0] * len(series))
+                for i, value in enumerate(list(series)):
+                    total[i] += value
+        
+        for labels, series in sorted(merged.items()):
+            cumulative = 0
+            bounds = [_format_value(bound) for bound in self.buckets] + ["+Inf"]
+            for bound, count in zip(bounds, series[:-1]):
+                cumulative += count
+                label_str = _format_labels(self.label_names + ("le",), labels + (bound,))
+                yield f"{self.name}_bucket{label_str} {cumulative}"
+            
+            label_str = _format_labels(self.label_names, labels)
+            yield f"{self.name}_sum{label_str} {_format_value(series[-1])}"
+            yield f"{self.name}_count{label_str} {cumulative}"
+
+
+class CallbackMetric:
+    """
+    Metric whose samples are read from a callback when scraped.
+    
+    Used for values another component already tracks (pool sizes, cache
+    counters), so nothing extra runs in the hot path.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        callback: Callable[[], Dict[LabelValues, float]],
+        label_names: Sequence[str] = (),
+        type_name: str = "gauge"
+    ):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.callback = callback
+        self.type_name = type_name
+    
+    def render(self) -> Iterable[str]:
+        for labels, value in sorted(self.callback().items()):
+            yield f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(value)}"
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together."""
+    
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+    
+    def register(self, metric):
+        """Add a metric (replacing one with the same name) and return it."""
+        self._metrics[metric.name] = metric
+        return metric
+    
+    def get(self, name: str) -> Optional[object]:
+        return self._metrics.get(name)
+    
+    def render(self) -> str:
+        """Render every metric in the Prometheus text format."""
+        lines = []
+        for metric in self._metrics.values():
+            try:
+                samples = list(metric.render())
+            except Exception as e:
+                # One broken callback must not hide the other metrics
+                print(f"Metric {metric.name} failed: {e}")
+                continue
+            
+            lines.append(f"# HELP {metric.name} {metric.help_text}")
+            lines.append(f"# TYPE {metric.name} {metric.type_name}")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry
+REGISTRY = MetricsRegistry()
+
+# HTTP metrics, recorded by the request middleware
+HTTP_REQUESTS = REGISTRY.register(Counter(
+    "http_requests_total",
+    "HTTP requests handled, by route template and status code.",
+    ("method", "route", "status")
+))
+HTTP_REQUEST_DURATION = REGISTRY.register(Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency, by route template.",
+    ("method", "route")
+))
+HTTP_REQUESTS_IN_FLIGHT = REGISTRY.register(UpDownCounter(
+    "http_requests_in_flight",
+    "HTTP requests currently being handled."
+))
@@ -0,0 +1,160 @@
+"""
+Profiler Module
+
+Statistical stack sampling for individual live requests.
+
+While a request is profiled, a background thread snapshots every thread's
+stack at a fixed interval and counts identical stacks. Output uses the
+folded "frame;frame;frame count" format read by flamegraph.pl and
+speedscope. Threads not running app code (idle workers, the event loop
+waiting on I/O) are skipped; concurrent requests running app code at the
+same time will also appear in the samples.
+"""
+
+import os
+import sys
+import time
+import uuid
+import sysconfig
+import threading
+from collections import Counter, deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+# Frames from files under this directory count as app code
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BACKEND_DIR = os.path.dirname(APP_DIR)
+STDLIB_DIR = sysconfig.get_paths()["stdlib"]
+
+
+def _frame_label(code) -> str:
+    """Describe a code object as function (short/path.py:line)."""
+    filename = code.co_filename
+    if filename.startswith(BACKEND_DIR):
+        filename = os.path.relpath(filename, BACKEND_DIR)
+    elif "site-packages" in filename:
+        filename = filename.split("site-packages" + os.sep, 1)[1]
+    elif filename.startswith(STDLIB_DIR):
+        filename = os.path.relpath(filename, STDLIB_DIR)
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """Samples the stacks of all threads until stopped."""
+    
+    def __init__(self, interval_seconds: float):
+        self.interval_seconds = interval_seconds
+        self.samples = 0
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+    
+    def start(self) -> None:
+        self._thread.start()
+    
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+    
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        names = {}
+        
+        while not self._stop.wait(self.interval_seconds):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                
+                stack = []
+                in_app = False
+                while frame is not None:
+                    code = frame.f_code
+                    in_app = in_app or code.co_filename.startswith(APP_DIR)
+                    stack.append(_frame_label(code))
+                    frame = frame.f_back
+                
+                if not in_app:
+                    continue
+                
+                if thread_id not in names:
+                    names.update((thread.ident, thread.name) for thread in threading.enumerate())
+                
+                stack.append(names.get(thread_id, str(thread_id)))
+                self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+    
+    def folded(self) -> str:
+        """Render the collected stacks in folded flamegraph format."""
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common())
+
+
+class ProfileStore:
+    """Bounded ring buffer of recent request profiles (oldest dropped first)."""
+    
+    def __init__(self, max_size: int):
+        self._profiles: Deque[Dict[str, Any]] = deque(maxlen=max_size)
+        self._lock = threading.Lock()
+    
+    def add(self, profile: Dict[str, Any]) -> None:
+        with self._lock:
+            self._profiles.append(profile)
+    
+    def list(self) -> List[Dict[str, Any]]:
+        """Summaries of stored profiles, newest first."""
+        with self._lock:
+            profiles = list(self._profiles)
+        return [
+            {key: value for key, value in profile.items() if key != "folded"}
+            for profile in reversed(profiles)
+        ]
+    
+    def get(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            for profile in self._profiles:
+                if profile["id"] == profile_id:
+                    return profile
+        return None
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._profiles.clear()
+
+
+# Process-wide store, read by the admin endpoints
+PROFILE_STORE = ProfileStore(settings.profiler_buffer_size)
+
+
+class RequestProfile:
+    """Context manager that samples stacks for one request and stores the result."""
+    
+    def __init__(self, method: str, path: str, trigger: str):
+        self.id = uuid.uuid4().hex[:12]
+        self.method = method
+        self.path = path
+        self.trigger = trigger
+        self.status_code: Optional[int] = None
+        self._sampler = StackSampler(settings.profiler_interval_ms / 1000)
+    
+    def __enter__(self) -> "RequestProfile":
+        self._started_at = datetime.utcnow()
+        self._started = time.perf_counter()
+        self._sampler.start()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._sampler.stop()
+        PROFILE_STORE.add({
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "status_code": self.status_code,
+            "trigger": self.trigger,
+            "started_at": self._started_at.isoformat(),
+            "duration_ms": round((time.perf_counter() - self._started) * 1000, 2),
+            "samples": self._sampler.samples,
+            "folded": self._sampler.folded(),
+        })
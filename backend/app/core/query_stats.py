@@ -0,0 +1,81 @@
+"""
+Query Stats Module
+
+Counts and times the SQL statements issued while handling each request.
+Statements run outside a request (startup, background tasks) are ignored.
+"""
+
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+
+class QueryStats:
+    """SQL totals for one request."""
+    
+    def __init__(self, path: str = ""):
+        self.path = path
+        self.count = 0
+        self.total_ms = 0.0
+        self.slowest_ms = 0.0
+        self.slowest_sql = ""
+    
+    def record(self, statement: str, duration_ms: float) -> None:
+        """Add one executed statement."""
+        self.count += 1
+        self.total_ms += duration_ms
+        if duration_ms > self.slowest_ms:
+            self.slowest_ms = duration_ms
+            self.slowest_sql = statement
+
+
+# Stats for the request being handled. The object is mutated in place, so
+# statements run in threadpool copies of the request context still count.
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def start_request_stats(path: str) -> QueryStats:
+    """Begin collecting stats for the current request."""
+    stats = QueryStats(path)
+    _current_stats.set(stats)
+    return stats
+
+
+def get_request_stats() -> Optional[QueryStats]:
+    """Get the stats being collected for the current request, if any."""
+    return _current_stats.get()
+
+
+def _short_sql(statement: str, limit: int = 500) -> str:
+    """Collapse whitespace and truncate a statement for logging."""
+    statement = " ".join(statement.split())
+    return statement if len(statement) <= limit else statement[:limit] + "..."
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    duration_ms = (time.perf_counter() - conn.info["query_start_time"].pop()) * 1000
+    
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement, duration_ms)
+    
+    if duration_ms >= settings.slow_query_ms:
+        path = stats.path if stats is not None else "-"
+        print(f"slow_query duration_ms={duration_ms:.1f} path={path} sql=\"{_short_sql(statement)}\"")
+
+
+def install_query_stats(engine: Engine) -> None:
+    """Attach the timing hooks to an engine."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
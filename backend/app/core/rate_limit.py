@@ -0,0 +1,200 @@
+"""
+Rate Limiting Module
+
+Token-bucket rate limiting for public write endpoints and login.
+Buckets live in a pluggable store: in-process memory by default, or a
+SQLite file shared by all workers on the host.
+"""
+
+import time
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Dict, Tuple
+
+from app.core.config import get_settings
+
+
+class RateLimitStore(ABC):
+    """
+    Interface for bucket storage.
+    
+    A bucket is (tokens, updated_at, full_at). full_at is when the bucket
+    will have refilled completely, after which it can be dropped because
+    a missing bucket behaves exactly like a full one.
+    """
+    
+    @abstractmethod
+    def hit(
+        self,
+        key: str,
+        capacity: float,
+        refill_rate: float,
+        now: float
+    ) -> Tuple[bool, float]:
+        """
+        Take one token from the bucket for key.
+        
+        Returns (allowed, retry_after_seconds).
+        """
+    
+    @staticmethod
+    def _take(
+        bucket,
+        capacity: float,
+        refill_rate: float,
+        now: float
+    ) -> Tuple[bool, float, Tuple[float, float, float]]:
+        """Apply refill and take a token. Returns (allowed, retry_after, new_bucket)."""
+        if bucket is None:
+            tokens = capacity
+        else:
+            tokens, updated_at, _ = bucket
+            tokens = min(capacity, tokens + (now - updated_at) * refill_rate)
+        
+        if tokens >= 1:
+            tokens -= 1
+            allowed, retry_after = True, 0.0
+        else:
+            allowed, retry_after = False, (1 - tokens) / refill_rate
+        
+        full_at = now + (capacity - tokens) / refill_rate
+        return allowed, retry_after, (tokens, now, full_at)
+
+
+class MemoryRateLimitStore(RateLimitStore):
+    """Buckets in a dict, private to this process."""
+    
+    def __init__(self, evict_interval: float = 60.0):
+        self._buckets: Dict[str, Tuple[float, float, float]] = {}
+        self._lock = threading.Lock()
+        self._evict_interval = evict_interval
+        self._next_eviction = 0.0
+    
+    def hit(self, key, capacity, refill_rate, now):
+        with self._lock:
+            if now >= self._next_eviction:
+                self._evict(now)
+            
+            allowed, retry_after, bucket = self._take(
+                self._buckets.get(key), capacity, refill_rate, now
+            )
+            self._buckets[key] = bucket
+            return allowed, retry_after
+    
+    def _evict(self, now: float) -> None:
+        """Drop buckets that have refilled (caller holds lock)."""
+        for key in [key for key, bucket in self._buckets.items() if bucket[2] <= now]:
+            del self._buckets[key]
+        self._next_eviction = now + self._evict_interval
+    
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class SQLiteRateLimitStore(RateLimitStore):
+    """
+    Buckets in a local SQLite file, shared by every worker on the host.
+    
+    Each hit is a short IMMEDIATE transaction, so concurrent workers
+    serialize on the bucket update.
+    """
+    
+    def __init__(self, path: str, evict_interval: float = 60.0):
+        self._path = path
+        self._local = threading.local()
+        self._evict_interval = evict_interval
+        self._next_eviction = 0.0
+        
+        conn = self._connect()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_limit_buckets ("
+            "key TEXT PRIMARY KEY, tokens REAL NOT NULL, "
+            "updated_at REAL NOT NULL, full_at REAL NOT NULL)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_rate_limit_buckets_full_at "
+            "ON rate_limit_buckets (full_at)"
+        )
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Get this thread's connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self._path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+    
+    def hit(self, key, capacity, refill_rate, now):
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if now >= self._next_eviction:
+                conn.execute("DELETE FROM rate_limit_buckets WHERE full_at <= ?", (now,))
+                self._next_eviction = now + self._evict_interval
+            
+            bucket = conn.execute(
+                "SELECT tokens, updated_at, full_at FROM rate_limit_buckets WHERE key = ?",
+                (key,)
+            ).fetchone()
+            
+            allowed, retry_after, bucket = self._take(bucket, capacity, refill_rate, now)
+            conn.execute(
+                "INSERT OR REPLACE INTO rate_limit_buckets (key, tokens, updated_at, full_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, *bucket)
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        
+        return allowed, retry_after
+
+
+class RateLimiter:
+    """Applies named policies of the form (requests, per_seconds) to clients."""
+    
+    def __init__(self, store: RateLimitStore, policies: Dict[str, Tuple[int, float]]):
+        self.store = store
+        self.policies = policies
+    
+    def check(self, policy: str, client_id: str) -> Tuple[bool, float]:
+        """
+        Count a request from client_id against a policy.
+        
+        Returns (allowed, retry_after_seconds). Unknown policies and
+        store failures allow the request.
+        """
+        limit = self.policies.get(policy)
+        if not limit:
+            return True, 0.0
+        
+        requests, per_seconds = limit
+        try:
+            return self.store.hit(
+                f"{policy}:{client_id}",
+                capacity=requests,
+                refill_rate=requests / per_seconds,
+                now=time.time()
+            )
+        except Exception as e:
+            # Fail open: a broken limiter must not take the site down
+            print(f"Rate limit check failed: {e}")
+            return True, 0.0
+
+
+@lru_cache()
+def get_rate_limiter() -> RateLimiter:
+    """Get the rate limiter configured from settings."""
+    settings = get_settings()
+    
+    if settings.rate_limit_store == "sqlite":
+        store = SQLiteRateLimitStore(settings.rate_limit_sqlite_path)
+    else:
+        store = MemoryRateLimitStore()
+    
+    return RateLimiter(store, settings.rate_limit_policies_dict)
@@ -4,8 +4,12 @@ Security Module
 Handles password hashing and JWT token operations.
 """
 
+import time
+import uuid
+import hashlib
+import secrets
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Dict, Optional
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
@@ -17,6 +21,10 @@ settings = get_settings()
 # Password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Revoked access token IDs (jti) mapped to their expiry as a unix timestamp.
+# Mirrored from the revoked_tokens table by AuthService.sync_revocations.
+_revoked_token_ids: Dict[str, float] = {}
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against its hash."""
@@ -40,13 +48,14 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         Encoded JWT token string
     """
     to_encode = data.copy()
+    issued_at = datetime.utcnow()
     
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = issued_at + expires_delta
     else:
-        expire = datetime.utcnow() + timedelta(minutes=settings.access_token_expire_minutes)
+        expire = issued_at + timedelta(minutes=settings.access_token_expire_minutes)
     
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "iat": issued_at, "jti": uuid.uuid4().hex})
     
     encoded_jwt = jwt.encode(
         to_encode,
@@ -73,6 +82,38 @@ def decode_access_token(token: str) -> Optional[dict]:
             settings.secret_key,
             algorithms=[settings.algorithm]
         )
-        return payload
     except JWTError:
         return None
+    
+    if is_token_revoked(payload.get("jti")):
+        return None
+    
+    return payload
+
+
+def revoke_token_id(jti: str, expires_at: float) -> None:
+    """Mark an access token ID as revoked in this process until it expires."""
+    _revoked_token_ids[jti] = expires_at
+
+
+def is_token_revoked(jti: Optional[str]) -> bool:
+    """Check whether an access token ID has been revoked."""
+    return jti is not None and jti in _revoked_token_ids
+
+
+def prune_revoked_token_ids() -> None:
+    """Forget revoked IDs whose tokens have expired anyway."""
+    now = time.time()
+    for jti, expires_at in list(_revoked_token_ids.items()):
+        if expires_at < now:
+            _revoked_token_ids.pop(jti, None)
+
+
+def generate_refresh_token() -> str:
+    """Generate an opaque refresh token."""
+    return secrets.token_urlsafe(48)
+
+
+def hash_refresh_token(token: str) -> str:
+    """Hash a refresh token for storage and lookup."""
+    return hashlib.sha256(token.encode()).hexdigest()
@@ -4,15 +4,27 @@ Joram Cars API
 FastAPI application entry point.
 """
 
+import time
+import random
+import asyncio
 from pathlib import Path
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
 from app.core.config import get_settings
-from app.core.database import init_db, SessionLocal
+from app.core.database import init_db, engine, SessionLocal
+from app.core.query_stats import install_query_stats, start_request_stats
+from app.core.metrics import HTTP_REQUESTS, HTTP_REQUEST_DURATION, HTTP_REQUESTS_IN_FLIGHT
+from app.core.profiler import RequestProfile
+from app.core.security import decode_access_token
+from app.services import (
+    AuthService, RenditionService, AnalyticsService, SimilarityService, FxService,
+    VehicleImportService, SavedSearchService
+)
 from app.api.endpoints import (
     vehicles_router,
     enquiries_router,
@@ -21,7 +33,13 @@ from app.api.endpoints import (
     auth_router,
     admin_router,
     public_router,
-    leads_router
+    leads_router,
+    renditions_router,
+    feeds_router,
+    saved_searches_router,
+    health_router,
+    metrics_router,
+    register_app_metrics
 )
 
 settings = get_settings()
@@ -95,6 +113,95 @@ def seed_brands():
         db.close()
 
 
+def sync_revocations():
+    """Reload revoked access tokens from the database."""
+    db = SessionLocal()
+    try:
+        AuthService.sync_revocations(db)
+    finally:
+        db.close()
+
+
+async def revocation_sync_loop():
+    """Keep this worker's revocation list in step with other workers."""
+    while True:
+        await asyncio.sleep(settings.revocation_sync_seconds)
+        try:
+            await run_in_threadpool(sync_revocations)
+        except Exception as e:
+            print(f"Revocation sync failed: {e}")
+
+
+def compact_analytics():
+    """Merge aged hourly analytics buckets into daily ones."""
+    db = SessionLocal()
+    try:
+        merged = AnalyticsService.compact(db)
+        if merged:
+            print(f"Compacted {merged} hourly analytics buckets")
+    finally:
+        db.close()
+
+
+async def analytics_compact_loop():
+    """Periodically compact analytics rollups."""
+    while True:
+        await asyncio.sleep(settings.analytics_compact_interval_seconds)
+        try:
+            await run_in_threadpool(compact_analytics)
+        except Exception as e:
+            print(f"Analytics compaction failed: {e}")
+
+
+async def saved_search_delivery_loop():
+    """Periodically match pending vehicles and retry undelivered alerts."""
+    while True:
+        try:
+            SavedSearchService.enqueue()
+        except Exception as e:
+            print(f"Saved search delivery failed: {e}")
+        await asyncio.sleep(settings.saved_search_delivery_interval_seconds)
+
+
+def resume_import_jobs():
+    """Pick up vehicle imports left unfinished by a stopped process."""
+    db = SessionLocal()
+    try:
+        resumed = VehicleImportService.resume_stale_jobs(db)
+        if resumed:
+            print(f"Resumed {resumed} interrupted vehicle imports")
+    finally:
+        db.close()
+
+
+def backfill_ksh_prices():
+    """Give KSH prices to vehicles written without one, so price filters see them."""
+    db = SessionLocal()
+    try:
+        updated = FxService.backfill_prices(db)
+        if updated:
+            print(f"Backfilled KSH prices for {updated} vehicles")
+    finally:
+        db.close()
+
+
+def build_similarity_index():
+    """Build the similar-vehicles index ahead of the first request."""
+    db = SessionLocal()
+    try:
+        SimilarityService.refresh(db)
+    finally:
+        db.close()
+
+
+async def warm_similarity_index():
+    """Build the similar-vehicles index in the background."""
+    try:
+        await run_in_threadpool(build_similarity_index)
+    except Exception as e:
+        print(f"Similar-vehicles index build failed: {e}")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events."""
@@ -107,9 +214,10 @@ async def lifespan(app: FastAPI):
     Path(settings.upload_dir + "/sell-requests").mkdir(parents=True, exist_ok=True)
     Path(settings.upload_dir + "/brands").mkdir(parents=True, exist_ok=True)
     
-    # Initialize database
-    init_db()
-    print("Database initialized")
+    # Bring the schema up to date (deployments may run migrations instead)
+    if settings.migrate_on_startup:
+        init_db()
+        print("Database migrated")
     
     # Create default admin
     create_default_admin()
@@ -117,6 +225,29 @@ async def lifespan(app: FastAPI):
     # Seed brands
     seed_brands()
     
+    # Vehicles missing a KSH price would drop out of price filters
+    backfill_ksh_prices()
+    
+    # Imports interrupted by a restart continue where they stopped
+    resume_import_jobs()
+    
+    # Load revoked tokens and keep them in sync
+    sync_revocations()
+    revocation_task = asyncio.create_task(revocation_sync_loop())
+    
+    # Merge aged hourly analytics into daily buckets
+    compact_task = None
+    if settings.analytics_compact_interval_seconds:
+        compact_task = asyncio.create_task(analytics_compact_loop())
+    
+    # Saved search matches and alerts left by failures or a restart
+    delivery_task = None
+    if settings.saved_search_delivery_interval_seconds:
+        delivery_task = asyncio.create_task(saved_search_delivery_loop())
+    
+    # Precompute similar vehicles without delaying startup
+    similarity_task = asyncio.create_task(warm_similarity_index())
+    
     print("Joram Cars API ready!")
     print(f"Docs: http://localhost:8000/docs")
     
@@ -124,6 +255,13 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     print("Shutting down Joram Cars API")
+    revocation_task.cancel()
+    if compact_task:
+        compact_task.cancel()
+    if delivery_task:
+        delivery_task.cancel()
+    similarity_task.cancel()
+    RenditionService.shutdown()
 
 
 # Create FastAPI app
@@ -145,9 +283,92 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-request SQL count and timing
+if settings.query_stats_enabled:
+    install_query_stats(engine)
+    
+    @app.middleware("http")
+    async def query_stats_middleware(request: Request, call_next):
+        """Report SQL statements and time spent for each request."""
+        stats = start_request_stats(request.url.path)
+        started = time.perf_counter()
+        
+        response = await call_next(request)
+        
+        duration_ms = (time.perf_counter() - started) * 1000
+        response.headers["Server-Timing"] = (
+            f'db;dur={stats.total_ms:.1f};desc="{stats.count} queries", '
+            f"app;dur={duration_ms:.1f}"
+        )
+        
+        if settings.log_requests:
+            print(
+                f"request method={request.method} path={request.url.path} "
+                f"status={response.status_code} duration_ms={duration_ms:.1f} "
+                f"db_queries={stats.count} db_ms={stats.total_ms:.1f} "
+                f"db_slowest_ms={stats.slowest_ms:.1f}"
+            )
+        return response
+
+# Request counts and latency by route, plus component gauges at /metrics
+if settings.metrics_enabled:
+    register_app_metrics(engine)
+    app.include_router(metrics_router)
+    
+    @app.middleware("http")
+    async def metrics_middleware(request: Request, call_next):
+        """Record request count, latency and concurrency per route template."""
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        status_code = 500
+        try:
+            response = await call_next(request)
+            status_code = response.status_code
+            return response
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            
+            # Label by route template, never the raw path, to bound cardinality
+            route = getattr(request.scope.get("route"), "path", None)
+            if route is None:
+                route = "/uploads" if request.url.path.startswith("/uploads/") else "unmatched"
+            
+            HTTP_REQUEST_DURATION.observe(time.perf_counter() - started, request.method, route)
+            HTTP_REQUESTS.inc(request.method, route, str(status_code))
+
+# Opt-in stack sampling of individual requests
+if settings.profiler_enabled:
+    def is_admin_request(request: Request) -> bool:
+        """Check the bearer token carries the admin role (no DB lookup)."""
+        scheme, _, token = request.headers.get("authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or not token:
+            return False
+        payload = decode_access_token(token)
+        return bool(payload) and payload.get("role") == "admin"
+    
+    @app.middleware("http")
+    async def profiler_middleware(request: Request, call_next):
+        """Profile requests that ask for it (admins only) or are sampled."""
+        if request.headers.get("x-profile") and is_admin_request(request):
+            trigger = "header"
+        elif settings.profiler_sample_rate and random.random() < settings.profiler_sample_rate:
+            trigger = "sampled"
+        else:
+            return await call_next(request)
+        
+        with RequestProfile(request.method, request.url.path, trigger) as profile:
+            response = await call_next(request)
+            profile.status_code = response.status_code
+        
+        response.headers["X-Profile-Id"] = profile.id
+        return response
+
 # Create uploads directory
 Path(settings.upload_dir).mkdir(parents=True, exist_ok=True)
 
+# On-demand resized uploads (must be registered before the static mount)
+app.include_router(renditions_router)
+
 # Static files for uploads
 app.mount("/uploads", StaticFiles(directory=settings.upload_dir), name="uploads")
 
@@ -160,6 +381,9 @@ app.include_router(auth_router, prefix="/api")
 app.include_router(admin_router, prefix="/api")
 app.include_router(public_router, prefix="/api")
 app.include_router(leads_router, prefix="/api")
+app.include_router(feeds_router, prefix="/api")
+app.include_router(saved_searches_router, prefix="/api")
+app.include_router(health_router)
 
 
 @app.get("/", tags=["Root"])
@@ -11,6 +11,15 @@ from app.models.enquiry import Enquiry
 from app.models.sell_request import SellRequest, SellRequestImage
 from app.models.brand import Brand
 from app.models.newsletter import NewsletterSubscriber
+from app.models.auth_token import RefreshToken, RevokedToken
+from app.models.vehicle_import_job import VehicleImportJob
+from app.models.vehicle_change import VehicleChange
+from app.models.vehicle_stat import VehicleStat
+from app.models.vehicle_status_event import VehicleStatusEvent
+from app.models.saved_search import (
+    SavedSearch, SavedSearchKey, SavedSearchAlert, SavedSearchPendingMatch
+)
+from app.models.fx_rate import FxRate
 
 __all__ = [
     "Vehicle",
@@ -21,4 +30,15 @@ __all__ = [
     "SellRequestImage",
     "Brand",
     "NewsletterSubscriber",
+    "RefreshToken",
+    "RevokedToken",
+    "VehicleImportJob",
+    "VehicleChange",
+    "VehicleStat",
+    "VehicleStatusEvent",
+    "SavedSearch",
+    "SavedSearchKey",
+    "SavedSearchAlert",
+    "SavedSearchPendingMatch",
+    "FxRate",
 ]
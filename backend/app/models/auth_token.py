@@ -0,0 +1,53 @@
+"""
+Auth Token Models
+
+Refresh tokens and revoked access tokens.
+"""
+
+from sqlalchemy import Column, String, DateTime, ForeignKey
+from datetime import datetime
+
+from app.core.database import Base
+from app.models.base import generate_uuid
+
+
+class RefreshToken(Base):
+    """
+    Long-lived refresh token, stored as a hash.
+    
+    Each refresh rotates the token within its family; presenting a
+    token that was already rotated revokes the whole family.
+    """
+    
+    __tablename__ = "refresh_tokens"
+    
+    id = Column(String(36), primary_key=True, default=generate_uuid)
+    user_id = Column(
+        String(36),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True
+    )
+    
+    token_hash = Column(String(64), unique=True, nullable=False, index=True)
+    family_id = Column(String(36), nullable=False, index=True)
+    
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+    revoked_at = Column(DateTime, nullable=True)
+    
+    def __repr__(self):
+        return f"<RefreshToken {self.id} user={self.user_id}>"
+
+
+class RevokedToken(Base):
+    """Access token revoked before its expiry, identified by its jti claim."""
+    
+    __tablename__ = "revoked_tokens"
+    
+    jti = Column(String(36), primary_key=True)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    revoked_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    
+    def __repr__(self):
+        return f"<RevokedToken {self.jti}>"
@@ -4,7 +4,7 @@ Enquiry Model
 Customer enquiries about vehicles.
 """
 
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -16,6 +16,9 @@ class Enquiry(Base):
     """Customer enquiry model."""
     
     __tablename__ = "enquiries"
+    __table_args__ = (
+        Index("ix_enquiries_status_created", "status", "created_at"),
+    )
     
     id = Column(String(36), primary_key=True, default=generate_uuid)
     
@@ -49,7 +52,7 @@ class Enquiry(Base):
     )
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
     responded_at = Column(DateTime, nullable=True)
     
     # Relationship
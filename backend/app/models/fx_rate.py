@@ -0,0 +1,23 @@
+"""
+FX Rate Model
+
+Exchange rates used to compare vehicle prices in Kenyan shillings.
+"""
+
+from sqlalchemy import Column, String, Float, DateTime
+from datetime import datetime
+
+from app.core.database import Base
+
+
+class FxRate(Base):
+    """Kenyan shillings per one unit of a currency (KSH itself is 1)."""
+    
+    __tablename__ = "fx_rates"
+    
+    currency = Column(String(3), primary_key=True)
+    rate_to_ksh = Column(Float, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    
+    def __repr__(self):
+        return f"<FxRate {self.currency} {self.rate_to_ksh}>"
@@ -0,0 +1,153 @@
+"""
+Saved Search Models
+
+Customer saved searches, their reverse index keys, the alerts sent for
+them, and vehicle writes waiting to be matched against them.
+"""
+
+import secrets
+from sqlalchemy import (
+    Column, String, Integer, Float, Boolean, DateTime, JSON,
+    Enum as SQLEnum, ForeignKey, Index, UniqueConstraint
+)
+from sqlalchemy.orm import relationship
+from datetime import datetime
+
+from app.core.database import Base
+from app.models.base import generate_uuid
+
+
+def generate_token() -> str:
+    """Generate a secret for managing a saved search without an account."""
+    return secrets.token_urlsafe(32)
+
+
+class SavedSearch(Base):
+    """A customer's saved vehicle search, alerted on new matches and price drops."""
+    
+    __tablename__ = "saved_searches"
+    
+    id = Column(String(36), primary_key=True, default=generate_uuid)
+    
+    email = Column(String(255), nullable=False, index=True)
+    name = Column(String(100), nullable=True)
+    filters = Column(JSON, nullable=False, default=dict)  # The vehicle list filter params
+    
+    # Lets the customer view or delete the search (e.g. from an alert's unsubscribe link)
+    token = Column(String(64), unique=True, nullable=False, default=generate_token)
+    is_active = Column(Boolean, default=True, nullable=False)
+    
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    last_alerted_at = Column(DateTime, nullable=True)
+    
+    # Relationships
+    keys = relationship(
+        "SavedSearchKey",
+        back_populates="saved_search",
+        cascade="all, delete-orphan"
+    )
+    alerts = relationship(
+        "SavedSearchAlert",
+        back_populates="saved_search",
+        cascade="all, delete-orphan"
+    )
+    
+    def __repr__(self):
+        return f"<SavedSearch {self.id} {self.email}>"
+
+
+class SavedSearchKey(Base):
+    """
+    Reverse index entry: a saved search wants vehicles with these keys.
+    
+    One row per price band the search covers. "*" (make, body type) and
+    -1 (price band) stand for "any".
+    """
+    
+    __tablename__ = "saved_search_keys"
+    __table_args__ = (
+        Index("ix_saved_search_keys_lookup", "make_key", "body_key", "price_band"),
+    )
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    saved_search_id = Column(
+        String(36),
+        ForeignKey("saved_searches.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True
+    )
+    make_key = Column(String(100), nullable=False)
+    body_key = Column(String(20), nullable=False)
+    price_band = Column(Integer, nullable=False)
+    
+    # Relationship
+    saved_search = relationship("SavedSearch", back_populates="keys")
+    
+    def __repr__(self):
+        return f"<SavedSearchKey {self.make_key}/{self.body_key}/{self.price_band}>"
+
+
+class SavedSearchAlert(Base):
+    """
+    A vehicle matched a saved search: queued until delivered.
+    
+    Unique per search, vehicle, kind and price, so the same news is never
+    sent twice.
+    """
+    
+    __tablename__ = "saved_search_alerts"
+    __table_args__ = (
+        UniqueConstraint(
+            "saved_search_id", "vehicle_id", "kind", "price",
+            name="uq_saved_search_alerts_search_vehicle_kind_price"
+        ),
+        # Delivery picks up unsent alerts, oldest first
+        Index("ix_saved_search_alerts_sent_created", "sent_at", "created_at"),
+    )
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    saved_search_id = Column(
+        String(36),
+        ForeignKey("saved_searches.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True
+    )
+    vehicle_id = Column(String(36), nullable=False)
+    kind = Column(
+        SQLEnum("new_listing", "price_drop", name="saved_search_alert_kind"),
+        nullable=False
+    )
+    price = Column(Float, nullable=False)
+    old_price = Column(Float, nullable=True)
+    
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    # A sender's lease: claimed alerts are skipped until it expires, so a
+    # sender that dies mid-send leaves them to be sent again
+    claimed_at = Column(DateTime, nullable=True)
+    sent_at = Column(DateTime, nullable=True)
+    
+    # Relationship
+    saved_search = relationship("SavedSearch", back_populates="alerts")
+    
+    def __repr__(self):
+        return f"<SavedSearchAlert {self.kind} {self.vehicle_id}>"
+
+
+class SavedSearchPendingMatch(Base):
+    """
+    A vehicle write not yet matched against saved searches.
+    
+    Written in the same transaction as the vehicle, so matching survives
+    a restart. old_status is None for a new vehicle.
+    """
+    
+    __tablename__ = "saved_search_pending_matches"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    vehicle_id = Column(String(36), nullable=False)
+    old_status = Column(String(20), nullable=True)
+    old_price = Column(Float, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    def __repr__(self):
+        return f"<SavedSearchPendingMatch {self.vehicle_id}>"
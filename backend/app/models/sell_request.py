@@ -4,7 +4,7 @@ Sell Request Model
 Requests from customers wanting to sell their cars.
 """
 
-from sqlalchemy import Column, String, Integer, Float, Text, DateTime, Enum as SQLEnum, ForeignKey
+from sqlalchemy import Column, String, Integer, Float, Text, DateTime, Enum as SQLEnum, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -16,6 +16,9 @@ class SellRequest(Base, TimestampMixin):
     """Sell your car request model."""
     
     __tablename__ = "sell_requests"
+    __table_args__ = (
+        Index("ix_sell_requests_status_created", "status", "created_at"),
+    )
     
     id = Column(String(36), primary_key=True, default=generate_uuid)
     
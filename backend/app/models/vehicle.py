@@ -6,7 +6,7 @@ Represents vehicles in the dealership inventory.
 
 from sqlalchemy import (
     Column, String, Integer, Float, Boolean, 
-    Text, DateTime, Enum as SQLEnum, JSON
+    Text, DateTime, Enum as SQLEnum, JSON, Index
 )
 from sqlalchemy.orm import relationship
 
@@ -18,6 +18,14 @@ class Vehicle(Base, TimestampMixin):
     """Vehicle model for car listings."""
     
     __tablename__ = "vehicles"
+    __table_args__ = (
+        # Listing pages: filter by status, newest first
+        Index("ix_vehicles_status_created", "availability_status", "created_at"),
+        # Featured strip on the home page
+        Index("ix_vehicles_featured_status_created", "is_featured", "availability_status", "created_at"),
+        # Listing pages: price range and price sort within a status
+        Index("ix_vehicles_status_price_ksh", "availability_status", "price_ksh"),
+    )
     
     # Primary key
     id = Column(String(36), primary_key=True, default=generate_uuid)
@@ -35,6 +43,7 @@ class Vehicle(Base, TimestampMixin):
         default="KSH",
         nullable=False
     )
+    price_ksh = Column(Float, nullable=True, index=True)  # price in KSH at current FX rates
     
     # Specifications
     mileage = Column(Integer, nullable=True)
@@ -68,6 +77,7 @@ class Vehicle(Base, TimestampMixin):
         nullable=False,
         index=True
     )
+    sold_at = Column(DateTime, nullable=True, index=True)  # Set when status changes to sold
     location = Column(String(100), default="Kenya", nullable=True)
     
     # Details
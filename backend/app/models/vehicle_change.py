@@ -0,0 +1,33 @@
+"""
+Vehicle Change Model
+
+Append-only log of vehicle changes, used to sync partners incrementally.
+"""
+
+from sqlalchemy import Column, String, Integer, DateTime, Enum as SQLEnum
+from datetime import datetime
+
+from app.core.database import Base
+
+
+class VehicleChange(Base):
+    """
+    One change to a vehicle, numbered by a monotonic sequence.
+    
+    Written in the same transaction as the change itself. Rows are kept
+    after the vehicle is deleted (op "delete"), so they carry no foreign key.
+    """
+    
+    __tablename__ = "vehicle_changes"
+    __table_args__ = {"sqlite_autoincrement": True}  # Never reuse a seq
+    
+    seq = Column(Integer, primary_key=True, autoincrement=True)
+    vehicle_id = Column(String(36), nullable=False, index=True)
+    op = Column(
+        SQLEnum("upsert", "delete", name="vehicle_change_op"),
+        nullable=False
+    )
+    changed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    def __repr__(self):
+        return f"<VehicleChange {self.seq} {self.op} {self.vehicle_id}>"
@@ -4,7 +4,7 @@ Vehicle Image Model
 Stores images associated with vehicles.
 """
 
-from sqlalchemy import Column, String, Integer, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, String, Integer, Boolean, Text, DateTime, ForeignKey
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -30,6 +30,11 @@ class VehicleImage(Base):
     display_order = Column(Integer, default=0)
     uploaded_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     
+    # Intrinsic size and a tiny inline preview, computed at upload
+    width = Column(Integer, nullable=True)
+    height = Column(Integer, nullable=True)
+    placeholder = Column(Text, nullable=True)  # data:image/webp;base64,...
+    
     # Relationship
     vehicle = relationship("Vehicle", back_populates="images")
     
@@ -0,0 +1,53 @@
+"""
+Vehicle Import Job Model
+
+Tracks bulk vehicle imports running in the background.
+"""
+
+from sqlalchemy import Column, String, Integer, Text, DateTime, JSON, Enum as SQLEnum
+from datetime import datetime
+
+from app.core.database import Base
+from app.models.base import generate_uuid
+
+
+class VehicleImportJob(Base):
+    """A CSV/JSONL vehicle import and its progress."""
+    
+    __tablename__ = "vehicle_import_jobs"
+    
+    id = Column(String(36), primary_key=True, default=generate_uuid)
+    
+    status = Column(
+        SQLEnum("pending", "running", "completed", "failed", name="import_job_status"),
+        default="pending",
+        nullable=False,
+        index=True
+    )
+    
+    # Source
+    filename = Column(String(255), nullable=False)
+    file_format = Column(String(10), nullable=False)  # csv or jsonl
+    source_path = Column(String(500), nullable=False)
+    images_path = Column(String(500), nullable=True)  # zip of images named in rows
+    
+    # Progress
+    total_rows = Column(Integer, nullable=True)
+    processed_rows = Column(Integer, default=0, nullable=False)
+    created_count = Column(Integer, default=0, nullable=False)
+    updated_count = Column(Integer, default=0, nullable=False)
+    failed_count = Column(Integer, default=0, nullable=False)
+    images_attached = Column(Integer, default=0, nullable=False)
+    
+    # Per-row errors ([{row, errors}]), capped; failed_count has the full total
+    errors = Column(JSON, default=list)
+    error_message = Column(Text, nullable=True)  # Why the whole job failed
+    
+    created_by = Column(String(36), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)  # Last progress; a stale job was orphaned by a restart
+    finished_at = Column(DateTime, nullable=True)
+    
+    def __repr__(self):
+        return f"<VehicleImportJob {self.id} {self.status}>"
@@ -0,0 +1,36 @@
+"""
+Vehicle Stat Model
+
+Time-bucketed counts of views, enquiries and leads per vehicle.
+"""
+
+from sqlalchemy import Column, String, Integer, DateTime, Index
+
+from app.core.database import Base
+
+
+class VehicleStat(Base):
+    """
+    Counts for one vehicle in one hour or day (UTC).
+    
+    Hourly buckets are written live and merged into daily buckets once
+    they age out. Rows are kept after the vehicle is deleted, so there is
+    no foreign key.
+    """
+    
+    __tablename__ = "vehicle_stats"
+    __table_args__ = (
+        # Site-wide series: every vehicle's buckets in a time range
+        Index("ix_vehicle_stats_granularity_bucket", "granularity", "bucket_start"),
+    )
+    
+    granularity = Column(String(4), primary_key=True)  # hour or day
+    vehicle_id = Column(String(36), primary_key=True)
+    bucket_start = Column(DateTime, primary_key=True)
+    
+    views = Column(Integer, default=0, nullable=False)
+    enquiries = Column(Integer, default=0, nullable=False)
+    leads = Column(Integer, default=0, nullable=False)
+    
+    def __repr__(self):
+        return f"<VehicleStat {self.granularity} {self.vehicle_id} {self.bucket_start}>"
@@ -0,0 +1,34 @@
+"""
+Vehicle Status Event Model
+
+History of availability status transitions.
+"""
+
+from sqlalchemy import Column, String, Integer, DateTime, Index
+from datetime import datetime
+
+from app.core.database import Base
+
+
+class VehicleStatusEvent(Base):
+    """
+    One availability status change of a vehicle.
+    
+    from_status is None for a vehicle's initial status. Events are kept
+    after the vehicle is deleted, so there is no foreign key.
+    """
+    
+    __tablename__ = "vehicle_status_events"
+    __table_args__ = (
+        # "Sold in the last N days" and similar transition queries
+        Index("ix_vehicle_status_events_to_status_changed", "to_status", "changed_at"),
+    )
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    vehicle_id = Column(String(36), nullable=False, index=True)
+    from_status = Column(String(20), nullable=True)
+    to_status = Column(String(20), nullable=False)
+    changed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    def __repr__(self):
+        return f"<VehicleStatusEvent {self.vehicle_id} {self.from_status}->{self.to_status}>"
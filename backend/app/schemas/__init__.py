@@ -8,26 +8,44 @@ from app.schemas.vehicle import (
     VehicleBase, VehicleCreate, VehicleUpdate, VehicleResponse,
     VehicleListResponse, VehicleFilters,
     VehicleImageBase, VehicleImageCreate, VehicleImageResponse,
+    VehicleImageUploadResult, VehicleImageBatchResponse,
+    VehicleImportRowError, VehicleImportJobResponse, VehicleBulkUpdate,
+    VehicleChangeResponse, VehicleChangeFeedResponse,
     CurrencyType, BodyType, TransmissionType, FuelType, ConditionType, AvailabilityStatus
 )
 from app.schemas.enquiry import (
     EnquiryBase, EnquiryCreate, EnquiryUpdateStatus, EnquiryResponse,
-    EnquiryListResponse, EnquiryType, EnquiryStatus
+    EnquiryListResponse, EnquiryType, EnquiryStatus,
+    EnquiryFilters, EnquiryBulkStatusUpdate
 )
 from app.schemas.sell_request import (
     SellRequestBase, SellRequestCreate, SellRequestUpdateStatus,
     SellRequestValuation, SellRequestResponse, SellRequestListResponse,
-    SellRequestImageResponse, ServiceType, SellRequestStatus
+    SellRequestImageResponse, SellRequestImageUploadResult, SellRequestImageBatchResponse,
+    ServiceType, SellRequestStatus,
+    SellRequestFilters, SellRequestBulkStatusUpdate,
+    ValuationComparable, SellRequestValuationSuggestion
 )
 from app.schemas.user import (
     UserBase, UserCreate, UserUpdate, UserResponse,
-    LoginRequest, TokenResponse, TokenData, UserRole, UserProfileUpdate
+    LoginRequest, TokenResponse, TokenData, UserRole, UserProfileUpdate,
+    RefreshTokenRequest, LogoutRequest
 )
 from app.schemas.brand import (
     BrandBase, BrandCreate, BrandUpdate, BrandResponse, BrandListResponse
 )
+from app.schemas.analytics import (
+    AnalyticsTotals, AnalyticsPoint, AnalyticsSeriesResponse, TimeToSellStats
+)
+from app.schemas.saved_search import (
+    SavedSearchFilters, SavedSearchCreate, SavedSearchResponse
+)
+from app.schemas.fx_rate import (
+    FxRateResponse, FxRatesUpdate, FxRatesUpdateResponse
+)
 from app.schemas.common import (
-    MessageResponse, NewsletterSubscribe, PublicStats, DashboardStats
+    MessageResponse, NewsletterSubscribe, PublicStats, DashboardStats, BulkActionResponse,
+    FeedBuildResponse
 )
 
 __all__ = [
@@ -35,19 +53,34 @@ __all__ = [
     "VehicleBase", "VehicleCreate", "VehicleUpdate", "VehicleResponse",
     "VehicleListResponse", "VehicleFilters",
     "VehicleImageBase", "VehicleImageCreate", "VehicleImageResponse",
+    "VehicleImageUploadResult", "VehicleImageBatchResponse",
+    "VehicleImportRowError", "VehicleImportJobResponse", "VehicleBulkUpdate",
+    "VehicleChangeResponse", "VehicleChangeFeedResponse",
     "CurrencyType", "BodyType", "TransmissionType", "FuelType", "ConditionType", "AvailabilityStatus",
     # Enquiry
     "EnquiryBase", "EnquiryCreate", "EnquiryUpdateStatus", "EnquiryResponse",
     "EnquiryListResponse", "EnquiryType", "EnquiryStatus",
+    "EnquiryFilters", "EnquiryBulkStatusUpdate",
     # Sell Request
     "SellRequestBase", "SellRequestCreate", "SellRequestUpdateStatus",
     "SellRequestValuation", "SellRequestResponse", "SellRequestListResponse",
-    "SellRequestImageResponse", "ServiceType", "SellRequestStatus",
+    "SellRequestImageResponse", "SellRequestImageUploadResult", "SellRequestImageBatchResponse",
+    "ServiceType", "SellRequestStatus",
+    "SellRequestFilters", "SellRequestBulkStatusUpdate",
+    "ValuationComparable", "SellRequestValuationSuggestion",
     # User
     "UserBase", "UserCreate", "UserUpdate", "UserResponse",
     "LoginRequest", "TokenResponse", "TokenData", "UserRole", "UserProfileUpdate",
+    "RefreshTokenRequest", "LogoutRequest",
     # Brand
     "BrandBase", "BrandCreate", "BrandUpdate", "BrandResponse", "BrandListResponse",
+    # Analytics
+    "AnalyticsTotals", "AnalyticsPoint", "AnalyticsSeriesResponse", "TimeToSellStats",
+    # Saved Search
+    "SavedSearchFilters", "SavedSearchCreate", "SavedSearchResponse",
+    # FX Rates
+    "FxRateResponse", "FxRatesUpdate", "FxRatesUpdateResponse",
     # Common
-    "MessageResponse", "NewsletterSubscribe", "PublicStats", "DashboardStats",
+    "MessageResponse", "NewsletterSubscribe", "PublicStats", "DashboardStats", "BulkActionResponse",
+    "FeedBuildResponse",
 ]
@@ -0,0 +1,40 @@
+"""
+Analytics Schemas
+
+Pydantic models for analytics time series.
+"""
+
+from typing import List, Optional
+from datetime import datetime
+from pydantic import BaseModel
+
+
+class AnalyticsTotals(BaseModel):
+    """Counts of views, enquiries and leads."""
+    views: int
+    enquiries: int
+    leads: int
+
+
+class AnalyticsPoint(AnalyticsTotals):
+    """Counts for one hour or day (UTC)."""
+    bucket_start: datetime
+
+
+class AnalyticsSeriesResponse(BaseModel):
+    """Zero-filled time series, for one vehicle or all vehicles."""
+    granularity: str
+    vehicle_id: Optional[str] = None
+    start: datetime
+    end: datetime
+    points: List[AnalyticsPoint]
+    totals: AnalyticsTotals
+
+
+class TimeToSellStats(BaseModel):
+    """Days from listing to sale for one group of sold vehicles."""
+    group: str
+    sold: int
+    avg_days: float
+    median_days: float
+    p90_days: float
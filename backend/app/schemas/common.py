@@ -43,3 +43,18 @@ class DashboardStats(BaseModel):
     conversion_rate: float = 0.0 # Lead conversion %
     avg_days_to_sell: float = 0.0 # Inventory velocity
     total_inventory_value: float = 0.0 # Market value of active stock
+
+
+class BulkActionResponse(BaseModel):
+    """Result of a bulk update."""
+    requested: Optional[int] = None # Number of ids sent, if targeted by ids
+    updated: int
+
+
+class FeedBuildResponse(BaseModel):
+    """Result of a marketplace feed build."""
+    mode: str # full, incremental or unchanged
+    rendered: int
+    items: int
+    seq: int
+    duration_ms: float
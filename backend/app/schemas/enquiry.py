@@ -4,7 +4,7 @@ Enquiry Schemas
 Pydantic models for enquiry API validation.
 """
 
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime
 from pydantic import BaseModel, Field, EmailStr
 from enum import Enum
@@ -64,3 +64,18 @@ class EnquiryListResponse(BaseModel):
     total: int
     page: int
     limit: int
+
+
+class EnquiryFilters(BaseModel):
+    """Filter for selecting enquiries in bulk."""
+    status: Optional[EnquiryStatus] = None
+    enquiry_type: Optional[EnquiryType] = None
+    vehicle_id: Optional[str] = None
+    created_before: Optional[datetime] = None
+
+
+class EnquiryBulkStatusUpdate(BaseModel):
+    """Schema for setting the status of many enquiries (by ids or filter)."""
+    ids: Optional[List[str]] = Field(None, min_length=1, max_length=1000)
+    filter: Optional[EnquiryFilters] = None
+    status: EnquiryStatus
@@ -0,0 +1,32 @@
+"""
+FX Rate Schemas
+
+Pydantic models for exchange rates.
+"""
+
+from typing import Dict, List
+from datetime import datetime
+from pydantic import BaseModel, PositiveFloat
+
+from app.schemas.vehicle import CurrencyType
+
+
+class FxRateResponse(BaseModel):
+    """Kenyan shillings per one unit of currency."""
+    currency: str
+    rate_to_ksh: float
+    updated_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+
+class FxRatesUpdate(BaseModel):
+    """New rates by currency; currencies left out keep their rate."""
+    rates: Dict[CurrencyType, PositiveFloat]
+
+
+class FxRatesUpdateResponse(BaseModel):
+    """Rates after an update, and how many vehicle prices were recomputed."""
+    rates: List[FxRateResponse]
+    vehicles_updated: int
@@ -0,0 +1,47 @@
+"""
+Saved Search Schemas
+
+Pydantic models for saved searches and their alerts.
+"""
+
+from typing import Optional
+from datetime import datetime
+from pydantic import BaseModel, Field, EmailStr
+
+from app.schemas.vehicle import BodyType, TransmissionType, FuelType
+
+
+class SavedSearchFilters(BaseModel):
+    """The vehicle list filters a saved search watches (same as GET /vehicles)."""
+    make: Optional[str] = Field(None, max_length=100)
+    model: Optional[str] = Field(None, max_length=100)
+    min_price: Optional[float] = Field(None, ge=0)
+    max_price: Optional[float] = Field(None, ge=0)
+    min_year: Optional[int] = Field(None, ge=1900)
+    max_year: Optional[int] = Field(None, le=2030)
+    body_type: Optional[BodyType] = None
+    transmission: Optional[TransmissionType] = None
+    fuel_type: Optional[FuelType] = None
+    location: Optional[str] = Field(None, max_length=100)
+    search: Optional[str] = Field(None, max_length=100)
+
+
+class SavedSearchCreate(SavedSearchFilters):
+    """Schema for saving a search."""
+    email: EmailStr
+    name: Optional[str] = Field(None, max_length=100)
+
+
+class SavedSearchResponse(BaseModel):
+    """Schema for a saved search. token manages it without an account."""
+    id: str
+    email: str
+    name: Optional[str]
+    filters: SavedSearchFilters
+    token: str
+    is_active: bool
+    created_at: datetime
+    last_alerted_at: Optional[datetime]
+    
+    class Config:
+        from_attributes = True
@@ -33,6 +33,21 @@ class SellRequestImageResponse(BaseModel):
         from_attributes = True
 
 
+class SellRequestImageUploadResult(BaseModel):
+    """Per-file result of a batch image upload."""
+    filename: Optional[str] = None
+    success: bool
+    image: Optional[SellRequestImageResponse] = None
+    error: Optional[str] = None
+
+
+class SellRequestImageBatchResponse(BaseModel):
+    """Schema for batch image upload response."""
+    items: List[SellRequestImageUploadResult]
+    uploaded: int
+    failed: int
+
+
 class SellRequestBase(BaseModel):
     """Base sell request schema."""
     customer_name: str = Field(..., min_length=2, max_length=100)
@@ -85,3 +100,41 @@ class SellRequestListResponse(BaseModel):
     total: int
     page: int
     limit: int
+
+
+class SellRequestFilters(BaseModel):
+    """Filter for selecting sell requests in bulk."""
+    status: Optional[SellRequestStatus] = None
+    service_type: Optional[ServiceType] = None
+    created_before: Optional[datetime] = None
+
+
+class SellRequestBulkStatusUpdate(BaseModel):
+    """Schema for setting the status of many sell requests (by ids or filter)."""
+    ids: Optional[List[str]] = Field(None, min_length=1, max_length=1000)
+    filter: Optional[SellRequestFilters] = None
+    status: SellRequestStatus
+
+
+class ValuationComparable(BaseModel):
+    """A vehicle used as a comparable in a suggested valuation."""
+    id: str
+    make: str
+    model: str
+    year: int
+    mileage: Optional[int] = None
+    condition: Optional[str] = None
+    price: float
+    availability_status: str
+    distance: float
+
+
+class SellRequestValuationSuggestion(BaseModel):
+    """Suggested valuation for a sell request, from its nearest comparables."""
+    sell_request_id: str
+    estimate: float
+    low: float
+    high: float
+    currency: str
+    confidence: str  # high, medium or low, by how close the comparables are
+    comparables: List[ValuationComparable]
@@ -68,9 +68,21 @@ class TokenResponse(BaseModel):
     """Schema for token response."""
     access_token: str
     token_type: str = "bearer"
+    expires_in: Optional[int] = None  # Access token lifetime in seconds
+    refresh_token: Optional[str] = None
     user: UserResponse
 
 
+class RefreshTokenRequest(BaseModel):
+    """Schema for exchanging a refresh token."""
+    refresh_token: str
+
+
+class LogoutRequest(BaseModel):
+    """Schema for logout. The refresh token, if sent, is revoked too."""
+    refresh_token: Optional[str] = None
+
+
 class TokenData(BaseModel):
     """Schema for decoded token data."""
     user_id: str
@@ -71,11 +71,29 @@ class VehicleImageResponse(VehicleImageBase):
     """Schema for image response."""
     id: str
     uploaded_at: datetime
+    width: Optional[int] = None
+    height: Optional[int] = None
+    placeholder: Optional[str] = None
     
     class Config:
         from_attributes = True
 
 
+class VehicleImageUploadResult(BaseModel):
+    """Per-file result of a batch image upload."""
+    filename: Optional[str] = None
+    success: bool
+    image: Optional[VehicleImageResponse] = None
+    error: Optional[str] = None
+
+
+class VehicleImageBatchResponse(BaseModel):
+    """Schema for batch image upload response."""
+    items: List[VehicleImageUploadResult]
+    uploaded: int
+    failed: int
+
+
 # ============ Vehicle Schemas ============
 
 class VehicleBase(BaseModel):
@@ -136,7 +154,9 @@ class VehicleUpdate(BaseModel):
 class VehicleResponse(VehicleBase):
     """Schema for vehicle response."""
     id: str
+    price_ksh: Optional[float] = None  # price at current FX rates, for comparing currencies
     views_count: int
+    sold_at: Optional[datetime] = None
     created_at: datetime
     updated_at: datetime
     images: List[VehicleImageResponse] = []
@@ -156,6 +176,59 @@ class VehicleListResponse(BaseModel):
     pages: int
 
 
+# ============ Import Schemas ============
+
+class VehicleImportRowError(BaseModel):
+    """Validation or write errors for one imported row (1-based, excluding any header)."""
+    row: int
+    errors: List[str]
+
+
+class VehicleImportJobResponse(BaseModel):
+    """Schema for bulk import job status."""
+    id: str
+    status: str
+    filename: str
+    file_format: str
+    total_rows: Optional[int] = None
+    processed_rows: int
+    created_count: int
+    updated_count: int
+    failed_count: int
+    images_attached: int
+    errors: List[VehicleImportRowError] = []
+    error_message: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
+
+
+# ============ Change Feed Schemas ============
+
+class VehicleChangeResponse(BaseModel):
+    """
+    Latest change to one vehicle.
+    
+    op is "upsert" with the vehicle's current state, or "delete" with no
+    vehicle (a tombstone).
+    """
+    seq: int
+    vehicle_id: str
+    op: str
+    changed_at: datetime
+    vehicle: Optional[VehicleResponse] = None
+
+
+class VehicleChangeFeedResponse(BaseModel):
+    """A batch of changes; pass next_since back as since for the next one."""
+    items: List[VehicleChangeResponse]
+    next_since: int
+    has_more: bool
+
+
 # ============ Filter Schemas ============
 
 class VehicleFilters(BaseModel):
@@ -172,3 +245,22 @@ class VehicleFilters(BaseModel):
     availability_status: Optional[AvailabilityStatus] = None
     location: Optional[str] = None
     is_featured: Optional[bool] = None
+
+
+# ============ Bulk Action Schemas ============
+
+class VehicleBulkUpdate(BaseModel):
+    """
+    Schema for a bulk vehicle update.
+    
+    Targets either explicit ids or every vehicle matching filter. Only the
+    change fields that are set are applied; price sets an absolute price
+    while price_change_percent adjusts each vehicle's current price.
+    """
+    ids: Optional[List[str]] = Field(None, min_length=1, max_length=1000)
+    filter: Optional[VehicleFilters] = None
+    
+    availability_status: Optional[AvailabilityStatus] = None
+    is_featured: Optional[bool] = None
+    price: Optional[float] = Field(None, gt=0)
+    price_change_percent: Optional[float] = Field(None, gt=-100, le=100)
@@ -9,7 +9,17 @@ from app.services.enquiry_service import EnquiryService
 from app.services.sell_request_service import SellRequestService
 from app.services.auth_service import AuthService
 from app.services.image_service import ImageService
+from app.services.rendition_service import RenditionService
 from app.services.lead_service import LeadService
+from app.services.health_service import HealthService
+from app.services.vehicle_import_service import VehicleImportService
+from app.services.export_service import ExportService
+from app.services.feed_service import FeedService
+from app.services.analytics_service import AnalyticsService
+from app.services.valuation_service import ValuationService
+from app.services.similarity_service import SimilarityService
+from app.services.saved_search_service import SavedSearchService
+from app.services.fx_service import FxService
 
 __all__ = [
     "VehicleService",
@@ -17,5 +27,15 @@ __all__ = [
     "SellRequestService",
     "AuthService",
     "ImageService",
+    "RenditionService",
     "LeadService",
+    "HealthService",
+    "VehicleImportService",
+    "ExportService",
+    "FeedService",
+    "AnalyticsService",
+    "ValuationService",
+    "SimilarityService",
+    "SavedSearchService",
+    "FxService",
 ]
@@ -0,0 +1,236 @@
+"""
+Analytics Service
+
+Hourly and daily rollups of vehicle views, enquiries and leads.
+"""
+
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import case, delete, func, literal, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models import Vehicle, VehicleStat
+
+settings = get_settings()
+
+
+class AnalyticsService:
+    """Service class for analytics rollups."""
+    
+    METRICS = ("views", "enquiries", "leads")
+    GRANULARITIES = {"hour": timedelta(hours=1), "day": timedelta(days=1)}
+    
+    # Rows per upsert statement during compaction
+    BATCH_SIZE = 1000
+    
+    @staticmethod
+    def bucket_start(at: datetime, granularity: str) -> datetime:
+        """Truncate a UTC datetime to the start of its hour or day."""
+        at = at.replace(minute=0, second=0, microsecond=0)
+        if granularity == "day":
+            at = at.replace(hour=0)
+        return at
+    
+    @classmethod
+    def _upsert(cls, db: Session, rows: List[Dict[str, Any]]) -> None:
+        """Insert buckets, adding the counts onto any that already exist."""
+        insert = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+        stmt = insert(VehicleStat)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["granularity", "vehicle_id", "bucket_start"],
+            set_={
+                metric: getattr(VehicleStat, metric) + getattr(stmt.excluded, metric)
+                for metric in cls.METRICS
+            }
+        )
+        db.execute(stmt, rows)
+    
+    @classmethod
+    def record(
+        cls,
+        db: Session,
+        vehicle_id: str,
+        metric: str,
+        count: int = 1,
+        at: Optional[datetime] = None
+    ) -> None:
+        """
+        Count an event in the vehicle's current hourly bucket.
+        
+        Does not commit: call inside the transaction that writes the event.
+        """
+        row = {metric_name: 0 for metric_name in cls.METRICS}
+        row[metric] = count
+        row.update(
+            granularity="hour",
+            vehicle_id=vehicle_id,
+            bucket_start=cls.bucket_start(at or datetime.utcnow(), "hour")
+        )
+        cls._upsert(db, [row])
+    
+    @classmethod
+    def compact(cls, db: Session, now: Optional[datetime] = None) -> int:
+        """
+        Merge hourly buckets older than the retention window into daily buckets.
+        
+        The hourly rows are claimed with DELETE ... RETURNING, so two workers
+        compacting at once cannot count the same hour twice. Only whole days
+        are merged. Returns the number of hourly buckets merged.
+        """
+        now = now or datetime.utcnow()
+        cutoff = cls.bucket_start(now - timedelta(days=settings.analytics_hourly_retention_days), "day")
+        
+        claimed = db.execute(
+            delete(VehicleStat).where(
+                VehicleStat.granularity == "hour",
+                VehicleStat.bucket_start < cutoff
+            ).returning(
+                VehicleStat.vehicle_id, VehicleStat.bucket_start,
+                *(getattr(VehicleStat, metric) for metric in cls.METRICS)
+            )
+        ).all()
+        
+        daily: Dict[Tuple[str, datetime], Dict[str, int]] = defaultdict(
+            lambda: dict.fromkeys(cls.METRICS, 0)
+        )
+        for vehicle_id, bucket_start, *counts in claimed:
+            totals = daily[(vehicle_id, cls.bucket_start(bucket_start, "day"))]
+            for metric, count in zip(cls.METRICS, counts):
+                totals[metric] += count
+        
+        rows = [
+            {"granularity": "day", "vehicle_id": vehicle_id, "bucket_start": day, **totals}
+            for (vehicle_id, day), totals in daily.items()
+        ]
+        for offset in range(0, len(rows), cls.BATCH_SIZE):
+            cls._upsert(db, rows[offset:offset + cls.BATCH_SIZE])
+        
+        db.commit()
+        return len(claimed)
+    
+    @classmethod
+    def _sum_by_bucket(
+        cls,
+        db: Session,
+        granularity: str,
+        start: datetime,
+        end: datetime,
+        vehicle_id: Optional[str]
+    ) -> List[Tuple]:
+        """(bucket_start, views, enquiries, leads) summed over vehicles, per stored bucket."""
+        query = db.query(
+            VehicleStat.bucket_start,
+            *(func.sum(getattr(VehicleStat, metric)) for metric in cls.METRICS)
+        ).filter(
+            VehicleStat.granularity == granularity,
+            VehicleStat.bucket_start >= start,
+            VehicleStat.bucket_start < end
+        )
+        if vehicle_id:
+            query = query.filter(VehicleStat.vehicle_id == vehicle_id)
+        return query.group_by(VehicleStat.bucket_start).all()
+    
+    @classmethod
+    def get_series(
+        cls,
+        db: Session,
+        granularity: str = "day",
+        days: int = 30,
+        vehicle_id: Optional[str] = None,
+        now: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """
+        Get a zero-filled time series for one vehicle, or all vehicles.
+        
+        Covers the last days days up to and including the current bucket.
+        Daily series also fold in recent hourly buckets that have not
+        been compacted yet.
+        """
+        step = cls.GRANULARITIES[granularity]
+        end = cls.bucket_start(now or datetime.utcnow(), granularity) + step
+        start = cls.bucket_start(end - timedelta(days=days), granularity)
+        
+        points: Dict[datetime, Dict[str, int]] = {}
+        bucket = start
+        while bucket < end:
+            points[bucket] = dict.fromkeys(cls.METRICS, 0)
+            bucket += step
+        
+        rows = cls._sum_by_bucket(db, granularity, start, end, vehicle_id)
+        if granularity == "day":
+            rows += cls._sum_by_bucket(db, "hour", start, end, vehicle_id)
+        
+        for bucket_start, *counts in rows:
+            point = points[cls.bucket_start(bucket_start, granularity)]
+            for metric, count in zip(cls.METRICS, counts):
+                point[metric] += count or 0
+        
+        series = [{"bucket_start": bucket, **counts} for bucket, counts in points.items()]
+        return {
+            "granularity": granularity,
+            "vehicle_id": vehicle_id,
+            "start": start,
+            "end": end,
+            "points": series,
+            "totals": {metric: sum(point[metric] for point in series) for metric in cls.METRICS},
+        }
+    
+    @staticmethod
+    def _days_between(db: Session, start, end):
+        """SQL expression for the fractional days from start to end."""
+        if db.get_bind().dialect.name == "postgresql":
+            return func.extract("epoch", end - start) / 86400
+        return func.julianday(end) - func.julianday(start)
+    
+    @classmethod
+    def time_to_sell(cls, db: Session, group_by: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Days from listing to sale for sold vehicles, computed in SQL.
+        
+        group_by may be "make" or "body_type"; otherwise a single "all"
+        group is returned. Each group has the number sold, the mean, and
+        the median and 90th percentile (nearest rank) in days.
+        """
+        column = {"make": Vehicle.make, "body_type": Vehicle.body_type}.get(group_by)
+        group = column if column is not None else literal("all")
+        days = cls._days_between(db, Vehicle.created_at, Vehicle.sold_at)
+        
+        ranked = select(
+            group.label("group"),
+            days.label("days"),
+            func.row_number().over(partition_by=group, order_by=days).label("rank"),
+            func.count().over(partition_by=group).label("total")
+        ).where(
+            Vehicle.availability_status == "sold",
+            Vehicle.sold_at.isnot(None)
+        ).subquery()
+        
+        def percentile(p: int):
+            # Nearest rank: the value at rank ceil(p% of total)
+            rank = (ranked.c.total * p + 99) // 100
+            return func.max(case((ranked.c.rank == rank, ranked.c.days)))
+        
+        rows = db.execute(
+            select(
+                ranked.c.group,
+                func.count(),
+                func.avg(ranked.c.days),
+                percentile(50),
+                percentile(90)
+            ).group_by(ranked.c.group).order_by(func.count().desc(), ranked.c.group)
+        ).all()
+        
+        return [
+            {
+                "group": group_value or "Unknown",
+                "sold": sold,
+                "avg_days": round(avg_days, 1),
+                "median_days": round(median_days, 1),
+                "p90_days": round(p90_days, 1),
+            }
+            for group_value, sold, avg_days, median_days, p90_days in rows
+        ]
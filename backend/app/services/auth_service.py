@@ -4,18 +4,77 @@ Auth Service
 Business logic for authentication operations.
 """
 
-from typing import Optional
-from datetime import datetime
-from sqlalchemy.orm import Session
+from typing import Optional, Tuple
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session, make_transient_to_detached
 
-from app.models import User
-from app.core.security import verify_password, get_password_hash, create_access_token
+from app.models import User, RefreshToken, RevokedToken
+from app.models.base import generate_uuid
+from app.core.cache import TTLCache
+from app.core.config import get_settings
+from app.core.security import (
+    verify_password, get_password_hash, create_access_token,
+    generate_refresh_token, hash_refresh_token,
+    revoke_token_id, prune_revoked_token_ids
+)
 from app.schemas import UserCreate, TokenResponse, UserResponse
 
+settings = get_settings()
+
 
 class AuthService:
     """Service class for authentication operations."""
     
+    # Upper bound of revoked_at already mirrored into memory
+    _last_revocation_sync: Optional[datetime] = None
+    
+    # Active users resolved from tokens, keyed by (user_id, token iat)
+    _user_cache = TTLCache(
+        max_size=settings.user_cache_max_size,
+        ttl_seconds=settings.user_cache_ttl_seconds
+    )
+    
+    @staticmethod
+    def get_active_user(
+        db: Session,
+        user_id: str,
+        issued_at: Optional[int] = None
+    ) -> Optional[User]:
+        """
+        Get the user behind an access token.
+        
+        Active users are cached for a few seconds so repeated requests
+        with the same token skip the users query. Cached users are
+        attached to db without reloading. Returns None if not found.
+        """
+        key = (user_id, issued_at)
+        values = AuthService._user_cache.get(key)
+        if values is not None:
+            user = User(**values)
+            make_transient_to_detached(user)
+            db.add(user)
+            return user
+        
+        user = db.query(User).filter(User.id == user_id).first()
+        
+        if user and user.is_active:
+            AuthService._user_cache.set(key, {
+                column.key: getattr(user, column.key)
+                for column in User.__table__.columns
+            })
+        
+        return user
+    
+    @staticmethod
+    def user_cache_stats() -> Tuple[int, int]:
+        """(hits, misses) of the active user cache since startup."""
+        return AuthService._user_cache.hits, AuthService._user_cache.misses
+    
+    @staticmethod
+    def invalidate_user(user_id: str) -> None:
+        """Drop cached copies of a user after it changes."""
+        AuthService._user_cache.delete_where(lambda key: key[0] == user_id)
+    
     @staticmethod
     def authenticate_user(
         db: Session,
@@ -45,8 +104,16 @@ class AuthService:
         return user
     
     @staticmethod
-    def create_token(user: User) -> TokenResponse:
-        """Create an access token for a user."""
+    def create_token(
+        db: Session,
+        user: User,
+        family_id: Optional[str] = None
+    ) -> TokenResponse:
+        """
+        Create an access token and a refresh token for a user.
+        
+        family_id continues an existing refresh token family on rotation.
+        """
         token_data = {
             "user_id": user.id,
             "email": user.email,
@@ -55,12 +122,140 @@ class AuthService:
         
         access_token = create_access_token(token_data)
         
+        refresh_token = generate_refresh_token()
+        db.add(RefreshToken(
+            user_id=user.id,
+            token_hash=hash_refresh_token(refresh_token),
+            family_id=family_id or generate_uuid(),
+            expires_at=datetime.utcnow() + timedelta(days=settings.refresh_token_expire_days)
+        ))
+        db.commit()
+        
         return TokenResponse(
             access_token=access_token,
             token_type="bearer",
+            expires_in=settings.access_token_expire_minutes * 60,
+            refresh_token=refresh_token,
             user=UserResponse.model_validate(user)
         )
     
+    @staticmethod
+    def refresh_token(db: Session, token: str) -> Optional[TokenResponse]:
+        """
+        Exchange a refresh token for a new token pair.
+        
+        The presented token is rotated out. Reusing an already rotated
+        token revokes its whole family. Returns None if the token is not
+        valid.
+        """
+        stored = db.query(RefreshToken).filter(
+            RefreshToken.token_hash == hash_refresh_token(token)
+        ).first()
+        
+        if not stored:
+            return None
+        
+        now = datetime.utcnow()
+        
+        if stored.revoked_at is not None:
+            # Replay of a rotated token: assume it leaked
+            AuthService._revoke_family(db, stored.family_id, now)
+            db.commit()
+            return None
+        
+        if stored.expires_at < now:
+            return None
+        
+        user = db.query(User).filter(User.id == stored.user_id).first()
+        if not user or not user.is_active:
+            return None
+        
+        # Rotate atomically: of two concurrent refreshes with the same token,
+        # only one revokes it; the other is treated as a replay
+        rotated = db.query(RefreshToken).filter(
+            RefreshToken.id == stored.id,
+            RefreshToken.revoked_at.is_(None)
+        ).update({"revoked_at": now}, synchronize_session=False)
+        if rotated != 1:
+            AuthService._revoke_family(db, stored.family_id, now)
+            db.commit()
+            return None
+        
+        return AuthService.create_token(db, user, family_id=stored.family_id)
+    
+    @staticmethod
+    def _revoke_family(db: Session, family_id: str, now: datetime) -> None:
+        """Revoke every live refresh token in a family (no commit)."""
+        db.query(RefreshToken).filter(
+            RefreshToken.family_id == family_id,
+            RefreshToken.revoked_at.is_(None)
+        ).update({"revoked_at": now}, synchronize_session=False)
+    
+    @staticmethod
+    def revoke_refresh_token(db: Session, token: str) -> None:
+        """Revoke a refresh token and the rest of its family."""
+        stored = db.query(RefreshToken).filter(
+            RefreshToken.token_hash == hash_refresh_token(token)
+        ).first()
+        
+        if stored:
+            AuthService._revoke_family(db, stored.family_id, datetime.utcnow())
+            db.commit()
+    
+    @staticmethod
+    def revoke_user_refresh_tokens(db: Session, user_id: str) -> None:
+        """Revoke all of a user's refresh tokens, e.g. after a password change."""
+        db.query(RefreshToken).filter(
+            RefreshToken.user_id == user_id,
+            RefreshToken.revoked_at.is_(None)
+        ).update({"revoked_at": datetime.utcnow()}, synchronize_session=False)
+        db.commit()
+    
+    @staticmethod
+    def revoke_access_token(db: Session, payload: dict) -> None:
+        """Revoke a decoded access token until it expires."""
+        jti = payload.get("jti")
+        exp = payload.get("exp")
+        if not jti or not exp:
+            return
+        
+        db.merge(RevokedToken(
+            jti=jti,
+            expires_at=datetime.utcfromtimestamp(exp),
+            revoked_at=datetime.utcnow()
+        ))
+        db.commit()
+        
+        # Take effect here immediately; other workers pick it up on sync
+        revoke_token_id(jti, exp)
+    
+    @staticmethod
+    def sync_revocations(db: Session) -> None:
+        """
+        Mirror newly revoked access tokens into the in-memory revocation set.
+        
+        Also drops expired entries from memory and from the DB.
+        """
+        now = datetime.utcnow()
+        query = db.query(RevokedToken).filter(RevokedToken.expires_at > now)
+        
+        if AuthService._last_revocation_sync is not None:
+            query = query.filter(RevokedToken.revoked_at >= AuthService._last_revocation_sync)
+        
+        for revoked in query.all():
+            revoke_token_id(
+                revoked.jti,
+                (revoked.expires_at - datetime(1970, 1, 1)).total_seconds()
+            )
+        
+        # Overlap slightly so rows committed during this sync are not missed
+        AuthService._last_revocation_sync = now - timedelta(seconds=5)
+        prune_revoked_token_ids()
+        
+        db.query(RevokedToken).filter(RevokedToken.expires_at <= now).delete()
+        db.query(RefreshToken).filter(RefreshToken.expires_at <= now).delete()
+        db.commit()
+    
     @staticmethod
     def create_user(db: Session, data: UserCreate) -> User:
         """Create a new user."""
@@ -8,9 +8,11 @@ from typing import List, Optional, Tuple
 from datetime import datetime
 from sqlalchemy.orm import Session
 from sqlalchemy import desc
+from fastapi import HTTPException, status as http_status
 
 from app.models import Enquiry, Vehicle
-from app.schemas import EnquiryCreate
+from app.schemas import EnquiryCreate, EnquiryFilters
+from app.services.analytics_service import AnalyticsService
 
 
 class EnquiryService:
@@ -53,6 +55,8 @@ class EnquiryService:
         """Create a new enquiry."""
         enquiry = Enquiry(**data.model_dump())
         db.add(enquiry)
+        if enquiry.vehicle_id:
+            AnalyticsService.record(db, enquiry.vehicle_id, "enquiries")
         db.commit()
         db.refresh(enquiry)
         return enquiry
@@ -73,6 +77,51 @@ class EnquiryService:
         db.refresh(enquiry)
         return enquiry
     
+    @staticmethod
+    def bulk_update_status(
+        db: Session,
+        status: str,
+        ids: Optional[List[str]] = None,
+        filters: Optional[EnquiryFilters] = None
+    ) -> int:
+        """
+        Set the status of many enquiries with a single UPDATE.
+        
+        Enquiries are selected by ids or by filters, never both.
+        Returns the number of enquiries updated.
+        """
+        if (ids is None) == (filters is None):
+            raise HTTPException(
+                status_code=http_status.HTTP_400_BAD_REQUEST,
+                detail="Provide either ids or filter"
+            )
+        
+        query = db.query(Enquiry)
+        if ids is not None:
+            query = query.filter(Enquiry.id.in_(set(ids)))
+        else:
+            if not filters.model_dump(exclude_none=True):
+                raise HTTPException(
+                    status_code=http_status.HTTP_400_BAD_REQUEST,
+                    detail="Filter must set at least one field"
+                )
+            if filters.status:
+                query = query.filter(Enquiry.status == filters.status.value)
+            if filters.enquiry_type:
+                query = query.filter(Enquiry.enquiry_type == filters.enquiry_type.value)
+            if filters.vehicle_id:
+                query = query.filter(Enquiry.vehicle_id == filters.vehicle_id)
+            if filters.created_before:
+                query = query.filter(Enquiry.created_at < filters.created_before)
+        
+        values = {Enquiry.status: status}
+        if status in ["contacted", "qualified", "closed"]:
+            values[Enquiry.responded_at] = datetime.utcnow()
+        
+        updated = query.update(values, synchronize_session=False)
+        db.commit()
+        return updated
+    
     @staticmethod
     def delete_enquiry(db: Session, enquiry: Enquiry) -> None:
         """Delete an enquiry."""
@@ -0,0 +1,178 @@
+"""
+Export Service
+
+Streams full tables as CSV or NDJSON in constant memory.
+
+Rows are read in keyset pages, each in its own short transaction, so a
+slow download never holds a read open against writers.
+"""
+
+import io
+import csv
+import json
+import zlib
+from datetime import date, datetime
+from typing import Any, Dict, Iterator, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import select, tuple_
+
+from app.core.database import SessionLocal
+from app.models import Vehicle, Enquiry, SellRequest, NewsletterSubscriber
+
+
+class ExportService:
+    """Service class for streaming exports."""
+    
+    # resource -> (model, exported columns, column for date filters)
+    EXPORTS = {
+        "vehicles": (Vehicle, [
+            "id", "make", "model", "year", "trim", "price", "currency", "mileage",
+            "body_type", "transmission", "fuel_type", "condition", "color",
+            "engine_capacity", "availability_status", "location", "description",
+            "features", "is_featured", "views_count", "created_at", "updated_at",
+        ], "created_at"),
+        "enquiries": (Enquiry, [
+            "id", "vehicle_id", "customer_name", "customer_email", "customer_phone",
+            "message", "enquiry_type", "status", "created_at", "responded_at",
+        ], "created_at"),
+        "sell-requests": (SellRequest, [
+            "id", "customer_name", "customer_email", "customer_phone", "vehicle_make",
+            "vehicle_model", "vehicle_year", "mileage", "condition", "asking_price",
+            "description", "service_type", "status", "valuation_amount",
+            "created_at", "updated_at",
+        ], "created_at"),
+        "subscribers": (NewsletterSubscriber, [
+            "id", "email", "subscribed_at", "is_active",
+        ], "subscribed_at"),
+    }
+    
+    FORMATS = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+    
+    # Rows fetched per page, and bytes buffered before each yield
+    PAGE_SIZE = 1000
+    FLUSH_BYTES = 64 * 1024
+    
+    # CSV cells holding lists use the same separator as vehicle imports
+    LIST_SEPARATOR = "|"
+    
+    @classmethod
+    def validate(cls, resource: str, file_format: str) -> None:
+        """Reject unknown resources or formats before the response starts."""
+        if resource not in cls.EXPORTS:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Unknown export. Available: {', '.join(cls.EXPORTS)}"
+            )
+        if file_format not in cls.FORMATS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown format. Available: {', '.join(cls.FORMATS)}"
+            )
+    
+    @classmethod
+    def _iter_rows(
+        cls,
+        resource: str,
+        since: Optional[date] = None,
+        until: Optional[date] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield rows as dicts, fetching PAGE_SIZE at a time.
+        
+        Pages continue after the last (date, id) seen, and each is read in
+        its own session that is closed before any rows are yielded: a
+        streaming response outlives the request's session, and an open
+        read between pages would block writes on SQLite.
+        """
+        model, columns, date_column = cls.EXPORTS[resource]
+        date_attr = getattr(model, date_column)
+        query = select(*[getattr(model, column) for column in columns])
+        if since:
+            query = query.where(date_attr >= datetime.combine(since, datetime.min.time()))
+        if until:
+            query = query.where(date_attr < datetime.combine(until, datetime.min.time()))
+        query = query.order_by(date_attr, model.id).limit(cls.PAGE_SIZE)
+        
+        last = None
+        while True:
+            page = query if last is None else query.where(tuple_(date_attr, model.id) > tuple_(*last))
+            db = SessionLocal()
+            try:
+                rows = [dict(zip(columns, row)) for row in db.execute(page)]
+            finally:
+                db.close()
+            
+            yield from rows
+            if len(rows) < cls.PAGE_SIZE:
+                return
+            last = (rows[-1][date_column], rows[-1]["id"])
+    
+    @classmethod
+    def _csv_value(cls, value: Any) -> Any:
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        if isinstance(value, list):
+            return cls.LIST_SEPARATOR.join(str(item) for item in value)
+        return value
+    
+    @staticmethod
+    def _json_default(value: Any) -> str:
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        return str(value)
+    
+    @classmethod
+    def _encode(cls, resource: str, file_format: str, rows: Iterator[Dict[str, Any]]) -> Iterator[bytes]:
+        """Serialize rows, yielding roughly FLUSH_BYTES at a time."""
+        _, columns, _ = cls.EXPORTS[resource]
+        buffer = io.StringIO()
+        
+        if file_format == "csv":
+            writer = csv.writer(buffer)
+            writer.writerow(columns)
+            for row in rows:
+                writer.writerow([cls._csv_value(row[column]) for column in columns])
+                if buffer.tell() >= cls.FLUSH_BYTES:
+                    yield buffer.getvalue().encode("utf-8")
+                    buffer.seek(0)
+                    buffer.truncate()
+        else:
+            for row in rows:
+                buffer.write(json.dumps(row, default=cls._json_default))
+                buffer.write("\n")
+                if buffer.tell() >= cls.FLUSH_BYTES:
+                    yield buffer.getvalue().encode("utf-8")
+                    buffer.seek(0)
+                    buffer.truncate()
+        
+        if buffer.tell():
+            yield buffer.getvalue().encode("utf-8")
+    
+    @staticmethod
+    def _gzip(chunks: Iterator[bytes]) -> Iterator[bytes]:
+        """Compress a byte stream into a gzip file incrementally."""
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits 31 = gzip container
+        for chunk in chunks:
+            compressed = compressor.compress(chunk)
+            if compressed:
+                yield compressed
+        yield compressor.flush()
+    
+    @classmethod
+    def stream(
+        cls,
+        resource: str,
+        file_format: str = "csv",
+        compress: bool = False,
+        since: Optional[date] = None,
+        until: Optional[date] = None
+    ) -> Iterator[bytes]:
+        """Stream an export as bytes, optionally gzipped."""
+        chunks = cls._encode(resource, file_format, cls._iter_rows(resource, since, until))
+        return cls._gzip(chunks) if compress else chunks
+    
+    @classmethod
+    def filename(cls, resource: str, file_format: str, compress: bool) -> str:
+        name = f"{resource}-{datetime.utcnow():%Y%m%d}.{file_format}"
+        return name + ".gz" if compress else name
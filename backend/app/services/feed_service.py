@@ -0,0 +1,356 @@
+"""
+Feed Service
+
+Marketplace feeds (XML/CSV) of available inventory, written to disk.
+
+Each feed keeps a fragment store: the rendered entry for every listed
+vehicle plus the change log seq it reflects. A build re-renders only the
+vehicles changed since that seq and rewrites the feed from the store, so
+full rebuilds are only needed when the store is missing or its settings
+changed.
+"""
+
+import io
+import os
+import re
+import csv
+import json
+import time
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from xml.sax.saxutils import escape
+
+from fastapi import HTTPException, status
+from sqlalchemy import func
+from sqlalchemy.orm import Session, selectinload
+
+from app.core.config import get_settings
+from app.models import Vehicle, VehicleChange
+
+settings = get_settings()
+
+# Characters XML 1.0 does not allow, even escaped
+_XML_INVALID = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+class FeedFormat(ABC):
+    """
+    How one feed renders: a header, one fragment per vehicle, a footer.
+    
+    Bump version when the rendering changes so stored fragments are rebuilt.
+    """
+    
+    version = 1
+    extension = ""
+    media_type = ""
+    
+    def header(self) -> str:
+        return ""
+    
+    @abstractmethod
+    def render(self, vehicle: Vehicle) -> str:
+        """One vehicle's fragment."""
+    
+    def footer(self) -> str:
+        return ""
+    
+    @staticmethod
+    def link(vehicle: Vehicle) -> str:
+        """Public listing page for a vehicle."""
+        return f"{settings.feed_site_url.rstrip('/')}/vehicles/{vehicle.id}"
+    
+    @staticmethod
+    def image_links(vehicle: Vehicle) -> List[str]:
+        """Absolute image URLs, primary image first."""
+        images = sorted(vehicle.images, key=lambda image: (not image.is_primary, image.display_order))
+        return [
+            image.image_url if image.image_url.startswith("http")
+            else f"{settings.feed_api_url.rstrip('/')}{image.image_url}"
+            for image in images
+        ]
+    
+    @staticmethod
+    def currency(vehicle: Vehicle) -> str:
+        """ISO 4217 code for the vehicle's currency."""
+        return "KES" if vehicle.currency == "KSH" else vehicle.currency
+
+
+class GoogleVehicleFeed(FeedFormat):
+    """RSS 2.0 with Google Merchant (g:) vehicle listing attributes."""
+    
+    extension = "xml"
+    media_type = "application/xml"
+    
+    # Google allows up to 10 additional images
+    MAX_ADDITIONAL_IMAGES = 10
+    
+    def header(self) -> str:
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<rss version="2.0" xmlns:g="http://base.google.com/ns/1.0">\n'
+            "<channel>\n"
+            "<title>Joram Cars</title>\n"
+            f"<link>{self._text(settings.feed_site_url)}</link>\n"
+            "<description>Vehicles available at Joram Cars</description>\n"
+        )
+    
+    def footer(self) -> str:
+        return "</channel>\n</rss>\n"
+    
+    @staticmethod
+    def _text(value: Any) -> str:
+        return escape(_XML_INVALID.sub("", str(value)))
+    
+    def _tag(self, tag: str, value: Any) -> str:
+        if value is None or value == "":
+            return ""
+        return f"<g:{tag}>{self._text(value)}</g:{tag}>"
+    
+    def render(self, vehicle: Vehicle) -> str:
+        images = self.image_links(vehicle)
+        parts = [
+            self._tag("id", vehicle.id),
+            self._tag("title", vehicle.title),
+            self._tag("description", vehicle.description or vehicle.title),
+            self._tag("link", self.link(vehicle)),
+            self._tag("image_link", images[0] if images else None),
+            *(self._tag("additional_image_link", url) for url in images[1:1 + self.MAX_ADDITIONAL_IMAGES]),
+            self._tag("price", f"{vehicle.price:.2f} {self.currency(vehicle)}"),
+            self._tag("condition", "used"),
+            self._tag("availability", "in stock" if vehicle.availability_status == "available" else "preorder"),
+            self._tag("brand", vehicle.make),
+            self._tag("model", vehicle.model),
+            self._tag("year", vehicle.year),
+            self._tag("trim", vehicle.trim),
+            f"<g:mileage><g:value>{vehicle.mileage}</g:value><g:unit>km</g:unit></g:mileage>"
+            if vehicle.mileage is not None else "",
+            self._tag("body_style", vehicle.body_type),
+            self._tag("transmission", vehicle.transmission),
+            self._tag("fuel_type", vehicle.fuel_type),
+            self._tag("engine", vehicle.engine_capacity),
+            self._tag("color", vehicle.color),
+            self._tag("location", vehicle.location),
+        ]
+        return "<item>" + "".join(parts) + "</item>\n"
+
+
+class CsvFeed(FeedFormat):
+    """Generic CSV, one row per vehicle."""
+    
+    extension = "csv"
+    media_type = "text/csv"
+    
+    COLUMNS = [
+        "id", "title", "make", "model", "year", "trim", "price", "currency",
+        "mileage", "body_type", "transmission", "fuel_type", "condition",
+        "color", "engine_capacity", "location", "availability_status",
+        "link", "image_link", "additional_image_links", "description",
+    ]
+    
+    # Same list separator as exports and imports
+    LIST_SEPARATOR = "|"
+    
+    @staticmethod
+    def _row(values: List[Any]) -> str:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(["" if value is None else value for value in values])
+        return buffer.getvalue()
+    
+    def header(self) -> str:
+        return self._row(self.COLUMNS)
+    
+    def render(self, vehicle: Vehicle) -> str:
+        images = self.image_links(vehicle)
+        values = {
+            "title": vehicle.title,
+            "currency": self.currency(vehicle),
+            "link": self.link(vehicle),
+            "image_link": images[0] if images else None,
+            "additional_image_links": self.LIST_SEPARATOR.join(images[1:]),
+        }
+        return self._row([
+            values[column] if column in values else getattr(vehicle, column)
+            for column in self.COLUMNS
+        ])
+
+
+class FeedService:
+    """Service class for marketplace feeds."""
+    
+    FORMATS: Dict[str, FeedFormat] = {
+        "google": GoogleVehicleFeed(),
+        "csv": CsvFeed(),
+    }
+    
+    FEED_DIR = settings.feed_dir
+    
+    # Statuses that appear in feeds
+    LISTED_STATUSES = ("available", "direct_import")
+    
+    # Vehicles loaded per query when rendering
+    BATCH_SIZE = 500
+    
+    # One build at a time per feed in this process
+    _locks: Dict[str, threading.Lock] = {name: threading.Lock() for name in FORMATS}
+    
+    # Parsed fragment stores: name -> (file mtime_ns, store), so checking an
+    # unchanged feed costs one query rather than a JSON parse
+    _stores: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+    
+    @classmethod
+    def get_format(cls, name: str) -> FeedFormat:
+        """Look up an enabled feed by name."""
+        if name not in cls.FORMATS or name not in settings.feed_formats_list:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Unknown feed. Available: {', '.join(settings.feed_formats_list)}"
+            )
+        return cls.FORMATS[name]
+    
+    @classmethod
+    def feed_path(cls, name: str) -> Path:
+        """Where the feed file is published."""
+        return Path(cls.FEED_DIR) / f"{name}.{cls.FORMATS[name].extension}"
+    
+    @classmethod
+    def _store_path(cls, name: str) -> Path:
+        return Path(cls.FEED_DIR) / f".{name}.fragments.json"
+    
+    @classmethod
+    def _signature(cls, name: str) -> str:
+        """Identifies the rendering settings; a mismatch forces a full rebuild."""
+        return f"{name}:v{cls.FORMATS[name].version}:{settings.feed_site_url}:{settings.feed_api_url}"
+    
+    @staticmethod
+    def _write_atomic(path: Path, chunks) -> int:
+        """Write chunks to a temp file beside path, then rename into place. Returns bytes written."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        size = 0
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8", newline="") as buffer:
+                for chunk in chunks:
+                    buffer.write(chunk)
+                    size += len(chunk)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        return size
+    
+    @classmethod
+    def _load_store(cls, name: str) -> Optional[Dict[str, Any]]:
+        """Load the fragment store, or None if missing, corrupt or stale."""
+        path = cls._store_path(name)
+        if not path.exists() or not cls.feed_path(name).exists():
+            return None
+        try:
+            mtime = path.stat().st_mtime_ns
+            cached = cls._stores.get(name)
+            if cached and cached[0] == mtime:
+                store = cached[1]
+            else:
+                store = json.loads(path.read_text(encoding="utf-8"))
+                cls._stores[name] = (mtime, store)
+        except (OSError, ValueError):
+            return None
+        if store.get("signature") != cls._signature(name):
+            return None
+        return store
+    
+    @classmethod
+    def _listed_query(cls, db: Session):
+        return db.query(Vehicle).options(selectinload(Vehicle.images)).filter(
+            Vehicle.availability_status.in_(cls.LISTED_STATUSES)
+        )
+    
+    @staticmethod
+    def _sort_key(vehicle: Vehicle) -> str:
+        # Newest first; id breaks ties so the order is stable
+        return f"{vehicle.created_at.isoformat()}|{vehicle.id}"
+    
+    @classmethod
+    def build(cls, db: Session, name: str, full: bool = False) -> Dict[str, Any]:
+        """
+        Bring a feed up to date and write it to disk.
+        
+        Incremental unless full is set or there is no usable fragment
+        store. Returns build stats: mode (full, incremental or unchanged),
+        vehicles re-rendered, items in the feed, seq and duration.
+        """
+        feed = cls.get_format(name)
+        started = time.perf_counter()
+        
+        with cls._locks[name]:
+            # Read the head first: changes committed during the build are
+            # simply picked up again next time
+            head = db.query(func.max(VehicleChange.seq)).scalar() or 0
+            store = None if full else cls._load_store(name)
+            
+            if store is not None and store["seq"] >= head:
+                return cls._stats("unchanged", 0, len(store["items"]), store["seq"], started)
+            
+            if store is None:
+                mode = "full"
+                items: Dict[str, List[str]] = {}
+                rendered = 0
+                for vehicle in cls._listed_query(db).yield_per(cls.BATCH_SIZE):
+                    items[vehicle.id] = [cls._sort_key(vehicle), feed.render(vehicle)]
+                    rendered += 1
+            else:
+                mode = "incremental"
+                items = store["items"]
+                changed = [
+                    vehicle_id for (vehicle_id,) in
+                    db.query(VehicleChange.vehicle_id).filter(
+                        VehicleChange.seq > store["seq"],
+                        VehicleChange.seq <= head
+                    ).distinct()
+                ]
+                rendered = len(changed)
+                for offset in range(0, len(changed), cls.BATCH_SIZE):
+                    chunk = changed[offset:offset + cls.BATCH_SIZE]
+                    listed = {
+                        vehicle.id: vehicle for vehicle in
+                        cls._listed_query(db).filter(Vehicle.id.in_(chunk))
+                    }
+                    for vehicle_id in chunk:
+                        vehicle = listed.get(vehicle_id)
+                        if vehicle is None:
+                            # Deleted, sold or reserved
+                            items.pop(vehicle_id, None)
+                        else:
+                            items[vehicle_id] = [cls._sort_key(vehicle), feed.render(vehicle)]
+                    db.expunge_all()
+            
+            ordered = sorted(items.values(), key=lambda item: item[0], reverse=True)
+            cls._write_atomic(
+                cls.feed_path(name),
+                [feed.header(), *(fragment for _, fragment in ordered), feed.footer()]
+            )
+            # Saved after the feed: if this fails the next build redoes the same changes
+            store = {"signature": cls._signature(name), "seq": head, "items": items}
+            cls._write_atomic(cls._store_path(name), [json.dumps(store)])
+            cls._stores[name] = (cls._store_path(name).stat().st_mtime_ns, store)
+        
+        return cls._stats(mode, rendered, len(items), head, started)
+    
+    @staticmethod
+    def _stats(mode: str, rendered: int, items: int, seq: int, started: float) -> Dict[str, Any]:
+        return {
+            "mode": mode,
+            "rendered": rendered,
+            "items": items,
+            "seq": seq,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+    
+    @classmethod
+    def get_feed(cls, db: Session, name: str) -> Path:
+        """Get the path of an up-to-date feed, building it first if needed."""
+        cls.build(db, name)
+        return cls.feed_path(name)
@@ -0,0 +1,122 @@
+"""
+FX Service
+
+Exchange rates, and the normalized KSH price kept on every vehicle.
+"""
+
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import insert, literal, select
+from sqlalchemy.orm import Session
+
+from app.models import FxRate, Vehicle, VehicleChange
+
+
+class FxService:
+    """Service class for exchange rates."""
+    
+    BASE_CURRENCY = "KSH"
+    
+    @staticmethod
+    def get_rates(db: Session) -> Dict[str, float]:
+        """Get KSH per unit of each currency."""
+        return dict(db.query(FxRate.currency, FxRate.rate_to_ksh))
+    
+    @staticmethod
+    def list_rates(db: Session) -> List[FxRate]:
+        """Get all rates, by currency."""
+        return db.query(FxRate).order_by(FxRate.currency).all()
+    
+    @classmethod
+    def to_ksh(
+        cls,
+        db: Session,
+        price: Optional[float],
+        currency: Optional[str],
+        rates: Optional[Dict[str, float]] = None
+    ) -> Optional[float]:
+        """Convert a price to KSH, or None if the currency has no rate."""
+        if price is None:
+            return None
+        currency = currency or cls.BASE_CURRENCY
+        if currency == cls.BASE_CURRENCY:
+            return price
+        rate = (rates if rates is not None else cls.get_rates(db)).get(currency)
+        return price * rate if rate is not None else None
+    
+    @staticmethod
+    def rate_for(currency):
+        """SQL expression for the rate of a currency column (per row in an UPDATE)."""
+        return select(FxRate.rate_to_ksh).where(FxRate.currency == currency).scalar_subquery()
+    
+    @classmethod
+    def update_rates(cls, db: Session, rates: Dict[str, float]) -> int:
+        """
+        Set exchange rates and recompute price_ksh for vehicles priced in them.
+        
+        Recomputed in one set-based UPDATE; the vehicles are also logged as
+        changed, so caches built on KSH prices pick them up. Returns the
+        number of vehicles updated.
+        """
+        if rates.get(cls.BASE_CURRENCY, 1.0) != 1.0:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"The {cls.BASE_CURRENCY} rate is always 1"
+            )
+        
+        now = datetime.utcnow()
+        current = {fx_rate.currency: fx_rate for fx_rate in db.query(FxRate)}
+        changed = []
+        for currency, rate in rates.items():
+            if currency == cls.BASE_CURRENCY:
+                continue
+            fx_rate = current.get(currency)
+            if fx_rate is None:
+                db.add(FxRate(currency=currency, rate_to_ksh=rate, updated_at=now))
+            elif fx_rate.rate_to_ksh != rate:
+                fx_rate.rate_to_ksh = rate
+                fx_rate.updated_at = now
+            else:
+                continue
+            changed.append(currency)
+        
+        if not changed:
+            db.commit()
+            return 0
+        db.flush()
+        
+        updated = cls._recompute(db, db.query(Vehicle).filter(Vehicle.currency.in_(changed)), now)
+        db.commit()
+        return updated
+    
+    @classmethod
+    def backfill_prices(cls, db: Session) -> int:
+        """
+        Fill in price_ksh where it is missing but the currency has a rate.
+        
+        Catches rows written without it (e.g. raw inserts, or a rate added
+        after the vehicle). Returns the number of vehicles updated.
+        """
+        query = db.query(Vehicle).filter(
+            Vehicle.price_ksh.is_(None),
+            Vehicle.currency.in_(select(FxRate.currency))
+        )
+        updated = cls._recompute(db, query, datetime.utcnow())
+        db.commit()
+        return updated
+    
+    @classmethod
+    def _recompute(cls, db: Session, query, now: datetime) -> int:
+        """Set price_ksh for the vehicles a query matches and log them as changed. Does not commit."""
+        db.execute(
+            insert(VehicleChange).from_select(
+                ["vehicle_id", "op", "changed_at"],
+                query.with_entities(Vehicle.id, literal("upsert"), literal(now))
+            )
+        )
+        return query.update(
+            {Vehicle.price_ksh: Vehicle.price * cls.rate_for(Vehicle.currency)},
+            synchronize_session=False
+        )
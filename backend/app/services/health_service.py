@@ -0,0 +1,139 @@
+"""
+Health Service
+
+Readiness probes for the database, upload storage, image workers and
+schema version, each timed and cached briefly.
+"""
+
+import os
+import time
+import shutil
+import sqlite3
+import tempfile
+import threading
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from sqlalchemy import text
+
+from app.core.config import get_settings
+from app.core.database import engine, get_alembic_config
+from app.services.image_service import ImageService
+from app.services.rendition_service import RenditionService
+
+settings = get_settings()
+
+
+class HealthService:
+    """Service class for readiness checks."""
+    
+    _lock = threading.Lock()
+    _cached: Optional[Tuple[float, Dict[str, Any]]] = None
+    
+    # Latest migration shipped with this code (fixed for the process lifetime)
+    _migration_head: Optional[str] = None
+    
+    @staticmethod
+    def _check_database() -> str:
+        """Run a trivial query through the pool, then confirm SQLite isn't write-locked."""
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        
+        if engine.url.get_backend_name() == "sqlite" and engine.url.database:
+            # A locked file still answers reads, so take (and release) the write lock
+            probe = sqlite3.connect(
+                engine.url.database,
+                timeout=settings.health_probe_timeout_seconds,
+                isolation_level=None
+            )
+            try:
+                probe.execute("BEGIN IMMEDIATE")
+                probe.execute("ROLLBACK")
+            finally:
+                probe.close()
+        return "ok"
+    
+    @staticmethod
+    def _check_uploads() -> str:
+        """Check the upload directory is writable and has free space."""
+        fd, tmp_path = tempfile.mkstemp(dir=settings.upload_dir, suffix=".tmp")
+        os.close(fd)
+        os.unlink(tmp_path)
+        
+        free_mb = shutil.disk_usage(settings.upload_dir).free / 1024 / 1024
+        if free_mb < settings.health_min_free_mb:
+            raise RuntimeError(f"Only {free_mb:.0f}MB free")
+        return f"{free_mb:.0f}MB free"
+    
+    @staticmethod
+    def _check_image_workers() -> str:
+        """Check the upload and rendition pools both run work."""
+        future = ImageService.EXECUTOR.submit(lambda: None)
+        try:
+            future.result(timeout=settings.health_probe_timeout_seconds)
+        except FutureTimeoutError:
+            raise RuntimeError("Upload workers busy or stalled")
+        
+        if not RenditionService.pool_healthy(settings.health_probe_timeout_seconds):
+            raise RuntimeError("Rendition workers broken, busy or stalled")
+        return "ok"
+    
+    @staticmethod
+    def _check_migrations() -> str:
+        """Check the database is at the latest migration."""
+        from alembic.runtime.migration import MigrationContext
+        from alembic.script import ScriptDirectory
+        
+        if HealthService._migration_head is None:
+            HealthService._migration_head = ScriptDirectory.from_config(
+                get_alembic_config()
+            ).get_current_head()
+        
+        with engine.connect() as conn:
+            current = MigrationContext.configure(conn).get_current_revision()
+        
+        head = HealthService._migration_head
+        if current != head:
+            raise RuntimeError(f"Database at {current}, expected {head}")
+        return current
+    
+    @classmethod
+    def _run(cls, check: Callable[[], str]) -> Dict[str, Any]:
+        """Run one probe, timing it and catching failures."""
+        started = time.perf_counter()
+        try:
+            result = {"status": "ok", "detail": check()}
+        except Exception as e:
+            result = {"status": "fail", "detail": str(e) or e.__class__.__name__}
+        result["latency_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        return result
+    
+    @classmethod
+    def check_readiness(cls) -> Dict[str, Any]:
+        """
+        Run every probe and summarize.
+        
+        Results are reused for health_cache_seconds, and concurrent callers
+        wait for one run, so frequent load balancer probes add no load.
+        """
+        with cls._lock:
+            now = time.monotonic()
+            if cls._cached and now - cls._cached[0] < settings.health_cache_seconds:
+                return {**cls._cached[1], "cached": True}
+            
+            components = {
+                "database": cls._run(cls._check_database),
+                "uploads": cls._run(cls._check_uploads),
+                "image_workers": cls._run(cls._check_image_workers),
+                "migrations": cls._run(cls._check_migrations),
+            }
+            ready = all(component["status"] == "ok" for component in components.values())
+            
+            report = {
+                "status": "ready" if ready else "not_ready",
+                "checked_at": datetime.utcnow().isoformat(),
+                "components": components,
+            }
+            cls._cached = (now, report)
+            return {**report, "cached": False}
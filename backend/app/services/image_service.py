@@ -4,11 +4,15 @@ Image Service
 Business logic for image upload and processing.
 """
 
+import io
 import os
+import base64
 import uuid
-import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 from PIL import Image
 from fastapi import UploadFile, HTTPException, status
 
@@ -24,10 +28,32 @@ class ImageService:
     MAX_FILE_SIZE = settings.max_file_size
     UPLOAD_DIR = settings.upload_dir
     
+    MAX_UPLOAD_BATCH = settings.max_upload_batch
+    
+    # Read uploads in chunks so oversized files are rejected early
+    CHUNK_SIZE = 64 * 1024
+    
+    # Shared pool for batch uploads (PIL releases the GIL while decoding)
+    EXECUTOR = ThreadPoolExecutor(
+        max_workers=settings.image_workers,
+        thread_name_prefix="image-worker"
+    )
+    
+    # Files submitted to EXECUTOR that no worker has picked up yet
+    _queued = 0
+    _queued_lock = threading.Lock()
+    
     # Image sizes for optimization
     THUMBNAIL_SIZE = (300, 200)
     MEDIUM_SIZE = (800, 600)
     LARGE_SIZE = (1200, 900)
+    PLACEHOLDER_SIZE = (20, 20)
+    
+    # Magic byte signatures mapped to (extension, PIL format)
+    SIGNATURES = (
+        (b"\xff\xd8\xff", "jpg", "JPEG"),
+        (b"\x89PNG\r\n\x1a\n", "png", "PNG"),
+    )
     
     @classmethod
     def _ensure_upload_dir(cls) -> None:
@@ -35,39 +61,92 @@ class ImageService:
         Path(cls.UPLOAD_DIR).mkdir(parents=True, exist_ok=True)
     
     @classmethod
-    def _validate_file(cls, file: UploadFile) -> None:
-        """Validate uploaded file."""
-        # Check file extension
+    def _read_upload(cls, file: UploadFile) -> bytes:
+        """
+        Read an upload into memory, enforcing the size limit while streaming.
+        
+        Raises HTTPException as soon as the limit is exceeded.
+        """
+        buffer = bytearray()
+        file.file.seek(0)
+        
+        while True:
+            chunk = file.file.read(cls.CHUNK_SIZE)
+            if not chunk:
+                break
+            
+            buffer.extend(chunk)
+            if len(buffer) > cls.MAX_FILE_SIZE:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"File too large. Maximum size: {cls.MAX_FILE_SIZE / 1024 / 1024}MB"
+                )
+        
+        return bytes(buffer)
+    
+    @classmethod
+    def _sniff_format(cls, data: bytes) -> Optional[Tuple[str, str]]:
+        """
+        Detect the image type from its magic bytes.
+        
+        Returns (extension, PIL format) or None if unrecognised.
+        """
+        for signature, ext, pil_format in cls.SIGNATURES:
+            if data.startswith(signature):
+                return ext, pil_format
+        
+        # WebP: "RIFF" <size> "WEBP"
+        if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+            return "webp", "WEBP"
+        
+        return None
+    
+    @classmethod
+    def _validate_file(cls, file: UploadFile) -> Tuple[bytes, str, str]:
+        """
+        Validate uploaded file.
+        
+        Returns tuple of (data, extension, PIL format).
+        """
         if not file.filename:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="No filename provided"
             )
         
-        ext = file.filename.split(".")[-1].lower()
-        if ext not in cls.ALLOWED_EXTENSIONS:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"File type not allowed. Allowed: {', '.join(cls.ALLOWED_EXTENSIONS)}"
-            )
+        data = cls._read_upload(file)
         
-        # Check file size
-        file.file.seek(0, 2)  # Seek to end
-        size = file.file.tell()
-        file.file.seek(0)  # Reset to beginning
+        # Trust the content, not the filename
+        detected = cls._sniff_format(data)
+        allowed = {"jpg" if ext == "jpeg" else ext for ext in cls.ALLOWED_EXTENSIONS}
         
-        if size > cls.MAX_FILE_SIZE:
+        if not detected or detected[0] not in allowed:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"File too large. Maximum size: {cls.MAX_FILE_SIZE / 1024 / 1024}MB"
+                detail=f"File type not allowed. Allowed: {', '.join(cls.ALLOWED_EXTENSIONS)}"
             )
+        
+        ext, pil_format = detected
+        return data, ext, pil_format
     
     @classmethod
-    def _generate_filename(cls, original_filename: str) -> str:
+    def _generate_filename(cls, ext: str) -> str:
         """Generate a unique filename."""
-        ext = original_filename.split(".")[-1].lower()
         return f"{uuid.uuid4()}.{ext}"
     
+    @classmethod
+    def _write_atomic(cls, file_path: Path, data: bytes) -> None:
+        """Write data to a temp file in the target folder, then rename into place."""
+        fd, tmp_path = tempfile.mkstemp(dir=file_path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as buffer:
+                buffer.write(data)
+            os.replace(tmp_path, file_path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+    
     @classmethod
     def save_image(
         cls,
@@ -79,49 +158,159 @@ class ImageService:
         
         Returns the relative path to the saved image.
         """
+        image_url, _ = cls.save_image_with_metadata(file, subfolder=subfolder)
+        return image_url
+    
+    @classmethod
+    def save_image_with_metadata(
+        cls,
+        file: UploadFile,
+        subfolder: str = "vehicles"
+    ) -> Tuple[str, Dict[str, Any]]:
+        """
+        Save an uploaded image and describe it.
+        
+        The upload is validated and optimized in memory and written
+        to disk once. Returns the relative path to the saved image and
+        a dict of width, height and placeholder (empty if the image
+        could not be processed).
+        """
         cls._ensure_upload_dir()
-        cls._validate_file(file)
+        data, ext, pil_format = cls._validate_file(file)
         
         # Create subfolder
         folder_path = Path(cls.UPLOAD_DIR) / subfolder
         folder_path.mkdir(parents=True, exist_ok=True)
         
         # Generate unique filename
-        filename = cls._generate_filename(file.filename or "image.jpg")
+        filename = cls._generate_filename(ext)
         file_path = folder_path / filename
         
-        # Save file
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
-        # Optimize image
-        cls._optimize_image(str(file_path))
+        # Optimize and save
+        optimized, metadata = cls._optimize_image(data, pil_format)
+        cls._write_atomic(file_path, optimized)
         
         # Return relative path for URL
-        return f"/{cls.UPLOAD_DIR}/{subfolder}/{filename}"
+        return f"/{cls.UPLOAD_DIR}/{subfolder}/{filename}", metadata
+    
+    @classmethod
+    def save_images(
+        cls,
+        files: List[UploadFile],
+        subfolder: str = "vehicles"
+    ) -> List[Tuple[Optional[str], Dict[str, Any], Optional[str]]]:
+        """
+        Save several uploaded images concurrently.
+        
+        Returns a list of (image_url, metadata, error) tuples in the same
+        order as the input files. Either image_url or error is set per file.
+        """
+        def _save(file: UploadFile) -> Tuple[Optional[str], Dict[str, Any], Optional[str]]:
+            cls._count_queued(-1)
+            try:
+                image_url, metadata = cls.save_image_with_metadata(file, subfolder=subfolder)
+                return image_url, metadata, None
+            except HTTPException as e:
+                return None, {}, e.detail
+            except Exception as e:
+                print(f"Image upload failed: {e}")
+                return None, {}, "Failed to process image"
+        
+        cls._count_queued(len(files))
+        return list(cls.EXECUTOR.map(_save, files))
+    
+    @classmethod
+    def _count_queued(cls, delta: int) -> None:
+        with cls._queued_lock:
+            cls._queued += delta
+    
+    @classmethod
+    def queue_depth(cls) -> int:
+        """Files waiting for an image worker."""
+        return cls._queued
+    
+    @classmethod
+    def reoptimize_file(
+        cls,
+        file_path: str,
+        dry_run: bool = False
+    ) -> Tuple[int, int, Dict[str, Any]]:
+        """
+        Re-run optimization on an image already on disk.
+        
+        The file is replaced only if the new encoding is smaller (and
+        never when dry_run is set). Returns tuple of (old_size, new_size, metadata).
+        """
+        path = Path(file_path)
+        data = path.read_bytes()
+        
+        detected = cls._sniff_format(data)
+        if not detected:
+            return len(data), len(data), {}
+        
+        optimized, metadata = cls._optimize_image(data, detected[1])
+        if metadata and len(optimized) < len(data):
+            if not dry_run:
+                cls._write_atomic(path, optimized)
+            return len(data), len(optimized), metadata
+        
+        # Keeping the original, so report its own dimensions
+        if metadata:
+            with Image.open(io.BytesIO(data)) as img:
+                metadata["width"], metadata["height"] = img.size
+        return len(data), len(data), metadata
     
     @classmethod
-    def _optimize_image(cls, file_path: str) -> None:
-        """Optimize an image for web delivery."""
+    def _make_placeholder(cls, img: Image.Image) -> str:
+        """Encode a tiny WebP preview of an image as a data URI."""
+        preview = img.copy()
+        preview.thumbnail(cls.PLACEHOLDER_SIZE, Image.Resampling.BILINEAR)
+        
+        output = io.BytesIO()
+        preview.save(output, format="WEBP", quality=30)
+        return "data:image/webp;base64," + base64.b64encode(output.getvalue()).decode("ascii")
+    
+    @classmethod
+    def _optimize_image(cls, data: bytes, pil_format: str) -> Tuple[bytes, Dict[str, Any]]:
+        """
+        Optimize an image for web delivery.
+        
+        Returns the re-encoded bytes with their width, height and a
+        low-quality placeholder, or the original bytes and no metadata
+        if optimization fails.
+        """
         try:
-            with Image.open(file_path) as img:
+            with Image.open(io.BytesIO(data)) as img:
+                # Let the JPEG decoder downscale while decoding
+                img.draft("RGB", cls.LARGE_SIZE)
+                
                 # Convert to RGB if necessary
                 if img.mode in ("RGBA", "P"):
                     img = img.convert("RGB")
                 
-                # Resize if too large
+                # Resize if too large (reduce() first, then LANCZOS)
                 if img.size[0] > cls.LARGE_SIZE[0] or img.size[1] > cls.LARGE_SIZE[1]:
-                    img.thumbnail(cls.LARGE_SIZE, Image.Resampling.LANCZOS)
+                    img.thumbnail(cls.LARGE_SIZE, Image.Resampling.LANCZOS, reducing_gap=2.0)
                 
                 # Save with optimization
+                output = io.BytesIO()
                 img.save(
-                    file_path,
+                    output,
+                    format=pil_format,
                     optimize=True,
                     quality=85
                 )
+                
+                metadata = {
+                    "width": img.size[0],
+                    "height": img.size[1],
+                    "placeholder": cls._make_placeholder(img)
+                }
+                return output.getvalue(), metadata
         except Exception as e:
             # If optimization fails, keep original
             print(f"Image optimization failed: {e}")
+            return data, {}
     
     @classmethod
     def delete_image(cls, image_url: str) -> bool:
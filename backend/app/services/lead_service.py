@@ -1,8 +1,9 @@
 from sqlalchemy.orm import Session
-from app.models import User
+from app.models import User, Vehicle
 from app.schemas.lead import LeadCaptureRequest
 from app.core.security import get_password_hash
 from app.services.auth_service import AuthService
+from app.services.analytics_service import AnalyticsService
 import uuid
 import random
 import string
@@ -41,6 +42,11 @@ class LeadService:
             db.commit()
             db.refresh(user)
             
+        # Count the lead against the vehicle (ignore unknown ids)
+        if db.query(Vehicle.id).filter(Vehicle.id == data.vehicle_id).first():
+            AnalyticsService.record(db, data.vehicle_id, "leads")
+            db.commit()
+            
         # 3. Log the "Enquiry" (Lead) - reused logic or new table?
         # For now, we assume the frontend sends the WhatsApp message directly.
         # Ideally, we should save this to an 'Enquiry' table linked to user.
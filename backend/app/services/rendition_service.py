@@ -0,0 +1,289 @@
+"""
+Rendition Service
+
+On-demand resized copies of uploaded images, cached on disk.
+"""
+
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from pathlib import Path
+from typing import BinaryIO, Dict, Optional, Tuple
+from PIL import Image
+from fastapi import HTTPException, status
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+
+def _render_rendition(source: str, target: str, size: Tuple[int, int]) -> int:
+    """
+    Resize source to fit within size and write it atomically to target.
+    
+    Runs in a worker process. Returns the size of the written file.
+    """
+    ext = os.path.splitext(target)[1].lower()
+    pil_format = Image.registered_extensions().get(ext, "JPEG")
+    
+    with Image.open(source) as img:
+        # Let the JPEG decoder downscale while decoding
+        img.draft("RGB", size)
+        
+        if img.mode in ("RGBA", "P"):
+            img = img.convert("RGB")
+        
+        img.thumbnail(size, Image.Resampling.LANCZOS, reducing_gap=2.0)
+        
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(target), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as buffer:
+                img.save(buffer, format=pil_format, optimize=True, quality=85)
+            os.replace(tmp_path, target)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+    
+    return os.path.getsize(target)
+
+
+def _noop() -> None:
+    """Do nothing in a worker process, to probe the pool."""
+
+
+class RenditionService:
+    """Service class for on-demand image renditions."""
+    
+    UPLOAD_DIR = settings.upload_dir
+    CACHE_DIR = settings.rendition_cache_dir
+    CACHE_MAX_BYTES = settings.rendition_cache_max_bytes
+    ALLOWED_SIZES = settings.rendition_sizes_list
+    
+    _pool: Optional[ProcessPoolExecutor] = None
+    _lock = threading.RLock()
+    
+    # In-flight renders keyed by cache path, so concurrent requests share one
+    _inflight: Dict[str, Future] = {}
+    
+    # LRU index of cached files: path -> size, oldest first
+    _index: "OrderedDict[str, int]" = OrderedDict()
+    _index_loaded = False
+    _total_bytes = 0
+    
+    # Requests served from cache vs. rendered (or joined an in-flight render)
+    hits = 0
+    misses = 0
+    
+    @classmethod
+    def _get_pool(cls) -> ProcessPoolExecutor:
+        """Get the worker pool, creating it on first use."""
+        if cls._pool is None:
+            cls._pool = ProcessPoolExecutor(max_workers=settings.rendition_workers)
+        return cls._pool
+    
+    @classmethod
+    def shutdown(cls) -> None:
+        """Stop the worker pool."""
+        with cls._lock:
+            if cls._pool is not None:
+                cls._pool.shutdown(wait=False, cancel_futures=True)
+                cls._pool = None
+    
+    @classmethod
+    def inflight_count(cls) -> int:
+        """Renders currently running or queued in the worker pool."""
+        return len(cls._inflight)
+    
+    @classmethod
+    def cache_stats(cls) -> Tuple[int, int]:
+        """(hits, misses) of the rendition cache since startup."""
+        return cls.hits, cls.misses
+    
+    @classmethod
+    def pool_healthy(cls, timeout: float) -> bool:
+        """Check a worker process runs a no-op within timeout, starting the pool if needed."""
+        try:
+            with cls._lock:
+                future = cls._get_pool().submit(_noop)
+            future.result(timeout=timeout)
+        except (FutureTimeoutError, RuntimeError):
+            # BrokenProcessPool is a RuntimeError
+            return False
+        return True
+    
+    @classmethod
+    def _parse_size(cls, size: str) -> Tuple[int, int]:
+        """Parse a WIDTHxHEIGHT string, allowing only whitelisted sizes."""
+        if size not in cls.ALLOWED_SIZES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Size not allowed. Allowed: {', '.join(cls.ALLOWED_SIZES)}"
+            )
+        width, height = size.split("x")
+        return int(width), int(height)
+    
+    @classmethod
+    def _resolve_source(cls, path: str) -> Path:
+        """Resolve an upload-relative path, refusing anything outside the upload dir."""
+        upload_root = Path(cls.UPLOAD_DIR).resolve()
+        source = (upload_root / path).resolve()
+        
+        if not source.is_relative_to(upload_root) or not source.is_file():
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Image not found"
+            )
+        return source
+    
+    @classmethod
+    def _load_index(cls) -> None:
+        """Build the LRU index from files already in the cache dir (caller holds lock)."""
+        entries = []
+        for file_path in Path(cls.CACHE_DIR).rglob("*"):
+            if not file_path.is_file():
+                continue
+            if file_path.suffix == ".tmp":
+                # Left behind by an interrupted render
+                file_path.unlink(missing_ok=True)
+                continue
+            stat = file_path.stat()
+            entries.append((stat.st_mtime, str(file_path), stat.st_size))
+        
+        for _, file_path, size in sorted(entries):
+            cls._index[file_path] = size
+            cls._total_bytes += size
+        cls._index_loaded = True
+    
+    @classmethod
+    def _touch(cls, target: str) -> None:
+        """Mark a cached file as recently used (caller holds lock)."""
+        cls._index.move_to_end(target)
+        try:
+            # Keep mtime in step so LRU order survives restarts
+            os.utime(target)
+        except OSError:
+            pass
+    
+    @classmethod
+    def _add(cls, target: str, size: int) -> None:
+        """Record a new cached file and evict until under budget (caller holds lock)."""
+        cls._total_bytes += size - cls._index.pop(target, 0)
+        cls._index[target] = size
+        
+        while cls._total_bytes > cls.CACHE_MAX_BYTES and len(cls._index) > 1:
+            oldest, oldest_size = cls._index.popitem(last=False)
+            cls._total_bytes -= oldest_size
+            try:
+                os.unlink(oldest)
+            except OSError:
+                pass
+    
+    @classmethod
+    def _finish(cls, target: str, future: Future) -> None:
+        """
+        Record a finished render: update the index and clear the in-flight slot.
+        
+        Runs as the done-callback and from the waiting request, whichever
+        comes first; the second call does nothing.
+        """
+        with cls._lock:
+            if cls._inflight.get(target) is not future:
+                return
+            del cls._inflight[target]
+            if not future.cancelled() and future.exception() is None:
+                cls._add(target, future.result())
+    
+    @classmethod
+    def invalidate(cls, path: str) -> int:
+        """
+        Remove cached renditions of an upload-relative path.
+        
+        Returns the number of files removed.
+        """
+        removed = 0
+        with cls._lock:
+            for size in cls.ALLOWED_SIZES:
+                target = Path(cls.CACHE_DIR) / size / path
+                cls._total_bytes -= cls._index.pop(str(target), 0)
+                try:
+                    target.unlink()
+                    removed += 1
+                except FileNotFoundError:
+                    pass
+        return removed
+    
+    @classmethod
+    def get_rendition(cls, size: str, path: str) -> BinaryIO:
+        """
+        Open a resized copy of an uploaded image.
+        
+        Renders it in the worker pool on first request. Concurrent requests
+        for the same rendition wait on a single render. The file is opened
+        while holding the lock, so a concurrent eviction cannot delete it
+        from under the caller; the caller must close it.
+        """
+        dimensions = cls._parse_size(size)
+        source = cls._resolve_source(path)
+        
+        target_path = Path(cls.CACHE_DIR) / size / source.relative_to(Path(cls.UPLOAD_DIR).resolve())
+        target = str(target_path)
+        
+        while True:
+            handle = cls._open_rendition(source, target, dimensions, path)
+            if handle is not None:
+                return handle
+    
+    @classmethod
+    def _open_rendition(
+        cls,
+        source: Path,
+        target: str,
+        dimensions: Tuple[int, int],
+        path: str
+    ) -> Optional[BinaryIO]:
+        """Serve from cache or render, then open; None if evicted meanwhile (retry)."""
+        with cls._lock:
+            if not cls._index_loaded:
+                cls._load_index()
+            
+            if target in cls._index:
+                try:
+                    handle = open(target, "rb")
+                except FileNotFoundError:
+                    cls._total_bytes -= cls._index.pop(target)
+                else:
+                    cls._touch(target)
+                    cls.hits += 1
+                    return handle
+            
+            cls.misses += 1
+            future = cls._inflight.get(target)
+            if future is None:
+                Path(target).parent.mkdir(parents=True, exist_ok=True)
+                future = cls._get_pool().submit(
+                    _render_rendition, str(source), target, dimensions
+                )
+                cls._inflight[target] = future
+                future.add_done_callback(lambda f: cls._finish(target, f))
+        
+        try:
+            future.result()
+        except Exception as e:
+            print(f"Rendition failed for {path}: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Image could not be resized"
+            )
+        
+        with cls._lock:
+            # Index it now (the done-callback may not have run yet): as the
+            # newest entry it cannot be evicted before it is opened
+            cls._finish(target, future)
+            try:
+                return open(target, "rb")
+            except FileNotFoundError:
+                return None  # Indexed by the callback and evicted before we got here
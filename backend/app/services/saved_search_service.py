@@ -0,0 +1,412 @@
+"""
+Saved Search Service
+
+Saved searches, matched against vehicles as they are listed or reduced.
+
+Each search is stored with reverse index keys (make, body type, price
+band), so a vehicle is only checked against searches that could match
+it: one indexed lookup per vehicle, then the full filters on those few.
+Vehicle writes queue a pending match in their own transaction; matching
+and delivery run in a background thread after the write commits, and
+periodically to pick up anything left by a failure or restart. Alerts
+are queued in the database until delivered.
+"""
+
+import json
+import secrets
+import threading
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, delete, func, insert, or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.database import SessionLocal
+from app.models import (
+    Brand, SavedSearch, SavedSearchAlert, SavedSearchKey, SavedSearchPendingMatch, Vehicle
+)
+from app.schemas import SavedSearchCreate
+
+settings = get_settings()
+
+# A vehicle's (availability_status, price) before a write, or None if it is new
+PriorState = Optional[Tuple[str, float]]
+
+
+class SavedSearchService:
+    """Service class for saved searches and their alerts."""
+    
+    LISTED_STATUSES = ("available", "direct_import")
+    
+    # Reverse index keys meaning "any"
+    ANY_KEY = "*"
+    ANY_BAND = -1
+    
+    # Price bands (of KSH prices) double in width: band n holds prices in [2^(n-1), 2^n)
+    MAX_BAND = int(1e10).bit_length()
+    
+    # Vehicles loaded per query, and alerts claimed per delivery round
+    BATCH_SIZE = 500
+    DELIVERY_BATCH = 100
+    
+    # Matching and delivery, in order, off the request path
+    EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="saved-search")
+    
+    # Set while a run is queued but not yet started; each run drains everything pending
+    _scheduled = False
+    _schedule_lock = threading.Lock()
+    
+    @classmethod
+    def price_band(cls, price: float) -> int:
+        """The price band a price falls in."""
+        return min(int(max(price, 0)).bit_length(), cls.MAX_BAND)
+    
+    @classmethod
+    def _index_keys(cls, db: Session, filters: Dict[str, Any]) -> List[Tuple[str, str, int]]:
+        """
+        Reverse index keys (make, body type, price band) for a search's filters.
+        
+        make is a substring filter, so it is only keyed when it names a
+        whole known make; otherwise the search is keyed under any make and
+        the full filters sort it out.
+        """
+        make_key = cls.ANY_KEY
+        make = (filters.get("make") or "").strip().lower()
+        if make:
+            known = db.query(Vehicle.id).filter(func.lower(Vehicle.make) == make).first() or \
+                db.query(Brand.id).filter(func.lower(Brand.name) == make).first()
+            if known:
+                make_key = make
+        
+        body_key = filters.get("body_type") or cls.ANY_KEY
+        
+        min_price, max_price = filters.get("min_price"), filters.get("max_price")
+        if min_price is None and max_price is None:
+            bands = [cls.ANY_BAND]
+        else:
+            low = cls.price_band(min_price or 0)
+            high = cls.price_band(max_price) if max_price is not None else cls.MAX_BAND
+            bands = list(range(low, high + 1))
+        
+        return [(make_key, body_key, band) for band in bands]
+    
+    @classmethod
+    def create_saved_search(cls, db: Session, data: SavedSearchCreate) -> SavedSearch:
+        """Save a search and index it for matching."""
+        filters = data.model_dump(mode="json", exclude_none=True, exclude={"email", "name"})
+        saved_search = SavedSearch(email=data.email, name=data.name, filters=filters)
+        saved_search.keys = [
+            SavedSearchKey(make_key=make_key, body_key=body_key, price_band=band)
+            for make_key, body_key, band in cls._index_keys(db, filters)
+        ]
+        db.add(saved_search)
+        db.commit()
+        db.refresh(saved_search)
+        return saved_search
+    
+    @staticmethod
+    def get_by_token(db: Session, search_id: str, token: str) -> SavedSearch:
+        """Get a saved search, checking the token it was created with."""
+        saved_search = db.query(SavedSearch).filter(SavedSearch.id == search_id).first()
+        if not saved_search or not secrets.compare_digest(saved_search.token, token):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Saved search not found"
+            )
+        return saved_search
+    
+    @staticmethod
+    def delete_saved_search(db: Session, saved_search: SavedSearch) -> None:
+        """Delete a saved search with its index keys and alerts."""
+        db.delete(saved_search)
+        db.commit()
+    
+    @staticmethod
+    def record(db: Session, prior: Dict[str, PriorState]) -> None:
+        """
+        Queue changed vehicles for matching, in the caller's transaction.
+        
+        prior maps each vehicle id to its (status, price) before the write,
+        or None for new vehicles. Does not commit; call enqueue() after the
+        write has committed.
+        """
+        if not prior:
+            return
+        now = datetime.utcnow()
+        db.execute(insert(SavedSearchPendingMatch), [
+            {
+                "vehicle_id": vehicle_id,
+                "old_status": before[0] if before else None,
+                "old_price": before[1] if before else None,
+                "created_at": now,
+            }
+            for vehicle_id, before in prior.items()
+        ])
+    
+    @classmethod
+    def enqueue(cls) -> None:
+        """Match recorded vehicles and deliver alerts in the background, unless a run is already queued."""
+        with cls._schedule_lock:
+            if cls._scheduled:
+                return
+            cls._scheduled = True
+        cls.EXECUTOR.submit(cls._run)
+    
+    @classmethod
+    def _run(cls) -> None:
+        # Cleared on entry, so writes made during this run queue one more
+        with cls._schedule_lock:
+            cls._scheduled = False
+        db = SessionLocal()
+        try:
+            cls.run_pending(db)
+        except Exception as e:
+            print(f"Saved search matching failed: {e}")
+        finally:
+            db.close()
+    
+    @classmethod
+    def run_pending(cls, db: Session) -> Tuple[int, int]:
+        """Match all pending vehicles, then deliver queued alerts. Returns (queued, sent)."""
+        return cls.process_pending(db), cls.deliver_pending(db)
+    
+    @classmethod
+    def process_pending(cls, db: Session) -> int:
+        """
+        Match pending vehicle writes, oldest first, and clear them.
+        
+        Each batch's alerts and the removal of its pending rows commit
+        together. A vehicle written several times is matched once,
+        against its state before the earliest write. Two workers may
+        match the same rows; alerts are unique, so that only wastes work.
+        Returns the number of alerts queued.
+        """
+        queued = 0
+        while True:
+            pending = db.query(SavedSearchPendingMatch).order_by(
+                SavedSearchPendingMatch.id
+            ).limit(cls.BATCH_SIZE).all()
+            if not pending:
+                return queued
+            
+            prior: Dict[str, PriorState] = {}
+            for row in pending:
+                if row.vehicle_id not in prior:
+                    prior[row.vehicle_id] = (
+                        None if row.old_status is None else (row.old_status, row.old_price)
+                    )
+            queued += cls.match_vehicles(db, prior)
+            db.execute(delete(SavedSearchPendingMatch).where(
+                SavedSearchPendingMatch.id.in_([row.id for row in pending])
+            ))
+            db.commit()
+    
+    @staticmethod
+    def matches(filters: Dict[str, Any], vehicle: Any) -> bool:
+        """Check a vehicle against saved filters, as the vehicle list would."""
+        def contains(value: Optional[str], term: str) -> bool:
+            return value is not None and term.lower() in value.lower()
+        
+        if "make" in filters and not contains(vehicle.make, filters["make"]):
+            return False
+        if "model" in filters and not contains(vehicle.model, filters["model"]):
+            return False
+        # Price bounds are in KSH, as on the vehicle list
+        if "min_price" in filters and (vehicle.price_ksh is None or vehicle.price_ksh < filters["min_price"]):
+            return False
+        if "max_price" in filters and (vehicle.price_ksh is None or vehicle.price_ksh > filters["max_price"]):
+            return False
+        if "min_year" in filters and vehicle.year < filters["min_year"]:
+            return False
+        if "max_year" in filters and vehicle.year > filters["max_year"]:
+            return False
+        for field in ("body_type", "transmission", "fuel_type"):
+            if field in filters and getattr(vehicle, field) != filters[field]:
+                return False
+        if "location" in filters and not contains(vehicle.location, filters["location"]):
+            return False
+        if "search" in filters and not any(
+            contains(value, filters["search"])
+            for value in (vehicle.make, vehicle.model, vehicle.description)
+        ):
+            return False
+        return True
+    
+    @classmethod
+    def _candidates(cls, db: Session, vehicle: Any) -> List[str]:
+        """Ids of saved searches whose index keys cover a vehicle."""
+        makes = [cls.ANY_KEY, (vehicle.make or "").strip().lower()]
+        bodies = [cls.ANY_KEY, vehicle.body_type] if vehicle.body_type else [cls.ANY_KEY]
+        bands = [cls.ANY_BAND]
+        if vehicle.price_ksh is not None:
+            bands.append(cls.price_band(vehicle.price_ksh))
+        return [
+            search_id for (search_id,) in
+            db.query(SavedSearchKey.saved_search_id).filter(
+                SavedSearchKey.make_key.in_(makes),
+                SavedSearchKey.body_key.in_(bodies),
+                SavedSearchKey.price_band.in_(bands)
+            ).distinct()
+        ]
+    
+    @classmethod
+    def match_vehicles(cls, db: Session, prior: Dict[str, PriorState]) -> int:
+        """
+        Queue alerts for vehicles that were newly listed or reduced in price.
+        
+        Each vehicle is checked against its candidate searches only.
+        Returns the number of alerts queued (alerts already sent for the
+        same vehicle and price are skipped). Does not commit.
+        """
+        vehicle_ids = list(prior)
+        now = datetime.utcnow()
+        rows = []
+        for offset in range(0, len(vehicle_ids), cls.BATCH_SIZE):
+            vehicles = db.query(
+                Vehicle.id, Vehicle.make, Vehicle.model, Vehicle.year, Vehicle.price,
+                Vehicle.price_ksh, Vehicle.body_type, Vehicle.transmission, Vehicle.fuel_type,
+                Vehicle.location, Vehicle.description
+            ).filter(
+                Vehicle.id.in_(vehicle_ids[offset:offset + cls.BATCH_SIZE]),
+                Vehicle.availability_status.in_(cls.LISTED_STATUSES)
+            ).all()
+            
+            events = []
+            for vehicle in vehicles:
+                before = prior[vehicle.id]
+                if before is None or before[0] not in cls.LISTED_STATUSES:
+                    events.append((vehicle, "new_listing", None))
+                elif before[1] is not None and vehicle.price < before[1]:
+                    events.append((vehicle, "price_drop", before[1]))
+            
+            candidates = {vehicle.id: cls._candidates(db, vehicle) for vehicle, _, _ in events}
+            search_ids = {search_id for ids in candidates.values() for search_id in ids}
+            searches = dict(
+                db.query(SavedSearch.id, SavedSearch.filters).filter(
+                    SavedSearch.id.in_(search_ids),
+                    SavedSearch.is_active == True
+                )
+            ) if search_ids else {}
+            
+            for vehicle, kind, old_price in events:
+                for search_id in candidates[vehicle.id]:
+                    filters = searches.get(search_id)
+                    if filters is not None and cls.matches(filters, vehicle):
+                        rows.append({
+                            "saved_search_id": search_id,
+                            "vehicle_id": vehicle.id,
+                            "kind": kind,
+                            "price": vehicle.price,
+                            "old_price": old_price,
+                            "created_at": now,
+                        })
+        
+        if rows:
+            upsert = postgresql.insert if db.get_bind().dialect.name == "postgresql" else sqlite.insert
+            db.execute(upsert(SavedSearchAlert).on_conflict_do_nothing(), rows)
+        return len(rows)
+    
+    @staticmethod
+    def _send(payload: Dict[str, Any]) -> None:
+        """Hand one alert to the delivery webhook, or log it if none is set."""
+        if not settings.saved_search_webhook_url:
+            print(
+                f"Saved search alert ({payload['kind']}) for {payload['email']}: "
+                f"{payload['vehicle']['title']} at {payload['vehicle']['price']:.0f}"
+            )
+            return
+        
+        request = urllib.request.Request(
+            settings.saved_search_webhook_url,
+            data=json.dumps(payload).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST"
+        )
+        with urllib.request.urlopen(request, timeout=10):
+            pass
+    
+    @classmethod
+    def deliver_pending(cls, db: Session) -> int:
+        """
+        Send queued alerts, oldest first.
+        
+        Alerts are claimed by setting claimed_at before sending, so two
+        workers never send the same one. sent_at is only set once sent; a
+        failed send is released for a later round, and a claim whose
+        sender died expires after SAVED_SEARCH_CLAIM_SECONDS. Returns the
+        number sent.
+        """
+        sent = 0
+        while True:
+            now = datetime.utcnow()
+            claimable = and_(
+                SavedSearchAlert.sent_at.is_(None),
+                or_(
+                    SavedSearchAlert.claimed_at.is_(None),
+                    SavedSearchAlert.claimed_at < now - timedelta(seconds=settings.saved_search_claim_seconds)
+                )
+            )
+            claimed = [
+                alert_id for (alert_id,) in db.execute(
+                    update(SavedSearchAlert).where(
+                        SavedSearchAlert.id.in_(
+                            select(SavedSearchAlert.id).where(claimable)
+                            .order_by(SavedSearchAlert.created_at).limit(cls.DELIVERY_BATCH)
+                        ),
+                        claimable
+                    ).values(claimed_at=now).returning(SavedSearchAlert.id)
+                )
+            ]
+            db.commit()
+            if not claimed:
+                return sent
+            
+            alerts = db.query(SavedSearchAlert).filter(SavedSearchAlert.id.in_(claimed)).all()
+            vehicles = {
+                vehicle.id: vehicle for vehicle in
+                db.query(Vehicle).filter(Vehicle.id.in_({alert.vehicle_id for alert in alerts}))
+            }
+            failed = []
+            for alert in alerts:
+                vehicle = vehicles.get(alert.vehicle_id)
+                if vehicle is None:
+                    alert.sent_at = now  # Deleted since: nothing to tell
+                    continue
+                
+                saved_search = alert.saved_search
+                try:
+                    cls._send({
+                        "kind": alert.kind,
+                        "email": saved_search.email,
+                        "saved_search_id": saved_search.id,
+                        "saved_search_name": saved_search.name,
+                        "token": saved_search.token,
+                        "vehicle": {
+                            "id": vehicle.id,
+                            "title": vehicle.title,
+                            "price": alert.price,
+                            "old_price": alert.old_price,
+                            "currency": vehicle.currency,
+                            "image": vehicle.primary_image,
+                            "url": f"{settings.feed_site_url}/vehicles/{vehicle.id}",
+                        },
+                    })
+                    alert.sent_at = datetime.utcnow()
+                    saved_search.last_alerted_at = now
+                    sent += 1
+                except Exception as e:
+                    print(f"Saved search alert {alert.id} failed: {e}")
+                    failed.append(alert.id)
+            
+            if failed:
+                db.execute(
+                    update(SavedSearchAlert).where(SavedSearchAlert.id.in_(failed)).values(claimed_at=None)
+                )
+            db.commit()
+            if failed or len(claimed) < cls.DELIVERY_BATCH:
+                return sent
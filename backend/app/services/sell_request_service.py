@@ -7,9 +7,10 @@ Business logic for sell request operations.
 from typing import List, Optional, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy import desc
+from fastapi import HTTPException, status as http_status
 
 from app.models import SellRequest, SellRequestImage
-from app.schemas import SellRequestCreate
+from app.schemas import SellRequestCreate, SellRequestFilters
 
 
 class SellRequestService:
@@ -65,6 +66,45 @@ class SellRequestService:
         db.refresh(sell_request)
         return sell_request
     
+    @staticmethod
+    def bulk_update_status(
+        db: Session,
+        status: str,
+        ids: Optional[List[str]] = None,
+        filters: Optional[SellRequestFilters] = None
+    ) -> int:
+        """
+        Set the status of many sell requests with a single UPDATE.
+        
+        Sell requests are selected by ids or by filters, never both.
+        Returns the number of sell requests updated.
+        """
+        if (ids is None) == (filters is None):
+            raise HTTPException(
+                status_code=http_status.HTTP_400_BAD_REQUEST,
+                detail="Provide either ids or filter"
+            )
+        
+        query = db.query(SellRequest)
+        if ids is not None:
+            query = query.filter(SellRequest.id.in_(set(ids)))
+        else:
+            if not filters.model_dump(exclude_none=True):
+                raise HTTPException(
+                    status_code=http_status.HTTP_400_BAD_REQUEST,
+                    detail="Filter must set at least one field"
+                )
+            if filters.status:
+                query = query.filter(SellRequest.status == filters.status.value)
+            if filters.service_type:
+                query = query.filter(SellRequest.service_type == filters.service_type.value)
+            if filters.created_before:
+                query = query.filter(SellRequest.created_at < filters.created_before)
+        
+        updated = query.update({SellRequest.status: status}, synchronize_session=False)
+        db.commit()
+        return updated
+    
     @staticmethod
     def add_valuation(
         db: Session,
@@ -100,6 +140,29 @@ class SellRequestService:
         db.refresh(image)
         return image
     
+    @staticmethod
+    def add_images(
+        db: Session,
+        request_id: str,
+        image_urls: List[str]
+    ) -> List[SellRequestImage]:
+        """Add several images to a sell request in a single transaction."""
+        if not image_urls:
+            return []
+        
+        images = [
+            SellRequestImage(sell_request_id=request_id, image_url=image_url)
+            for image_url in image_urls
+        ]
+        db.add_all(images)
+        db.flush()
+        ids = [image.id for image in images]
+        db.commit()
+        
+        # Reload all rows in one query rather than one refresh per image
+        db.query(SellRequestImage).filter(SellRequestImage.id.in_(ids)).all()
+        return images
+    
     @staticmethod
     def get_pending_count(db: Session) -> int:
         """Get count of pending sell requests."""
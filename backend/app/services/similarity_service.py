@@ -0,0 +1,315 @@
+"""
+Similarity Service
+
+"Similar vehicles" for listing pages, from a precomputed neighbor index.
+
+Every listed vehicle is a row of normalized features (log price, year,
+mileage, body type, make). The k nearest rows of each are computed up
+front with vectorized NumPy, so a lookup is a dictionary read. The index
+follows the vehicle change log: changed rows get fresh neighbor lists,
+and only the lists they enter or leave are patched.
+"""
+
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from fastapi import HTTPException, status
+from sqlalchemy import func
+from sqlalchemy.orm import Session, selectinload
+
+from app.core.config import get_settings
+from app.models import Vehicle, VehicleChange
+
+settings = get_settings()
+
+
+class SimilarityService:
+    """Service class for the similar-vehicles index."""
+    
+    LISTED_STATUSES = ("available", "direct_import")
+    
+    # Weights of the normalized numeric features (log price, year, mileage)
+    WEIGHTS = np.array([1.0, 0.7, 0.4])
+    BODY_PENALTY = 1.0
+    MAKE_PENALTY = 0.6
+    
+    # Rows scored against the whole index at once while building
+    CHUNK_SIZE = 256
+    
+    # Rebuild instead of patching when this share of the index changed
+    REBUILD_FRACTION = 0.1
+    
+    _lock = threading.RLock()
+    
+    # Change log seq the index reflects; None until first built
+    _seq: Optional[int] = None
+    _ids: List[str] = []
+    _rows: Dict[str, int] = {}
+    
+    # Feature vectors: the weighted numeric features, then one column per
+    # body type and make ("body:suv", "make:toyota") for one-hot flags
+    _columns: Dict[str, int] = {}
+    _center = np.zeros(3)
+    _scale = np.ones(3)
+    _vectors = np.empty((0, 3), dtype=np.float32)
+    _norms = np.empty(0, dtype=np.float32)
+    _active = np.empty(0, dtype=bool)
+    
+    # Each row's nearest rows (-1 when fewer exist) and squared distances
+    _neighbors = np.empty((0, 0), dtype=np.int64)
+    _distances = np.empty((0, 0), dtype=np.float32)
+    
+    @classmethod
+    def _listed_query(cls, db: Session):
+        # Prices in KSH, so vehicles priced in any currency are comparable
+        return db.query(
+            Vehicle.id, Vehicle.price_ksh.label("price"), Vehicle.year, Vehicle.mileage,
+            Vehicle.body_type, Vehicle.make
+        ).filter(
+            Vehicle.availability_status.in_(cls.LISTED_STATUSES),
+            Vehicle.price_ksh.isnot(None)
+        )
+    
+    @staticmethod
+    def _raw(rows) -> np.ndarray:
+        """Unnormalized (log price, year, mileage) per row; mileage may be NaN."""
+        return np.array(
+            [
+                (np.log1p(row.price), row.year, np.nan if row.mileage is None else row.mileage)
+                for row in rows
+            ],
+            dtype=float
+        ).reshape(-1, 3)
+    
+    @classmethod
+    def _flags(cls, row) -> Tuple[Tuple[str, float], Tuple[str, float]]:
+        """
+        One-hot (column, value) pairs for a row's body type and make.
+        
+        Two different flags of value sqrt(p / 2) are p apart in squared
+        distance, so a mismatch costs exactly its penalty.
+        """
+        return (
+            (f"body:{(row.body_type or '').lower()}", np.sqrt(cls.BODY_PENALTY / 2)),
+            (f"make:{(row.make or '').strip().lower()}", np.sqrt(cls.MAKE_PENALTY / 2)),
+        )
+    
+    @classmethod
+    def _vectorize(cls, rows, add_columns: bool = True) -> np.ndarray:
+        """
+        Feature vectors for rows, using the index's normalization stats.
+        
+        Missing mileage counts as average. Unseen body types and makes get
+        new columns, or are left out (no flag) when add_columns is false.
+        """
+        numeric = (cls._raw(rows) - cls._center) / cls._scale * cls.WEIGHTS
+        flags = [cls._flags(row) for row in rows]
+        if add_columns:
+            for row_flags in flags:
+                for column, _ in row_flags:
+                    if column not in cls._columns:
+                        cls._columns[column] = 3 + len(cls._columns)
+            width = 3 + len(cls._columns)
+            if cls._vectors.shape[1] < width:
+                cls._vectors = np.pad(cls._vectors, ((0, 0), (0, width - cls._vectors.shape[1])))
+        
+        vectors = np.zeros((len(rows), 3 + len(cls._columns)), dtype=np.float32)
+        vectors[:, :3] = np.nan_to_num(numeric, nan=0.0)
+        for index, row_flags in enumerate(flags):
+            for column, value in row_flags:
+                if column in cls._columns:
+                    vectors[index, cls._columns[column]] = value
+        return vectors
+    
+    @classmethod
+    def _distances_to(cls, vectors: np.ndarray) -> np.ndarray:
+        """Squared distances from each vector to every index row (inactive rows: inf)."""
+        norms = (vectors * vectors).sum(axis=1)
+        distances = norms[:, None] + cls._norms[None, :] - 2 * (vectors @ cls._vectors.T)
+        np.maximum(distances, 0, out=distances)
+        distances[:, ~cls._active] = np.inf
+        return distances
+    
+    @staticmethod
+    def _top_k(candidates: np.ndarray, distances: np.ndarray, k: int):
+        """The k nearest candidates per row, nearest first, padded with -1/inf."""
+        if distances.shape[1] > k:
+            nearest = np.argpartition(distances, k - 1, axis=1)[:, :k]
+            candidates = np.take_along_axis(candidates, nearest, axis=1)
+            distances = np.take_along_axis(distances, nearest, axis=1)
+        order = np.argsort(distances, axis=1, kind="stable")
+        candidates = np.take_along_axis(candidates, order, axis=1)
+        distances = np.take_along_axis(distances, order, axis=1)
+        
+        pad = k - distances.shape[1]
+        if pad > 0:
+            candidates = np.pad(candidates, ((0, 0), (0, pad)), constant_values=-1)
+            distances = np.pad(distances, ((0, 0), (0, pad)), constant_values=np.inf)
+        candidates = np.where(np.isinf(distances), -1, candidates)
+        return candidates, distances
+    
+    @classmethod
+    def _recompute(cls, rows: np.ndarray) -> None:
+        """Recompute the neighbor lists of the given index rows (caller holds lock)."""
+        k = settings.similar_vehicles_neighbors
+        everyone = np.arange(len(cls._ids))
+        for offset in range(0, len(rows), cls.CHUNK_SIZE):
+            chunk = rows[offset:offset + cls.CHUNK_SIZE]
+            distances = cls._distances_to(cls._vectors[chunk])
+            distances[np.arange(len(chunk)), chunk] = np.inf  # Not similar to itself
+            candidates = np.broadcast_to(everyone, distances.shape)
+            cls._neighbors[chunk], cls._distances[chunk] = cls._top_k(candidates, distances, k)
+    
+    @classmethod
+    def _rebuild(cls, db: Session, head: int) -> None:
+        """Index every listed vehicle (caller holds lock)."""
+        rows = cls._listed_query(db).all()
+        raw = cls._raw(rows)
+        if len(rows):
+            cls._center = np.nan_to_num(np.nanmean(raw, axis=0))
+            scale = np.nan_to_num(np.nanstd(raw, axis=0))
+            cls._scale = np.where(scale > 0, scale, 1.0)
+        
+        cls._ids = [row.id for row in rows]
+        cls._rows = {vehicle_id: index for index, vehicle_id in enumerate(cls._ids)}
+        cls._columns = {}
+        cls._vectors = np.empty((0, 3), dtype=np.float32)
+        cls._vectors = cls._vectorize(rows)
+        cls._norms = (cls._vectors * cls._vectors).sum(axis=1)
+        cls._active = np.ones(len(rows), dtype=bool)
+        
+        k = settings.similar_vehicles_neighbors
+        cls._neighbors = np.full((len(rows), k), -1, dtype=np.int64)
+        cls._distances = np.full((len(rows), k), np.inf, dtype=np.float32)
+        cls._recompute(np.arange(len(rows)))
+        cls._seq = head
+    
+    @classmethod
+    def _patch(cls, db: Session, changed: List[str], head: int) -> None:
+        """Apply changed vehicles to the index (caller holds lock)."""
+        rows = cls._listed_query(db).filter(Vehicle.id.in_(changed)).all() if changed else []
+        
+        # Deleted, sold or reserved
+        listed = {row.id for row in rows}
+        removed = np.array([
+            cls._rows.pop(vehicle_id) for vehicle_id in changed
+            if vehicle_id not in listed and vehicle_id in cls._rows
+        ], dtype=np.int64)
+        cls._active[removed] = False
+        cls._neighbors[removed] = -1
+        cls._distances[removed] = np.inf
+        
+        # Updated in place, or appended
+        vectors = cls._vectorize(rows)
+        added = [row for row in rows if row.id not in cls._rows]
+        if added:
+            k = settings.similar_vehicles_neighbors
+            count = len(added)
+            cls._vectors = np.vstack([
+                cls._vectors, np.zeros((count, cls._vectors.shape[1]), dtype=np.float32)
+            ])
+            cls._norms = np.concatenate([cls._norms, np.zeros(count, dtype=np.float32)])
+            cls._active = np.concatenate([cls._active, np.ones(count, dtype=bool)])
+            cls._neighbors = np.vstack([cls._neighbors, np.full((count, k), -1, dtype=np.int64)])
+            cls._distances = np.vstack([cls._distances, np.full((count, k), np.inf, dtype=np.float32)])
+            for row in added:
+                cls._rows[row.id] = len(cls._ids)
+                cls._ids.append(row.id)
+        touched = np.array([cls._rows[row.id] for row in rows], dtype=np.int64)
+        cls._vectors[touched] = vectors
+        cls._norms[touched] = (vectors * vectors).sum(axis=1)
+        
+        # Lists holding a changed vehicle have a stale distance (or a gone
+        # vehicle) in them: recompute those, and the changed rows themselves
+        stale = np.isin(cls._neighbors, np.concatenate([removed, touched])).any(axis=1) & cls._active
+        stale[touched] = True
+        cls._recompute(np.flatnonzero(stale))
+        
+        # Anyone else may only gain a changed vehicle as a neighbor
+        if len(touched):
+            distances = cls._distances_to(cls._vectors[touched])
+            distances[:, stale] = np.inf
+            gains = np.flatnonzero((distances < cls._distances[:, -1]).any(axis=0))
+            if len(gains):
+                candidates = np.hstack([
+                    cls._neighbors[gains], np.broadcast_to(touched, (len(gains), len(touched)))
+                ])
+                merged = np.hstack([cls._distances[gains], distances[:, gains].T])
+                cls._neighbors[gains], cls._distances[gains] = cls._top_k(
+                    candidates, merged, settings.similar_vehicles_neighbors
+                )
+        
+        cls._seq = head
+    
+    @classmethod
+    def refresh(cls, db: Session, full: bool = False) -> None:
+        """Bring the index up to date with the change log."""
+        with cls._lock:
+            head = db.query(func.max(VehicleChange.seq)).scalar() or 0
+            if cls._seq is not None and cls._seq >= head and not full:
+                return
+            
+            changed = []
+            if cls._seq is not None and not full:
+                changed = [
+                    vehicle_id for (vehicle_id,) in
+                    db.query(VehicleChange.vehicle_id).filter(
+                        VehicleChange.seq > cls._seq,
+                        VehicleChange.seq <= head
+                    ).distinct()
+                ]
+            
+            dead = len(cls._ids) - len(cls._rows)
+            if (
+                full
+                or cls._seq is None
+                or dead > len(cls._rows)
+                or len(changed) > len(cls._rows) * cls.REBUILD_FRACTION
+            ):
+                cls._rebuild(db, head)
+            else:
+                cls._patch(db, changed, head)
+    
+    @classmethod
+    def _neighbor_ids(cls, db: Session, vehicle_id: str, limit: int) -> List[str]:
+        """Ids of the nearest listed vehicles, nearest first."""
+        with cls._lock:
+            row = cls._rows.get(vehicle_id)
+            if row is not None:
+                return [cls._ids[index] for index in cls._neighbors[row] if index >= 0][:limit]
+        
+        # Not listed (e.g. sold): score it against the index on the spot
+        vehicle = db.query(
+            Vehicle.id, Vehicle.price_ksh.label("price"), Vehicle.year, Vehicle.mileage,
+            Vehicle.body_type, Vehicle.make
+        ).filter(Vehicle.id == vehicle_id).first()
+        if vehicle is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Vehicle not found"
+            )
+        if vehicle.price is None:
+            return []  # No rate for its currency: no KSH price to compare
+        
+        with cls._lock:
+            if not cls._ids:
+                return []
+            distances = cls._distances_to(cls._vectorize([vehicle], add_columns=False))
+            candidates = np.arange(len(cls._ids))[None, :]
+            nearest, _ = cls._top_k(candidates, distances, min(limit, len(cls._ids)))
+            return [cls._ids[index] for index in nearest[0] if index >= 0]
+    
+    @classmethod
+    def get_similar(cls, db: Session, vehicle_id: str, limit: int = 6) -> List[Vehicle]:
+        """Get listed vehicles most similar to a vehicle, most similar first."""
+        cls.refresh(db)
+        ids = cls._neighbor_ids(db, vehicle_id, limit)
+        if not ids:
+            return []
+        
+        vehicles = {
+            vehicle.id: vehicle for vehicle in
+            db.query(Vehicle).options(selectinload(Vehicle.images)).filter(Vehicle.id.in_(ids))
+        }
+        return [vehicles[vehicle_id] for vehicle_id in ids if vehicle_id in vehicles]
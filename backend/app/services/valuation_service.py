@@ -0,0 +1,272 @@
+"""
+Valuation Service
+
+Suggested valuations for sell requests from comparable vehicles.
+
+Inventory and sold history are held in memory as NumPy arrays (make,
+model, year, mileage, condition, price). A suggestion scores every
+comparable in one vectorized pass and takes the k nearest. The arrays
+are brought up to date from the vehicle change log before each
+suggestion, so only vehicles changed since the last one are reloaded.
+"""
+
+import threading
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from fastapi import HTTPException, status
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models import SellRequest, Vehicle, VehicleChange
+
+settings = get_settings()
+
+
+class ValuationService:
+    """Service class for comparable-based valuations."""
+    
+    # Listed and sold vehicles both count as comparables
+    COMPARABLE_STATUSES = ("available", "direct_import", "reserved", "sold")
+    CONDITIONS = {"fair": 0.0, "good": 1.0, "excellent": 2.0}
+    
+    # Distance units: what counts as "one step" away from the request
+    YEAR_SCALE = 2.0
+    MILEAGE_SCALE = 40000.0
+    CONDITION_WEIGHT = 0.5
+    MODEL_PENALTY = 1.5
+    MAKE_PENALTY = 3.0
+    MISSING_PENALTY = 0.5  # Mileage or condition unknown on either side
+    
+    # Sold prices are what buyers actually paid, so they count for more
+    SOLD_WEIGHT = 1.5
+    
+    # Band around the estimate, as weighted quantiles of comparable prices
+    BAND = (0.2, 0.8)
+    
+    _lock = threading.Lock()
+    
+    # Change log seq the arrays reflect; None until first built
+    _seq: Optional[int] = None
+    _ids: List[str] = []
+    _rows: Dict[str, int] = {}
+    _vocab: Dict[str, int] = {}
+    _make = np.empty(0, dtype=np.int32)
+    _model = np.empty(0, dtype=np.int32)
+    _year = np.empty(0)
+    _mileage = np.empty(0)
+    _condition = np.empty(0)
+    _price = np.empty(0)
+    _sold = np.empty(0, dtype=bool)
+    _active = np.empty(0, dtype=bool)
+    
+    @classmethod
+    def _code(cls, value: Optional[str]) -> int:
+        """Integer code for a make or model name (case-insensitive)."""
+        key = (value or "").strip().lower()
+        return cls._vocab.setdefault(key, len(cls._vocab))
+    
+    @classmethod
+    def _condition_value(cls, value: Optional[str]) -> float:
+        return cls.CONDITIONS.get((value or "").strip().lower(), np.nan)
+    
+    @classmethod
+    def _comparables_query(cls, db: Session):
+        # Prices in KSH, so vehicles priced in any currency are comparable
+        return db.query(
+            Vehicle.id, Vehicle.make, Vehicle.model, Vehicle.year, Vehicle.mileage,
+            Vehicle.condition, Vehicle.price_ksh.label("price"), Vehicle.availability_status
+        ).filter(
+            Vehicle.availability_status.in_(cls.COMPARABLE_STATUSES),
+            Vehicle.price_ksh.isnot(None)
+        )
+    
+    @classmethod
+    def _features(cls, rows) -> Dict[str, np.ndarray]:
+        """Column arrays for (id, make, model, year, mileage, condition, price, status) rows."""
+        return {
+            "make": np.array([cls._code(row.make) for row in rows], dtype=np.int32),
+            "model": np.array([cls._code(row.model) for row in rows], dtype=np.int32),
+            "year": np.array([row.year for row in rows], dtype=float),
+            "mileage": np.array(
+                [np.nan if row.mileage is None else row.mileage for row in rows], dtype=float
+            ),
+            "condition": np.array([cls._condition_value(row.condition) for row in rows], dtype=float),
+            "price": np.array([row.price for row in rows], dtype=float),
+            "sold": np.array([row.availability_status == "sold" for row in rows], dtype=bool),
+        }
+    
+    @classmethod
+    def _rebuild(cls, db: Session, head: int) -> None:
+        """Load every comparable (caller holds lock)."""
+        rows = cls._comparables_query(db).all()
+        features = cls._features(rows)
+        for name, values in features.items():
+            setattr(cls, f"_{name}", values)
+        cls._active = np.ones(len(rows), dtype=bool)
+        cls._ids = [row.id for row in rows]
+        cls._rows = {vehicle_id: index for index, vehicle_id in enumerate(cls._ids)}
+        cls._seq = head
+    
+    @classmethod
+    def _patch(cls, db: Session, head: int) -> None:
+        """Reload vehicles changed since the last refresh (caller holds lock)."""
+        changed = [
+            vehicle_id for (vehicle_id,) in
+            db.query(VehicleChange.vehicle_id).filter(
+                VehicleChange.seq > cls._seq,
+                VehicleChange.seq <= head
+            ).distinct()
+        ]
+        rows = cls._comparables_query(db).filter(Vehicle.id.in_(changed)).all() if changed else []
+        
+        # Deleted, or no longer comparable
+        current = {row.id for row in rows}
+        for vehicle_id in changed:
+            if vehicle_id not in current and vehicle_id in cls._rows:
+                cls._active[cls._rows.pop(vehicle_id)] = False
+        
+        features = cls._features(rows)
+        existing = np.array([cls._rows.get(row.id, -1) for row in rows], dtype=np.int64)
+        updated = existing >= 0
+        for name, values in features.items():
+            getattr(cls, f"_{name}")[existing[updated]] = values[updated]
+        cls._active[existing[updated]] = True
+        
+        added = ~updated
+        if added.any():
+            for name, values in features.items():
+                setattr(cls, f"_{name}", np.concatenate([getattr(cls, f"_{name}"), values[added]]))
+            cls._active = np.concatenate([cls._active, np.ones(int(added.sum()), dtype=bool)])
+            for row, is_added in zip(rows, added):
+                if is_added:
+                    cls._rows[row.id] = len(cls._ids)
+                    cls._ids.append(row.id)
+        
+        cls._seq = head
+    
+    @classmethod
+    def refresh(cls, db: Session, full: bool = False) -> None:
+        """Bring the comparables arrays up to date with the change log."""
+        with cls._lock:
+            head = db.query(func.max(VehicleChange.seq)).scalar() or 0
+            if cls._seq is not None and cls._seq >= head and not full:
+                return
+            
+            # Rebuild when most rows are dead, rather than carrying them forever
+            dead = len(cls._ids) - len(cls._rows)
+            if full or cls._seq is None or dead > len(cls._rows):
+                cls._rebuild(db, head)
+            else:
+                cls._patch(db, head)
+    
+    @staticmethod
+    def _weighted_quantiles(values: np.ndarray, weights: np.ndarray, quantiles) -> np.ndarray:
+        """Quantiles of values where each value counts with its weight."""
+        order = np.argsort(values)
+        values, weights = values[order], weights[order]
+        # Midpoint of each value's share of the total weight
+        positions = (np.cumsum(weights) - weights / 2) / weights.sum()
+        return np.interp(quantiles, positions, values)
+    
+    @classmethod
+    def estimate(
+        cls,
+        db: Session,
+        make: str,
+        model: str,
+        year: int,
+        mileage: Optional[int] = None,
+        condition: Optional[str] = None,
+        k: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Estimate a KSH price from the k nearest comparables.
+        
+        Returns the estimate (weighted median), a low/high band, a
+        confidence label and the comparables used, or None if there are
+        no comparables at all.
+        """
+        cls.refresh(db)
+        k = k or settings.valuation_neighbors
+        
+        with cls._lock:
+            active = np.flatnonzero(cls._active)
+            if not len(active):
+                return None
+            
+            make_code = cls._vocab.get(make.strip().lower(), -1)
+            model_code = cls._vocab.get(model.strip().lower(), -1)
+            condition_value = cls._condition_value(condition)
+            
+            distance = np.abs(cls._year[active] - year) / cls.YEAR_SCALE
+            if mileage is None:
+                distance += cls.MISSING_PENALTY
+            else:
+                mileage_gap = np.abs(cls._mileage[active] - mileage) / cls.MILEAGE_SCALE
+                distance += np.where(np.isnan(mileage_gap), cls.MISSING_PENALTY, mileage_gap)
+            condition_gap = np.abs(cls._condition[active] - condition_value) * cls.CONDITION_WEIGHT
+            distance += np.where(np.isnan(condition_gap), cls.MISSING_PENALTY, condition_gap)
+            distance += np.where(cls._make[active] == make_code, 0.0, cls.MAKE_PENALTY)
+            distance += np.where(
+                (cls._make[active] == make_code) & (cls._model[active] == model_code),
+                0.0,
+                cls.MODEL_PENALTY
+            )
+            
+            k = min(k, len(active))
+            nearest = np.argpartition(distance, k - 1)[:k]
+            nearest = nearest[np.argsort(distance[nearest])]
+            rows = active[nearest]
+            distance = distance[nearest]
+            prices = cls._price[rows]
+            weights = np.where(cls._sold[rows], cls.SOLD_WEIGHT, 1.0) / (1.0 + distance) ** 2
+            comparable_ids = [cls._ids[row] for row in rows]
+        
+        low, median, high = cls._weighted_quantiles(prices, weights, [cls.BAND[0], 0.5, cls.BAND[1]])
+        mean_distance = float(distance.mean())
+        if mean_distance < 1.0:
+            confidence = "high"
+        elif mean_distance < 2.5:
+            confidence = "medium"
+        else:
+            confidence = "low"
+        
+        vehicles = {
+            row.id: row for row in
+            cls._comparables_query(db).filter(Vehicle.id.in_(comparable_ids))
+        }
+        comparables = [
+            {**vehicles[vehicle_id]._asdict(), "distance": round(float(gap), 2)}
+            for vehicle_id, gap in zip(comparable_ids, distance)
+            if vehicle_id in vehicles
+        ]
+        
+        return {
+            "estimate": round(float(median), -3),
+            "low": round(float(low), -3),
+            "high": round(float(high), -3),
+            "currency": "KSH",
+            "confidence": confidence,
+            "comparables": comparables,
+        }
+    
+    @classmethod
+    def suggest(cls, db: Session, sell_request: SellRequest) -> Dict[str, Any]:
+        """Suggest a valuation for a sell request."""
+        suggestion = cls.estimate(
+            db,
+            make=sell_request.vehicle_make,
+            model=sell_request.vehicle_model,
+            year=sell_request.vehicle_year,
+            mileage=sell_request.mileage,
+            condition=sell_request.condition
+        )
+        if suggestion is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="No comparable vehicles to value against"
+            )
+        suggestion["sell_request_id"] = sell_request.id
+        return suggestion
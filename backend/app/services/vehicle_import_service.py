@@ -0,0 +1,516 @@
+"""
+Vehicle Import Service
+
+Bulk vehicle imports from CSV or JSON Lines, run as background jobs.
+"""
+
+import io
+import csv
+import json
+import shutil
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from fastapi import UploadFile, HTTPException, status
+from pydantic import ValidationError
+from sqlalchemy import func, insert, update
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.database import SessionLocal
+from app.models import Vehicle, VehicleImage, VehicleImportJob, VehicleStatusEvent
+from app.models.base import generate_uuid
+from app.schemas import VehicleCreate
+from app.services.fx_service import FxService
+from app.services.image_service import ImageService
+from app.services.vehicle_service import VehicleService
+from app.services.saved_search_service import SavedSearchService, PriorState
+
+settings = get_settings()
+
+# Raw row number plus the row's fields
+RawRow = Tuple[int, Dict[str, Any]]
+
+
+class VehicleImportService:
+    """Service class for bulk vehicle imports."""
+    
+    FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+    
+    # CSV cells holding lists use this separator (features, images)
+    LIST_SEPARATOR = "|"
+    
+    # One import at a time per process, so imports don't starve requests
+    EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="vehicle-import")
+    
+    UNFINISHED_STATUSES = ("pending", "running")
+    
+    @classmethod
+    def _detect_format(cls, filename: str) -> str:
+        file_format = cls.FORMATS.get(Path(filename).suffix.lower())
+        if not file_format:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unsupported file type. Allowed: {', '.join(cls.FORMATS)}"
+            )
+        return file_format
+    
+    @staticmethod
+    def _save_upload(file: UploadFile, target: Path) -> None:
+        """Stream an upload to disk without holding it in memory."""
+        target.parent.mkdir(parents=True, exist_ok=True)
+        file.file.seek(0)
+        with open(target, "wb") as buffer:
+            shutil.copyfileobj(file.file, buffer)
+    
+    @classmethod
+    def create_job(
+        cls,
+        db: Session,
+        source_path: str,
+        filename: str,
+        images_path: Optional[str] = None,
+        created_by: Optional[str] = None
+    ) -> VehicleImportJob:
+        """Record a pending import job for a file already on disk."""
+        if images_path and not zipfile.is_zipfile(images_path):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Images must be a zip file"
+            )
+        
+        job = VehicleImportJob(
+            filename=filename,
+            file_format=cls._detect_format(filename),
+            source_path=source_path,
+            images_path=images_path,
+            created_by=created_by,
+            errors=[]
+        )
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+        return job
+    
+    @classmethod
+    def create_job_from_upload(
+        cls,
+        db: Session,
+        file: UploadFile,
+        images: Optional[UploadFile] = None,
+        created_by: Optional[str] = None
+    ) -> VehicleImportJob:
+        """Save uploaded files to the import directory and record a job for them."""
+        filename = file.filename or "import"
+        cls._detect_format(filename)
+        
+        key = generate_uuid()
+        import_dir = Path(settings.import_dir)
+        source_path = import_dir / f"{key}{Path(filename).suffix.lower()}"
+        cls._save_upload(file, source_path)
+        
+        images_path = None
+        if images is not None and images.filename:
+            images_path = import_dir / f"{key}-images.zip"
+            cls._save_upload(images, images_path)
+        
+        try:
+            return cls.create_job(
+                db,
+                str(source_path),
+                filename,
+                images_path=str(images_path) if images_path else None,
+                created_by=created_by
+            )
+        except HTTPException:
+            cls._cleanup(str(source_path), str(images_path) if images_path else None)
+            raise
+    
+    @classmethod
+    def start(cls, job_id: str, resume: bool = False) -> None:
+        """Run a job in the background."""
+        cls.EXECUTOR.submit(cls.run_job, job_id, resume=resume)
+    
+    @classmethod
+    def resume_stale_jobs(cls, db: Session) -> int:
+        """
+        Restart unfinished jobs that have made no progress for a while.
+        
+        Such jobs were left pending or running by a process that stopped.
+        Each is claimed with a conditional UPDATE, so only one worker
+        resumes it, and continues after the rows already committed.
+        Returns the number of jobs resumed.
+        """
+        now = datetime.utcnow()
+        cutoff = now - timedelta(seconds=settings.import_stale_seconds)
+        last_seen = func.coalesce(VehicleImportJob.heartbeat_at, VehicleImportJob.created_at)
+        stale = cls.UNFINISHED_STATUSES
+        
+        resumed = 0
+        for (job_id,) in db.query(VehicleImportJob.id).filter(
+            VehicleImportJob.status.in_(stale), last_seen < cutoff
+        ).all():
+            claimed = db.query(VehicleImportJob).filter(
+                VehicleImportJob.id == job_id,
+                VehicleImportJob.status.in_(stale),
+                last_seen < cutoff
+            ).update({"status": "running", "heartbeat_at": now}, synchronize_session=False)
+            db.commit()
+            if claimed:
+                cls.start(job_id, resume=True)
+                resumed += 1
+        return resumed
+    
+    @staticmethod
+    def get_job(db: Session, job_id: str) -> Optional[VehicleImportJob]:
+        return db.query(VehicleImportJob).filter(VehicleImportJob.id == job_id).first()
+    
+    @classmethod
+    def _iter_rows(cls, path: str, file_format: str) -> Iterator[RawRow]:
+        """Stream rows from the file, one at a time."""
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            if file_format == "csv":
+                for row_number, row in enumerate(csv.DictReader(f), start=1):
+                    yield row_number, row
+                return
+            
+            row_number = 0
+            for line in f:
+                if not line.strip():
+                    continue
+                row_number += 1
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError as e:
+                    row = {"__error__": f"Invalid JSON: {e.msg}"}
+                if not isinstance(row, dict):
+                    row = {"__error__": "Each line must be a JSON object"}
+                yield row_number, row
+    
+    @classmethod
+    def _count_rows(cls, path: str, file_format: str) -> int:
+        """Count data rows up front so progress can be reported as a fraction."""
+        return sum(1 for _ in cls._iter_rows(path, file_format))
+    
+    @classmethod
+    def _clean_row(cls, row: Dict[str, Any]) -> Tuple[Optional[str], List[str], Dict[str, Any]]:
+        """
+        Split a raw row into (id, image names, vehicle fields).
+        
+        CSV cells arrive as strings: blanks become missing (so schema
+        defaults apply) and list cells are split on LIST_SEPARATOR.
+        """
+        fields = {}
+        for key, value in row.items():
+            if key is None:
+                continue
+            if isinstance(value, str):
+                value = value.strip()
+                if value == "":
+                    continue
+            fields[key.strip()] = value
+        
+        vehicle_id = fields.pop("id", None)
+        images = fields.pop("images", [])
+        for key in ("features",):
+            if isinstance(fields.get(key), str):
+                fields[key] = [item.strip() for item in fields[key].split(cls.LIST_SEPARATOR) if item.strip()]
+        if isinstance(images, str):
+            images = [item.strip() for item in images.split(cls.LIST_SEPARATOR) if item.strip()]
+        
+        return (str(vehicle_id) if vehicle_id is not None else None), list(images), fields
+    
+    @staticmethod
+    def _format_validation_error(error: ValidationError) -> List[str]:
+        return [
+            f"{'.'.join(str(part) for part in item['loc']) or 'row'}: {item['msg']}"
+            for item in error.errors()
+        ]
+    
+    @classmethod
+    def _save_zip_images(
+        cls,
+        archive: zipfile.ZipFile,
+        names: List[str]
+    ) -> List[Tuple[Optional[str], Dict[str, Any], Optional[str]]]:
+        """
+        Validate and store images from the zip, in parallel. Same shape as ImageService.save_images.
+        
+        Images are read a group at a time, one per image worker, so memory
+        stays bounded however many images a batch names.
+        """
+        members = set(archive.namelist())
+        pending, results = [], {}
+        for index, name in enumerate(names):
+            if name not in members:
+                results[index] = (None, {}, f"{name}: not found in zip")
+            elif archive.getinfo(name).file_size > ImageService.MAX_FILE_SIZE:
+                results[index] = (None, {}, f"{name}: file too large")
+            else:
+                pending.append((index, name))
+        
+        group_size = settings.image_workers
+        for start in range(0, len(pending), group_size):
+            group = pending[start:start + group_size]
+            files = [UploadFile(file=io.BytesIO(archive.read(name)), filename=name) for _, name in group]
+            saved = ImageService.save_images(files)
+            for (index, name), (image_url, metadata, error) in zip(group, saved):
+                results[index] = (image_url, metadata, f"{name}: {error}" if error else None)
+        return [results[index] for index in range(len(names))]
+    
+    @classmethod
+    def _write_batch(
+        cls,
+        db: Session,
+        job: VehicleImportJob,
+        batch: List[RawRow],
+        archive: Optional[zipfile.ZipFile],
+        prior: Dict[str, PriorState],
+        image_urls: List[str]
+    ) -> List[Dict[str, Any]]:
+        """
+        Validate a batch and write it with one INSERT and one UPDATE executemany.
+        
+        Rows with a known id update that vehicle; all others are inserted.
+        Returns the row errors for the batch. Image problems are reported
+        but do not fail the row. Vehicles that are new or changed status or
+        price are added to prior, for saved search alerts, and stored image
+        files to image_urls, for cleanup if the batch is rolled back.
+        """
+        errors = []
+        failed = 0
+        valid = []
+        for row_number, raw in batch:
+            if "__error__" in raw:
+                errors.append({"row": row_number, "errors": [raw["__error__"]]})
+                failed += 1
+                continue
+            
+            vehicle_id, images, fields = cls._clean_row(raw)
+            try:
+                data = VehicleCreate(**fields)
+            except ValidationError as e:
+                errors.append({"row": row_number, "errors": cls._format_validation_error(e)})
+                failed += 1
+                continue
+            valid.append((row_number, vehicle_id, images, data))
+        
+        given_ids = [vehicle_id for _, vehicle_id, _, _ in valid if vehicle_id]
+        # Current status and price of each existing vehicle, for status
+        # history, KSH prices and saved search alerts
+        existing = {}
+        if given_ids:
+            existing = {
+                row.id: row for row in
+                db.query(
+                    Vehicle.id, Vehicle.availability_status, Vehicle.price, Vehicle.currency
+                ).filter(Vehicle.id.in_(given_ids))
+            }
+        rates = FxService.get_rates(db)
+        
+        now = datetime.utcnow()
+        inserts, updates, image_rows, status_events = [], [], [], []
+        seen = set()
+        for row_number, vehicle_id, images, data in valid:
+            if vehicle_id and vehicle_id in seen:
+                errors.append({"row": row_number, "errors": [f"id: duplicate of an earlier row ({vehicle_id})"]})
+                failed += 1
+                continue
+            
+            if vehicle_id in existing:
+                # Only the columns present in the row change
+                values = data.model_dump(mode="json", exclude_unset=True)
+                current = existing[vehicle_id]
+                old_status, old_price = current.availability_status, current.price
+                if "price" in values or "currency" in values:
+                    values["price_ksh"] = FxService.to_ksh(
+                        db,
+                        values.get("price", old_price),
+                        values.get("currency", current.currency),
+                        rates
+                    )
+                new_status = values.get("availability_status")
+                if new_status and new_status != old_status:
+                    values["sold_at"] = now if new_status == "sold" else None
+                    status_events.append((vehicle_id, old_status, new_status))
+                if new_status not in (None, old_status) or values.get("price", old_price) != old_price:
+                    prior[vehicle_id] = (old_status, old_price)
+                updates.append({"id": vehicle_id, **values, "updated_at": now})
+            else:
+                vehicle_id = vehicle_id or generate_uuid()
+                values = data.model_dump(mode="json")
+                values["price_ksh"] = FxService.to_ksh(db, values["price"], values["currency"], rates)
+                inserts.append({"id": vehicle_id, **values, "created_at": now, "updated_at": now, "views_count": 0})
+                prior[vehicle_id] = None
+                status_events.append((vehicle_id, None, values["availability_status"]))
+            seen.add(vehicle_id)
+            
+            if images and archive is not None:
+                image_rows.append((row_number, vehicle_id, images))
+            elif images:
+                errors.append({"row": row_number, "errors": ["images: no images zip was uploaded"]})
+        
+        if inserts:
+            db.execute(insert(Vehicle), inserts)
+        if updates:
+            db.execute(update(Vehicle), updates)
+        VehicleService.record_changes(db, seen)
+        if status_events:
+            db.execute(insert(VehicleStatusEvent), [
+                {"vehicle_id": vehicle_id, "from_status": old, "to_status": new, "changed_at": now}
+                for vehicle_id, old, new in status_events
+            ])
+        
+        if image_rows:
+            errors.extend(cls._attach_images(db, job, image_rows, archive, now, image_urls))
+        
+        job.created_count += len(inserts)
+        job.updated_count += len(updates)
+        job.failed_count += failed
+        return errors
+    
+    @classmethod
+    def _attach_images(
+        cls,
+        db: Session,
+        job: VehicleImportJob,
+        image_rows: List[Tuple[int, str, List[str]]],
+        archive: zipfile.ZipFile,
+        now: datetime,
+        image_urls: List[str]
+    ) -> List[Dict[str, Any]]:
+        """Store zip images for a batch and insert their rows, after any existing images."""
+        names = [name for _, _, images in image_rows for name in images]
+        results = cls._save_zip_images(archive, names)
+        image_urls.extend(image_url for image_url, _, _ in results if image_url)
+        saved = iter(results)
+        
+        vehicle_ids = [vehicle_id for _, vehicle_id, _ in image_rows]
+        max_orders = dict(
+            db.query(VehicleImage.vehicle_id, func.max(VehicleImage.display_order))
+            .filter(VehicleImage.vehicle_id.in_(vehicle_ids))
+            .group_by(VehicleImage.vehicle_id)
+            .all()
+        )
+        
+        errors, rows = [], []
+        for row_number, vehicle_id, images in image_rows:
+            max_order = max_orders.get(vehicle_id)
+            next_order = 0 if max_order is None else max_order + 1
+            row_errors = []
+            for name in images:
+                image_url, metadata, error = next(saved)
+                if error:
+                    row_errors.append(f"images: {error}")
+                    continue
+                rows.append({
+                    "id": generate_uuid(),
+                    "vehicle_id": vehicle_id,
+                    "image_url": image_url,
+                    # First image of a vehicle without images becomes primary
+                    "is_primary": next_order == 0,
+                    "display_order": next_order,
+                    "uploaded_at": now,
+                    "width": metadata.get("width"),
+                    "height": metadata.get("height"),
+                    "placeholder": metadata.get("placeholder"),
+                })
+                next_order += 1
+            if row_errors:
+                errors.append({"row": row_number, "errors": row_errors})
+        
+        if rows:
+            db.execute(insert(VehicleImage), rows)
+        job.images_attached += len(rows)
+        return errors
+    
+    @staticmethod
+    def _cleanup(*paths: Optional[str]) -> None:
+        """Remove uploaded files that were copied into the import directory."""
+        import_dir = Path(settings.import_dir).resolve()
+        for path in paths:
+            if path and Path(path).resolve().parent == import_dir:
+                Path(path).unlink(missing_ok=True)
+    
+    @classmethod
+    def run_job(
+        cls,
+        job_id: str,
+        on_progress: Optional[Callable[[VehicleImportJob], None]] = None,
+        resume: bool = False
+    ) -> None:
+        """
+        Process an import job to completion, committing after every batch.
+        
+        Progress is saved with each batch so it can be polled from any worker.
+        A resumed job skips the rows its committed batches already covered.
+        """
+        db = SessionLocal()
+        job = cls.get_job(db, job_id)
+        # Taken over by another worker (see resume_stale_jobs), or finished
+        if job is None or job.status != ("running" if resume else "pending"):
+            db.close()
+            return
+        
+        archive = None
+        try:
+            job.status = "running"
+            job.started_at = job.started_at or datetime.utcnow()
+            job.heartbeat_at = datetime.utcnow()
+            job.total_rows = cls._count_rows(job.source_path, job.file_format)
+            db.commit()
+            
+            if job.images_path:
+                archive = zipfile.ZipFile(job.images_path)
+            
+            errors = list(job.errors or [])
+            rows = islice(cls._iter_rows(job.source_path, job.file_format), job.processed_rows, None)
+            while True:
+                batch = list(islice(rows, settings.import_batch_size))
+                if not batch:
+                    break
+                
+                prior: Dict[str, PriorState] = {}
+                image_urls: List[str] = []
+                try:
+                    batch_errors = cls._write_batch(db, job, batch, archive, prior, image_urls)
+                except Exception as e:
+                    db.rollback()
+                    prior.clear()
+                    # The rolled back rows no longer reference these files
+                    for image_url in image_urls:
+                        ImageService.delete_image(image_url)
+                    print(f"Import batch failed for job {job.id}: {e}")
+                    batch_errors = [{"row": row_number, "errors": [f"Batch write failed: {e}"]}
+                                    for row_number, _ in batch]
+                    job.failed_count += len(batch)
+                
+                errors.extend(batch_errors[:settings.import_max_errors - len(errors)])
+                job.errors = list(errors)
+                job.processed_rows += len(batch)
+                job.heartbeat_at = datetime.utcnow()
+                SavedSearchService.record(db, prior)
+                db.commit()
+                if prior:
+                    SavedSearchService.enqueue()
+                
+                if on_progress:
+                    on_progress(job)
+            
+            job.status = "completed"
+        except Exception as e:
+            db.rollback()
+            print(f"Import job {job_id} failed: {e}")
+            job.status = "failed"
+            job.error_message = str(e)
+        finally:
+            job.finished_at = datetime.utcnow()
+            db.commit()
+            if archive is not None:
+                archive.close()
+            cls._cleanup(job.source_path, job.images_path)
+            db.close()
@@ -4,12 +4,17 @@ Vehicle Service
 Business logic for vehicle operations.
 """
 
-from typing import List, Optional, Tuple
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, asc
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from datetime import datetime
+from sqlalchemy.orm import Session, Query, selectinload
+from sqlalchemy import and_, or_, desc, asc, func, insert, literal, case
+from fastapi import HTTPException, status
 
-from app.models import Vehicle, VehicleImage
-from app.schemas import VehicleCreate, VehicleUpdate
+from app.models import Vehicle, VehicleImage, VehicleChange, VehicleStatusEvent
+from app.schemas import VehicleCreate, VehicleUpdate, VehicleBulkUpdate
+from app.services.analytics_service import AnalyticsService
+from app.services.fx_service import FxService
+from app.services.saved_search_service import SavedSearchService
 
 
 class VehicleService:
@@ -41,17 +46,69 @@ class VehicleService:
         
         Returns tuple of (vehicles, total_count).
         """
-        query = db.query(Vehicle)
+        query = VehicleService.filter_query(
+            db.query(Vehicle),
+            make=make,
+            model=model,
+            min_price=min_price,
+            max_price=max_price,
+            min_year=min_year,
+            max_year=max_year,
+            body_type=body_type,
+            transmission=transmission,
+            fuel_type=fuel_type,
+            availability_status=availability_status,
+            location=location,
+            is_featured=is_featured,
+            search=search
+        )
+        
+        # Get total count before pagination
+        total = query.count()
+        
+        # Apply sorting (prices in KSH, so mixed currencies sort together)
+        if sort_by == "price":
+            sort_column = Vehicle.price_ksh
+        else:
+            sort_column = getattr(Vehicle, sort_by, Vehicle.created_at)
+        if sort_order == "asc":
+            query = query.order_by(asc(sort_column))
+        else:
+            query = query.order_by(desc(sort_column))
+        
+        # Apply pagination
+        offset = (page - 1) * limit
+        vehicles = query.offset(offset).limit(limit).all()
         
-        # Apply filters
+        return vehicles, total
+    
+    @staticmethod
+    def filter_query(
+        query: Query,
+        make: Optional[str] = None,
+        model: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        min_year: Optional[int] = None,
+        max_year: Optional[int] = None,
+        body_type: Optional[str] = None,
+        transmission: Optional[str] = None,
+        fuel_type: Optional[str] = None,
+        availability_status: Optional[str] = None,
+        location: Optional[str] = None,
+        is_featured: Optional[bool] = None,
+        search: Optional[str] = None
+    ) -> Query:
+        """Apply the listing filters to a vehicle query."""
         if make:
             query = query.filter(Vehicle.make.ilike(f"%{make}%"))
         if model:
             query = query.filter(Vehicle.model.ilike(f"%{model}%"))
+        # Price bounds are in KSH, whatever the vehicle is priced in
         if min_price is not None:
-            query = query.filter(Vehicle.price >= min_price)
+            query = query.filter(Vehicle.price_ksh >= min_price)
         if max_price is not None:
-            query = query.filter(Vehicle.price <= max_price)
+            query = query.filter(Vehicle.price_ksh <= max_price)
         if min_year is not None:
             query = query.filter(Vehicle.year >= min_year)
         if max_year is not None:
@@ -80,21 +137,7 @@ class VehicleService:
                 )
             )
         
-        # Get total count before pagination
-        total = query.count()
-        
-        # Apply sorting
-        sort_column = getattr(Vehicle, sort_by, Vehicle.created_at)
-        if sort_order == "asc":
-            query = query.order_by(asc(sort_column))
-        else:
-            query = query.order_by(desc(sort_column))
-        
-        # Apply pagination
-        offset = (page - 1) * limit
-        vehicles = query.offset(offset).limit(limit).all()
-        
-        return vehicles, total
+        return query
     
     @staticmethod
     def get_vehicle_by_id(db: Session, vehicle_id: str) -> Optional[Vehicle]:
@@ -119,10 +162,16 @@ class VehicleService:
     @staticmethod
     def create_vehicle(db: Session, data: VehicleCreate) -> Vehicle:
         """Create a new vehicle."""
-        vehicle = Vehicle(**data.model_dump())
+        vehicle = Vehicle(**data.model_dump(mode="json"))
+        vehicle.price_ksh = FxService.to_ksh(db, vehicle.price, vehicle.currency)
         db.add(vehicle)
+        db.flush()
+        VehicleService.record_status_change(db, vehicle, None)
+        VehicleService.record_changes(db, [vehicle.id])
+        SavedSearchService.record(db, {vehicle.id: None})
         db.commit()
         db.refresh(vehicle)
+        SavedSearchService.enqueue()
         return vehicle
     
     @staticmethod
@@ -132,31 +181,160 @@ class VehicleService:
         data: VehicleUpdate
     ) -> Vehicle:
         """Update an existing vehicle."""
-        update_data = data.model_dump(exclude_unset=True)
+        update_data = data.model_dump(mode="json", exclude_unset=True)
+        old_status, old_price = vehicle.availability_status, vehicle.price
         
         for field, value in update_data.items():
             setattr(vehicle, field, value)
+        if "price" in update_data or "currency" in update_data:
+            vehicle.price_ksh = FxService.to_ksh(db, vehicle.price, vehicle.currency)
+        
+        if vehicle.availability_status != old_status:
+            VehicleService.record_status_change(db, vehicle, old_status)
+        VehicleService.record_changes(db, [vehicle.id])
         
+        # Newly listed or reduced: alert matching saved searches
+        alert = vehicle.availability_status != old_status or vehicle.price != old_price
+        if alert:
+            SavedSearchService.record(db, {vehicle.id: (old_status, old_price)})
         db.commit()
         db.refresh(vehicle)
+        if alert:
+            SavedSearchService.enqueue()
         return vehicle
     
+    @staticmethod
+    def record_status_change(
+        db: Session,
+        vehicle: Vehicle,
+        from_status: Optional[str]
+    ) -> None:
+        """
+        Log a vehicle's new availability status and keep sold_at in step.
+        
+        sold_at is set when the vehicle becomes sold and cleared when it
+        stops being sold. Does not commit.
+        """
+        now = datetime.utcnow()
+        if from_status is not None:
+            vehicle.sold_at = now if vehicle.availability_status == "sold" else None
+        db.add(VehicleStatusEvent(
+            vehicle_id=vehicle.id,
+            from_status=from_status,
+            to_status=vehicle.availability_status,
+            changed_at=now
+        ))
+    
     @staticmethod
     def delete_vehicle(db: Session, vehicle: Vehicle) -> None:
         """Delete a vehicle and its images."""
+        VehicleService.record_changes(db, [vehicle.id], op="delete")
         db.delete(vehicle)
         db.commit()
     
+    @staticmethod
+    def bulk_update(db: Session, data: VehicleBulkUpdate) -> int:
+        """
+        Apply one change to many vehicles with a single set-based UPDATE.
+        
+        Vehicles are selected by data.ids or by data.filter, never both.
+        Returns the number of vehicles updated.
+        """
+        if (data.ids is None) == (data.filter is None):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Provide either ids or filter"
+            )
+        if data.price is not None and data.price_change_percent is not None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Provide either price or price_change_percent"
+            )
+        
+        now = datetime.utcnow()
+        new_status = data.availability_status.value if data.availability_status else None
+        
+        values = {}
+        if new_status is not None:
+            values[Vehicle.availability_status] = new_status
+            # Evaluated per row against the old status
+            values[Vehicle.sold_at] = case(
+                (Vehicle.availability_status == new_status, Vehicle.sold_at),
+                else_=literal(now) if new_status == "sold" else None
+            )
+        if data.is_featured is not None:
+            values[Vehicle.is_featured] = data.is_featured
+        new_price = None
+        if data.price is not None:
+            new_price = literal(data.price)
+        elif data.price_change_percent is not None:
+            new_price = func.round(Vehicle.price * (1 + data.price_change_percent / 100))
+        if new_price is not None:
+            values[Vehicle.price] = new_price
+            values[Vehicle.price_ksh] = new_price * FxService.rate_for(Vehicle.currency)
+        
+        if not values:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="No changes given"
+            )
+        
+        query = db.query(Vehicle)
+        if data.ids is not None:
+            query = query.filter(Vehicle.id.in_(set(data.ids)))
+        else:
+            filters = data.filter.model_dump(mode="json", exclude_none=True)
+            if not filters:
+                # An empty filter would silently update every vehicle
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Filter must set at least one field"
+                )
+            query = VehicleService.filter_query(query, **filters)
+        
+        # Status and price before the change, for saved search alerts
+        prior = {}
+        if new_status is not None or data.price is not None or data.price_change_percent is not None:
+            prior = {
+                vehicle_id: (old_status, old_price) for vehicle_id, old_status, old_price in
+                query.with_entities(Vehicle.id, Vehicle.availability_status, Vehicle.price)
+            }
+        
+        # Log the targets first: the UPDATE may change what the filter matches
+        db.execute(
+            insert(VehicleChange).from_select(
+                ["vehicle_id", "op", "changed_at"],
+                query.with_entities(Vehicle.id, literal("upsert"), literal(now))
+            )
+        )
+        if new_status is not None:
+            db.execute(
+                insert(VehicleStatusEvent).from_select(
+                    ["vehicle_id", "from_status", "to_status", "changed_at"],
+                    query.filter(Vehicle.availability_status != new_status).with_entities(
+                        Vehicle.id, Vehicle.availability_status, literal(new_status), literal(now)
+                    )
+                )
+            )
+        updated = query.update(values, synchronize_session=False)
+        SavedSearchService.record(db, prior)
+        db.commit()
+        if prior:
+            SavedSearchService.enqueue()
+        return updated
+    
     @staticmethod
     def increment_views(db: Session, vehicle: Vehicle) -> None:
         """Increment the view count for a vehicle."""
         vehicle.views_count += 1
+        AnalyticsService.record(db, vehicle.id, "views")
         db.commit()
     
     @staticmethod
     def toggle_featured(db: Session, vehicle: Vehicle) -> Vehicle:
         """Toggle the featured status of a vehicle."""
         vehicle.is_featured = not vehicle.is_featured
+        VehicleService.record_changes(db, [vehicle.id])
         db.commit()
         db.refresh(vehicle)
         return vehicle
@@ -167,9 +345,14 @@ class VehicleService:
         vehicle_id: str,
         image_url: str,
         is_primary: bool = False,
-        display_order: int = 0
+        display_order: int = 0,
+        metadata: Optional[dict] = None
     ) -> VehicleImage:
-        """Add an image to a vehicle."""
+        """
+        Add an image to a vehicle.
+        
+        metadata may carry width, height and placeholder from ImageService.
+        """
         # If this is primary, unset other primary images
         if is_primary:
             db.query(VehicleImage).filter(
@@ -181,23 +364,148 @@ class VehicleService:
             vehicle_id=vehicle_id,
             image_url=image_url,
             is_primary=is_primary,
-            display_order=display_order
+            display_order=display_order,
+            **(metadata or {})
         )
         db.add(image)
+        VehicleService.record_changes(db, [vehicle_id])
         db.commit()
         db.refresh(image)
         return image
     
+    @staticmethod
+    def add_images(
+        db: Session,
+        vehicle_id: str,
+        image_urls: List[str],
+        primary_index: Optional[int] = None,
+        metadata: Optional[List[dict]] = None
+    ) -> List[VehicleImage]:
+        """
+        Add several images to a vehicle in a single transaction.
+        
+        Images are appended after the vehicle's existing images in the
+        given order. primary_index marks one of them as the primary image.
+        metadata, if given, is parallel to image_urls.
+        """
+        if not image_urls:
+            return []
+        
+        max_order = db.query(func.max(VehicleImage.display_order)).filter(
+            VehicleImage.vehicle_id == vehicle_id
+        ).scalar()
+        next_order = 0 if max_order is None else max_order + 1
+        
+        if primary_index is not None:
+            db.query(VehicleImage).filter(
+                VehicleImage.vehicle_id == vehicle_id,
+                VehicleImage.is_primary == True
+            ).update({"is_primary": False})
+        
+        metadata = metadata or [{}] * len(image_urls)
+        images = [
+            VehicleImage(
+                vehicle_id=vehicle_id,
+                image_url=image_url,
+                is_primary=(index == primary_index),
+                display_order=next_order + index,
+                **meta
+            )
+            for index, (image_url, meta) in enumerate(zip(image_urls, metadata))
+        ]
+        db.add_all(images)
+        db.flush()
+        ids = [image.id for image in images]
+        VehicleService.record_changes(db, [vehicle_id])
+        db.commit()
+        
+        # Reload all rows in one query rather than one refresh per image
+        db.query(VehicleImage).filter(VehicleImage.id.in_(ids)).all()
+        return images
+    
     @staticmethod
     def delete_image(db: Session, image_id: str) -> bool:
         """Delete a vehicle image."""
         image = db.query(VehicleImage).filter(VehicleImage.id == image_id).first()
         if image:
+            VehicleService.record_changes(db, [image.vehicle_id])
             db.delete(image)
             db.commit()
             return True
         return False
     
+    @staticmethod
+    def record_changes(
+        db: Session,
+        vehicle_ids: Iterable[str],
+        op: str = "upsert"
+    ) -> None:
+        """
+        Append vehicles to the change log without committing.
+        
+        Call inside the transaction that makes the change, so the log
+        entry commits (or rolls back) with it.
+        """
+        now = datetime.utcnow()
+        rows = [
+            {"vehicle_id": vehicle_id, "op": op, "changed_at": now}
+            for vehicle_id in dict.fromkeys(vehicle_ids)
+        ]
+        if rows:
+            db.execute(insert(VehicleChange), rows)
+    
+    @staticmethod
+    def get_changes(
+        db: Session,
+        since: int = 0,
+        limit: int = 100
+    ) -> Tuple[List[Dict[str, Any]], int, bool]:
+        """
+        Get vehicle changes after sequence number since.
+        
+        Reads up to limit log entries and collapses them to the latest
+        entry per vehicle, with the vehicle's current state attached
+        (None for deletions). Returns tuple of (changes, next_since, has_more).
+        
+        View counts are not logged, so views_count in a delta may lag.
+        """
+        entries = db.query(VehicleChange).filter(
+            VehicleChange.seq > since
+        ).order_by(VehicleChange.seq).limit(limit + 1).all()
+        
+        has_more = len(entries) > limit
+        entries = entries[:limit]
+        if not entries:
+            return [], since, False
+        
+        # Latest entry per vehicle, ordered by that entry's seq
+        latest: Dict[str, VehicleChange] = {}
+        for entry in entries:
+            latest.pop(entry.vehicle_id, None)
+            latest[entry.vehicle_id] = entry
+        
+        upserted = [vehicle_id for vehicle_id, entry in latest.items() if entry.op == "upsert"]
+        vehicles = {}
+        if upserted:
+            vehicles = {
+                vehicle.id: vehicle for vehicle in
+                db.query(Vehicle).options(selectinload(Vehicle.images)).filter(Vehicle.id.in_(upserted))
+            }
+        
+        changes = []
+        for vehicle_id, entry in latest.items():
+            vehicle = vehicles.get(vehicle_id)
+            changes.append({
+                "seq": entry.seq,
+                "vehicle_id": vehicle_id,
+                # Deleted by a later change beyond this batch
+                "op": "upsert" if vehicle is not None else "delete",
+                "changed_at": entry.changed_at,
+                "vehicle": vehicle,
+            })
+        
+        return changes, entries[-1].seq, has_more
+    
     @staticmethod
     def get_makes(db: Session) -> List[str]:
         """Get list of unique vehicle makes."""
@@ -0,0 +1,262 @@
+"""
+Benchmark
+
+Times the main API paths in-process against the configured database and
+writes the results as JSON, so runs can be compared across commits.
+Generate data first with scripts.generate_inventory.
+
+Usage:
+    DATABASE_URL=sqlite:///./bench.db python -m scripts.benchmark --output bench.json
+    python -m scripts.benchmark --compare bench-main.json --output bench-branch.json
+"""
+
+import sys
+import os
+import io
+import json
+import time
+import random
+import platform
+import argparse
+import statistics
+import subprocess
+from datetime import datetime
+
+# Add the parent directory to sys.path to resolve imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Measure the app, not the limiter or profiler
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+os.environ.setdefault("PROFILER_ENABLED", "false")
+os.environ.setdefault("LOG_REQUESTS", "false")
+
+from fastapi.testclient import TestClient
+from PIL import Image
+
+from app.main import app
+from app.core.config import get_settings
+from app.core.database import SessionLocal
+from app.models import Vehicle, Enquiry, SellRequest
+from app.services import ImageService
+
+settings = get_settings()
+
+# (name, query string) pairs for the public listing
+LIST_QUERIES = [
+    ("list_default", ""),
+    ("list_make", "make=Toyota"),
+    ("list_make_model", "make=Toyota&model=Axio"),
+    ("list_price_range", "min_price=1000000&max_price=3000000"),
+    ("list_body_transmission", "body_type=SUV&transmission=Automatic"),
+    ("list_year_sort_price", "min_year=2015&max_year=2020&sort_by=price&sort_order=asc"),
+    ("list_available_location", "availability_status=available&location=Nairobi"),
+    ("list_search", "search=prado"),
+    ("list_deep_page", "page=200&limit=50"),
+]
+
+
+def percentile(samples: list, fraction: float) -> float:
+    """Nearest-rank percentile of sorted samples."""
+    return samples[min(len(samples) - 1, int(round(fraction * (len(samples) - 1))))]
+
+
+def db_query_count(response) -> int:
+    """Read the statement count from the Server-Timing header, or -1 if absent."""
+    for metric in response.headers.get("server-timing", "").split(","):
+        if metric.strip().startswith("db;") and 'desc="' in metric:
+            return int(metric.split('desc="')[1].split()[0])
+    return -1
+
+
+def run_scenario(name: str, request, iterations: int, warmup: int) -> dict:
+    """Call request() repeatedly and summarize latency and SQL counts."""
+    for _ in range(warmup):
+        request()
+    
+    timings, queries, errors = [], [], 0
+    for _ in range(iterations):
+        started = time.perf_counter()
+        response = request()
+        timings.append((time.perf_counter() - started) * 1000)
+        queries.append(db_query_count(response))
+        if response.status_code >= 400:
+            errors += 1
+    
+    timings.sort()
+    result = {
+        "name": name,
+        "iterations": iterations,
+        "errors": errors,
+        "mean_ms": round(statistics.fmean(timings), 3),
+        "median_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(percentile(timings, 0.95), 3),
+        "min_ms": round(timings[0], 3),
+        "max_ms": round(timings[-1], 3),
+        "db_queries": max(queries),
+    }
+    print(
+        f"{name:<28} median {result['median_ms']:>9.2f}ms  p95 {result['p95_ms']:>9.2f}ms  "
+        f"queries {result['db_queries']:>3}  errors {errors}"
+    )
+    return result
+
+
+def sample_image() -> bytes:
+    """A camera-sized JPEG with some detail, so encoding does real work."""
+    img = Image.linear_gradient("L").resize((2400, 1800)).convert("RGB")
+    output = io.BytesIO()
+    img.save(output, format="JPEG", quality=92)
+    return output.getvalue()
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except Exception:
+        return "unknown"
+
+
+def dataset_size() -> dict:
+    db = SessionLocal()
+    try:
+        return {
+            "vehicles": db.query(Vehicle).count(),
+            "enquiries": db.query(Enquiry).count(),
+            "sell_requests": db.query(SellRequest).count(),
+        }
+    finally:
+        db.close()
+
+
+def run_benchmarks(args) -> dict:
+    """Run every selected scenario and return the report."""
+    rng = random.Random(args.seed)
+    results = []
+    
+    with TestClient(app) as client:
+        login = {"email": settings.admin_email, "password": settings.admin_password}
+        token = client.post("/api/auth/login", json=login).json()["access_token"]
+        auth = {"Authorization": f"Bearer {token}"}
+        
+        db = SessionLocal()
+        try:
+            vehicle_ids = [row.id for row in db.query(Vehicle.id).limit(1000)]
+        finally:
+            db.close()
+        
+        scenarios = [
+            (name, lambda query=query: client.get(f"/api/vehicles?{query}"))
+            for name, query in LIST_QUERIES
+        ]
+        if vehicle_ids:
+            scenarios.append((
+                "vehicle_detail",
+                lambda: client.get(f"/api/vehicles/{rng.choice(vehicle_ids)}")
+            ))
+        scenarios += [
+            ("featured", lambda: client.get("/api/vehicles/featured")),
+            ("dashboard", lambda: client.get("/api/admin/dashboard", headers=auth)),
+            ("sitemap", lambda: client.get("/api/sitemap.xml")),
+        ]
+        
+        selected = [s for s in scenarios if not args.only or any(o in s[0] for o in args.only)]
+        for name, request in selected:
+            results.append(run_scenario(name, request, args.iterations, args.warmup))
+        
+        # Login is dominated by bcrypt, so a few runs are enough
+        if not args.only or any(o in "login" for o in args.only):
+            results.append(run_scenario(
+                "login",
+                lambda: client.post("/api/auth/login", json=login),
+                max(3, args.iterations // 10),
+                1
+            ))
+        
+        if not args.only or any(o in "upload" for o in args.only):
+            results.append(benchmark_upload(client, auth, args))
+    
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.utcnow().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": settings.database_url.split(":")[0],
+            "dataset": dataset_size(),
+            "iterations": args.iterations,
+        },
+        "results": results,
+    }
+
+
+def benchmark_upload(client, auth: dict, args) -> dict:
+    """Upload images to a scratch vehicle, then remove it and the files."""
+    data = sample_image()
+    vehicle = client.post(
+        "/api/admin/vehicles",
+        json={"make": "Benchmark", "model": "Upload", "year": 2020, "price": 1},
+        headers=auth
+    ).json()
+    uploaded = []
+    
+    def upload():
+        response = client.post(
+            f"/api/admin/vehicles/{vehicle['id']}/upload-image",
+            files={"file": ("photo.jpg", data, "image/jpeg")},
+            headers=auth
+        )
+        if response.status_code < 400:
+            uploaded.append(response.json())
+        return response
+    
+    try:
+        return run_scenario("upload_image", upload, max(3, args.iterations // 5), 1)
+    finally:
+        # Deleting rows leaves files behind, so remove those too
+        for image in uploaded:
+            client.delete(f"/api/admin/vehicles/images/{image['id']}", headers=auth)
+            ImageService.delete_image(image["image_url"])
+        client.delete(f"/api/admin/vehicles/{vehicle['id']}", headers=auth)
+
+
+def compare(report: dict, baseline_path: str) -> None:
+    """Print the median change per scenario against an earlier report."""
+    with open(baseline_path) as f:
+        baseline = {r["name"]: r for r in json.load(f)["results"]}
+    
+    print(f"\nvs {baseline_path}:")
+    for result in report["results"]:
+        before = baseline.get(result["name"])
+        if not before:
+            continue
+        change = (result["median_ms"] - before["median_ms"]) / before["median_ms"] * 100
+        print(
+            f"{result['name']:<28} {before['median_ms']:>9.2f}ms -> {result['median_ms']:>9.2f}ms "
+            f"({change:+.1f}%)  queries {before['db_queries']} -> {result['db_queries']}"
+        )
+
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark the API against the configured database.")
+    parser.add_argument("--iterations", type=int, default=50, help="Timed calls per scenario (default 50)")
+    parser.add_argument("--warmup", type=int, default=3, help="Untimed calls first (default 3)")
+    parser.add_argument("--only", nargs="*", help="Run scenarios whose name contains any of these")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write the JSON report here")
+    parser.add_argument("--compare", help="Earlier JSON report to compare against")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    report = run_benchmarks(args)
+    
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {args.output}")
+    if args.compare:
+        compare(report, args.compare)
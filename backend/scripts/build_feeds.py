@@ -0,0 +1,46 @@
+"""
+Build Feeds
+
+Brings marketplace feeds up to date on disk, for running from cron so
+partners never wait on a build. Only vehicles changed since the last
+build are re-rendered unless --full is given.
+
+Usage: python -m scripts.build_feeds [google csv ...] [--full]
+"""
+
+import sys
+import os
+import json
+import argparse
+
+# Add the parent directory to sys.path to resolve imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.config import get_settings
+from app.core.database import SessionLocal
+from app.services import FeedService
+
+settings = get_settings()
+
+
+def build_feeds(args) -> None:
+    """Build each requested feed and print its stats."""
+    db = SessionLocal()
+    try:
+        for name in args.feeds or settings.feed_formats_list:
+            stats = FeedService.build(db, name, full=args.full)
+            print(f"{FeedService.feed_path(name)}: {json.dumps(stats)}")
+    finally:
+        db.close()
+
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Build marketplace feeds.")
+    parser.add_argument("feeds", nargs="*", help="Feed names (default: all enabled)")
+    parser.add_argument("--full", action="store_true", help="Re-render every vehicle instead of only changed ones")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    build_feeds(parse_args())
@@ -0,0 +1,335 @@
+"""
+Generate Synthetic Inventory
+
+Bulk-inserts a large, realistic-looking inventory for benchmarking:
+vehicles with images, enquiries and sell requests. Rows are built in
+memory and inserted in batches with executemany, so 1M vehicles is
+practical on SQLite.
+
+Usage: python -m scripts.generate_inventory --vehicles 100000 [--seed 42] [--reset]
+"""
+
+import sys
+import os
+import math
+import time
+import random
+import argparse
+from datetime import datetime, timedelta
+
+# Add the parent directory to sys.path to resolve imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import insert
+
+from app.core.database import SessionLocal, init_db
+from app.models import Vehicle, VehicleImage, VehicleStatusEvent, Enquiry, SellRequest
+from app.models.base import generate_uuid
+from app.services.fx_service import FxService
+from app.services.vehicle_service import VehicleService
+
+# make -> (share of listings, [(model, body type, typical new price in KSH, engine)])
+CATALOG = {
+    "Toyota": (0.38, [
+        ("Vitz", "Hatchback", 1_600_000, "1300cc"),
+        ("Axio", "Sedan", 2_100_000, "1500cc"),
+        ("Fielder", "Wagon", 2_200_000, "1500cc"),
+        ("Harrier", "SUV", 5_200_000, "2000cc"),
+        ("Land Cruiser Prado", "SUV", 9_500_000, "2800cc"),
+        ("Hilux", "Pickup", 5_000_000, "2400cc"),
+        ("Probox", "Van", 1_700_000, "1500cc"),
+    ]),
+    "Nissan": (0.16, [
+        ("Note", "Hatchback", 1_500_000, "1200cc"),
+        ("X-Trail", "SUV", 4_000_000, "2000cc"),
+        ("Navara", "Pickup", 4_600_000, "2500cc"),
+        ("Sylphy", "Sedan", 2_200_000, "1800cc"),
+    ]),
+    "Mazda": (0.09, [
+        ("Demio", "Hatchback", 1_500_000, "1300cc"),
+        ("CX-5", "SUV", 4_200_000, "2200cc"),
+        ("Axela", "Sedan", 2_300_000, "1500cc"),
+    ]),
+    "Subaru": (0.08, [
+        ("Forester", "SUV", 3_900_000, "2000cc"),
+        ("Impreza", "Hatchback", 2_400_000, "1600cc"),
+        ("Outback", "Wagon", 4_300_000, "2500cc"),
+    ]),
+    "Honda": (0.07, [
+        ("Fit", "Hatchback", 1_600_000, "1300cc"),
+        ("CR-V", "SUV", 4_100_000, "2000cc"),
+        ("Vezel", "SUV", 3_100_000, "1500cc"),
+    ]),
+    "Mercedes-Benz": (0.06, [
+        ("C200", "Sedan", 6_500_000, "2000cc"),
+        ("E250", "Sedan", 8_500_000, "2000cc"),
+        ("GLE 350", "SUV", 14_000_000, "3000cc"),
+    ]),
+    "BMW": (0.04, [
+        ("320i", "Sedan", 6_000_000, "2000cc"),
+        ("X5", "SUV", 13_000_000, "3000cc"),
+    ]),
+    "Volkswagen": (0.04, [
+        ("Golf", "Hatchback", 2_800_000, "1400cc"),
+        ("Tiguan", "SUV", 4_800_000, "2000cc"),
+    ]),
+    "Mitsubishi": (0.04, [
+        ("Outlander", "SUV", 3_800_000, "2400cc"),
+        ("L200", "Pickup", 4_200_000, "2500cc"),
+    ]),
+    "Land Rover": (0.02, [
+        ("Range Rover Sport", "SUV", 18_000_000, "3000cc"),
+        ("Discovery", "SUV", 12_000_000, "3000cc"),
+    ]),
+    "Isuzu": (0.02, [
+        ("D-Max", "Pickup", 4_400_000, "3000cc"),
+    ]),
+}
+
+COLORS = (["White"] * 5 + ["Silver"] * 3 + ["Black"] * 3 + ["Grey"] * 2
+          + ["Blue", "Red", "Pearl White", "Wine Red", "Green"])
+LOCATIONS = ["Nairobi"] * 6 + ["Mombasa"] * 2 + ["Kisumu", "Nakuru", "Eldoret", "Thika"]
+FEATURES = [
+    "Air Conditioning", "Power Windows", "Central Locking", "ABS Brakes", "Airbags",
+    "Alloy Wheels", "Reverse Camera", "Leather Seats", "Sunroof", "Cruise Control",
+    "Navigation", "Keyless Entry", "Push Start", "Bluetooth", "4WD", "Apple CarPlay",
+]
+STATUSES = (["available", "sold", "reserved", "direct_import"], [0.68, 0.22, 0.04, 0.06])
+ENQUIRY_STATUSES = (["new", "contacted", "qualified", "closed"], [0.25, 0.35, 0.15, 0.25])
+ENQUIRY_TYPES = (["purchase", "test_drive", "finance", "general"], [0.55, 0.2, 0.15, 0.1])
+SELL_STATUSES = (["pending", "reviewing", "valued", "accepted", "rejected"], [0.3, 0.2, 0.2, 0.15, 0.15])
+FIRST_NAMES = ["James", "Mary", "John", "Grace", "Peter", "Faith", "David", "Joy", "Brian", "Mercy", "Kevin", "Ann"]
+LAST_NAMES = ["Kamau", "Otieno", "Wanjiru", "Mwangi", "Achieng", "Kiprop", "Njoroge", "Mutua", "Wambui", "Odhiambo"]
+
+
+def weighted(rng: random.Random, choices) -> str:
+    """Pick one value from a (values, weights) pair."""
+    values, weights = choices
+    return rng.choices(values, weights)[0]
+
+
+def random_datetime(rng: random.Random, now: datetime, max_days: int) -> datetime:
+    """A time within the past max_days, biased towards recent."""
+    return now - timedelta(days=max_days * rng.random() ** 1.5, seconds=rng.randrange(86400))
+
+
+def random_customer(rng: random.Random, index: int) -> dict:
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    return {
+        "customer_name": f"{first} {last}",
+        "customer_email": f"{first.lower()}.{last.lower()}{index}@example.com",
+        "customer_phone": f"07{rng.randrange(10**8):08d}",
+    }
+
+
+def build_vehicle(rng: random.Random, makes: list, make_weights: list, now: datetime) -> dict:
+    """One vehicle row with a plausible price for its model, age and mileage."""
+    make = rng.choices(makes, make_weights)[0]
+    model, body_type, new_price, engine = rng.choice(CATALOG[make][1])
+    
+    # Imports cluster around 6-10 years old
+    year = int(round(rng.triangular(now.year - 16, now.year, now.year - 8)))
+    age = max(now.year - year, 0)
+    mileage = int(max(age, 0.5) * rng.lognormvariate(math.log(14_000), 0.35))
+    
+    # ~11% depreciation a year, with listing-to-listing noise, rounded like real prices
+    price = new_price * 0.89 ** age * rng.lognormvariate(0, 0.12)
+    price = round(price / 10_000) * 10_000
+    
+    created_at = random_datetime(rng, now, 730)
+    status = weighted(rng, STATUSES)
+    # Most sell within a couple of months of listing
+    sold_at = None
+    if status == "sold":
+        sold_at = min(created_at + timedelta(days=rng.lognormvariate(math.log(35), 0.6)), now)
+    updated_at = created_at + timedelta(days=rng.random() * 30)
+    return {
+        "id": generate_uuid(),
+        "make": make,
+        "model": model,
+        "year": year,
+        "price": price,
+        "currency": "KSH",
+        "mileage": mileage,
+        "body_type": body_type,
+        "transmission": "Manual" if body_type in ("Pickup", "Van") and rng.random() < 0.6 else "Automatic",
+        "fuel_type": weighted(rng, (["Petrol", "Diesel", "Hybrid"], [0.7, 0.22, 0.08])),
+        "condition": weighted(rng, (["Excellent", "Good", "Fair"], [0.35, 0.5, 0.15])),
+        "color": rng.choice(COLORS),
+        "engine_capacity": engine,
+        "availability_status": status,
+        "location": rng.choice(LOCATIONS),
+        "description": f"Clean {year} {make} {model}, {mileage:,} km, {engine}. Well maintained.",
+        "features": rng.sample(FEATURES, rng.randint(3, 9)),
+        "is_featured": rng.random() < 0.03,
+        "views_count": int(rng.paretovariate(1.5) * 20),
+        "sold_at": sold_at,
+        "created_at": created_at,
+        "updated_at": max(updated_at, sold_at) if sold_at else updated_at,
+    }
+
+
+def build_status_events(vehicle: dict) -> list:
+    """Status history for a vehicle: listed, then sold if it was."""
+    if vehicle["sold_at"] is None:
+        return [{
+            "vehicle_id": vehicle["id"],
+            "from_status": None,
+            "to_status": vehicle["availability_status"],
+            "changed_at": vehicle["created_at"],
+        }]
+    return [
+        {
+            "vehicle_id": vehicle["id"],
+            "from_status": None,
+            "to_status": "available",
+            "changed_at": vehicle["created_at"],
+        },
+        {
+            "vehicle_id": vehicle["id"],
+            "from_status": "available",
+            "to_status": "sold",
+            "changed_at": vehicle["sold_at"],
+        },
+    ]
+
+
+def build_images(rng: random.Random, vehicle_id: str, count: int, uploaded_at: datetime) -> list:
+    return [
+        {
+            "id": generate_uuid(),
+            "vehicle_id": vehicle_id,
+            "image_url": f"/uploads/vehicles/synthetic-{rng.randrange(500):03d}.jpg",
+            "is_primary": order == 0,
+            "display_order": order,
+            "uploaded_at": uploaded_at,
+            "width": 1200,
+            "height": 900,
+        }
+        for order in range(count)
+    ]
+
+
+def build_enquiry(rng: random.Random, vehicle_id: str, index: int, now: datetime) -> dict:
+    return {
+        "id": generate_uuid(),
+        "vehicle_id": vehicle_id,
+        **random_customer(rng, index),
+        "message": "Is this vehicle still available? I'd like to view it.",
+        "enquiry_type": weighted(rng, ENQUIRY_TYPES),
+        "status": weighted(rng, ENQUIRY_STATUSES),
+        "created_at": random_datetime(rng, now, 180),
+    }
+
+
+def build_sell_request(rng: random.Random, makes: list, make_weights: list, index: int, now: datetime) -> dict:
+    vehicle = build_vehicle(rng, makes, make_weights, now)
+    status = weighted(rng, SELL_STATUSES)
+    created_at = random_datetime(rng, now, 365)
+    return {
+        "id": generate_uuid(),
+        **random_customer(rng, index),
+        "vehicle_make": vehicle["make"],
+        "vehicle_model": vehicle["model"],
+        "vehicle_year": vehicle["year"],
+        "mileage": vehicle["mileage"],
+        "condition": vehicle["condition"],
+        "asking_price": vehicle["price"] * 1.1,
+        "service_type": weighted(rng, (["sell_on_behalf", "direct_purchase"], [0.7, 0.3])),
+        "status": status,
+        "valuation_amount": vehicle["price"] * 0.9 if status in ("valued", "accepted") else None,
+        "created_at": created_at,
+        "updated_at": created_at,
+    }
+
+
+def generate_inventory(args) -> None:
+    """Insert the requested volume of synthetic data in batches."""
+    rng = random.Random(args.seed)
+    now = datetime.utcnow()
+    makes = list(CATALOG)
+    make_weights = [CATALOG[make][0] for make in makes]
+    
+    init_db()
+    db = SessionLocal()
+    try:
+        if args.reset:
+            print("Deleting existing vehicles, images, enquiries and sell requests...")
+            # Log the deletions so the change feed and its consumers drop them
+            VehicleService.record_changes(
+                db, [vehicle_id for (vehicle_id,) in db.query(Vehicle.id)], op="delete"
+            )
+            for model in (Enquiry, VehicleImage, VehicleStatusEvent, Vehicle, SellRequest):
+                db.query(model).delete()
+            db.commit()
+        
+        rates = FxService.get_rates(db)
+        started = time.monotonic()
+        inserted = 0
+        enquiry_index = 0
+        while inserted < args.vehicles:
+            batch_size = min(args.batch_size, args.vehicles - inserted)
+            vehicles, images, status_events, enquiries = [], [], [], []
+            
+            for _ in range(batch_size):
+                vehicle = build_vehicle(rng, makes, make_weights, now)
+                vehicle["price_ksh"] = FxService.to_ksh(db, vehicle["price"], vehicle["currency"], rates)
+                vehicles.append(vehicle)
+                status_events.extend(build_status_events(vehicle))
+                images.extend(build_images(
+                    rng, vehicle["id"], rng.randint(1, args.max_images), vehicle["created_at"]
+                ))
+                # Enquiries per vehicle are heavy-tailed: most get none, a few get many
+                enquiry_count = 0
+                if args.enquiries_per_vehicle > 0:
+                    enquiry_count = int(rng.expovariate(1 / args.enquiries_per_vehicle))
+                for _ in range(enquiry_count):
+                    enquiry_index += 1
+                    enquiries.append(build_enquiry(rng, vehicle["id"], enquiry_index, now))
+            
+            db.execute(insert(Vehicle), vehicles)
+            db.execute(insert(VehicleImage), images)
+            db.execute(insert(VehicleStatusEvent), status_events)
+            if enquiries:
+                db.execute(insert(Enquiry), enquiries)
+            VehicleService.record_changes(db, [vehicle["id"] for vehicle in vehicles])
+            db.commit()
+            
+            inserted += batch_size
+            rate = inserted / (time.monotonic() - started)
+            print(f"{inserted}/{args.vehicles} vehicles ({rate:.0f}/s)")
+        
+        sell_requests = [
+            build_sell_request(rng, makes, make_weights, index, now)
+            for index in range(int(args.vehicles * args.sell_request_ratio))
+        ]
+        for start in range(0, len(sell_requests), args.batch_size):
+            db.execute(insert(SellRequest), sell_requests[start:start + args.batch_size])
+        db.commit()
+        
+        print(
+            f"Done in {time.monotonic() - started:.1f}s: {args.vehicles} vehicles, "
+            f"{enquiry_index} enquiries, {len(sell_requests)} sell requests"
+        )
+    finally:
+        db.close()
+
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Bulk-insert a synthetic inventory for benchmarking.")
+    parser.add_argument("--vehicles", type=int, default=10_000, help="Vehicles to create (default 10000)")
+    parser.add_argument("--max-images", type=int, default=8, help="Max images per vehicle (default 8)")
+    parser.add_argument("--enquiries-per-vehicle", type=float, default=0.5, help="Mean enquiries per vehicle")
+    parser.add_argument("--sell-request-ratio", type=float, default=0.05, help="Sell requests per vehicle")
+    parser.add_argument("--batch-size", type=int, default=5_000, help="Rows per insert batch and commit")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed, for repeatable datasets")
+    parser.add_argument("--reset", action="store_true", help="Delete existing inventory first")
+    args = parser.parse_args(argv)
+    if args.enquiries_per_vehicle < 0:
+        parser.error("--enquiries-per-vehicle must not be negative")
+    return args
+
+
+if __name__ == "__main__":
+    generate_inventory(parse_args())
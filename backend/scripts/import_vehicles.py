@@ -0,0 +1,67 @@
+"""
+Import Vehicles
+
+Bulk-imports vehicles from a CSV or JSON Lines file, with an optional zip
+of images, using the same pipeline as the admin import endpoint.
+
+Usage: python -m scripts.import_vehicles stock.csv [--images photos.zip]
+"""
+
+import sys
+import os
+import argparse
+
+# Add the parent directory to sys.path to resolve imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.database import SessionLocal
+from app.services import VehicleImportService
+
+
+def print_progress(job) -> None:
+    print(
+        f"{job.processed_rows}/{job.total_rows} rows: {job.created_count} created, "
+        f"{job.updated_count} updated, {job.failed_count} failed, {job.images_attached} images"
+    )
+
+
+def import_vehicles(args) -> int:
+    """Run the import in this process. Returns an exit code."""
+    db = SessionLocal()
+    try:
+        job = VehicleImportService.create_job(
+            db,
+            os.path.abspath(args.path),
+            os.path.basename(args.path),
+            images_path=os.path.abspath(args.images) if args.images else None
+        )
+        job_id = job.id
+    finally:
+        db.close()
+    
+    VehicleImportService.run_job(job_id, on_progress=print_progress)
+    
+    db = SessionLocal()
+    try:
+        job = VehicleImportService.get_job(db, job_id)
+        for error in job.errors or []:
+            print(f"  row {error['row']}: {'; '.join(error['errors'])}")
+        if job.status == "failed":
+            print(f"Import failed: {job.error_message}")
+            return 1
+        print(f"Done: {job.created_count} created, {job.updated_count} updated, {job.failed_count} failed")
+        return 0 if job.failed_count == 0 else 2
+    finally:
+        db.close()
+
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Bulk-import vehicles from CSV or JSON Lines.")
+    parser.add_argument("path", help="Path to a .csv, .jsonl or .ndjson file")
+    parser.add_argument("--images", help="Zip of images named in the rows' images field")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(import_vehicles(parse_args()))
@@ -0,0 +1,173 @@
+"""
+Reprocess Images
+
+Re-runs the current image optimization over every stored vehicle and
+sell request image, shrinking files encoded before it existed and filling
+in image metadata. Progress is checkpointed so the job can be stopped and
+resumed, and throttled so it can run next to production traffic.
+
+Usage: python -m scripts.reprocess_images [--workers 2] [--rate 5] [--reset]
+"""
+
+import sys
+import os
+import json
+import time
+import argparse
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# Add the parent directory to sys.path to resolve imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.config import get_settings
+from app.core.database import SessionLocal
+from app.models import VehicleImage, SellRequestImage
+from app.services import ImageService, RenditionService
+
+settings = get_settings()
+
+# Tables to walk, in order: (checkpoint key, model, stores metadata)
+TABLES = [
+    ("vehicle_images", VehicleImage, True),
+    ("sell_request_images", SellRequestImage, False),
+]
+
+
+def url_to_path(image_url: str) -> Path:
+    """Convert an /uploads/... URL into a file path."""
+    return Path(image_url.lstrip("/"))
+
+
+def reprocess_one(image_url: str, dry_run: bool = False) -> dict:
+    """
+    Reprocess a single image file.
+    
+    Runs in a worker process. Returns a result dict for the parent.
+    """
+    file_path = url_to_path(image_url)
+    if image_url.startswith("http") or not file_path.is_file():
+        return {"status": "missing"}
+    
+    try:
+        old_size, new_size, metadata = ImageService.reoptimize_file(str(file_path), dry_run=dry_run)
+    except Exception as e:
+        return {"status": "failed", "error": str(e)}
+    
+    return {
+        "status": "shrunk" if new_size < old_size else "kept",
+        "old_size": old_size,
+        "new_size": new_size,
+        "metadata": metadata,
+    }
+
+
+def load_checkpoint(path: Path) -> dict:
+    """Load the checkpoint file, or start fresh."""
+    if path.exists():
+        return json.loads(path.read_text())
+    return {"last_ids": {}, "stats": {}}
+
+
+def save_checkpoint(path: Path, checkpoint: dict) -> None:
+    """Write the checkpoint atomically."""
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(checkpoint, indent=2))
+    os.replace(tmp_path, path)
+
+
+def reprocess_table(pool, db, key, model, has_metadata, checkpoint, args) -> None:
+    """Walk one image table in id order, a batch at a time."""
+    stats = checkpoint["stats"].setdefault(
+        key, {"processed": 0, "shrunk": 0, "missing": 0, "failed": 0, "bytes_saved": 0}
+    )
+    
+    while True:
+        last_id = checkpoint["last_ids"].get(key, "")
+        rows = db.query(model.id, model.image_url).filter(
+            model.id > last_id
+        ).order_by(model.id).limit(args.batch_size).all()
+        
+        if not rows:
+            break
+        
+        started = time.monotonic()
+        worker = partial(reprocess_one, dry_run=args.dry_run)
+        results = list(pool.map(worker, [row.image_url for row in rows]))
+        
+        updates = []
+        for row, result in zip(rows, results):
+            stats["processed"] += 1
+            if result["status"] in ("missing", "failed"):
+                stats[result["status"]] += 1
+                if result["status"] == "failed":
+                    print(f"  Failed {row.image_url}: {result['error']}")
+                continue
+            
+            if result["status"] == "shrunk":
+                stats["shrunk"] += 1
+                stats["bytes_saved"] += result["old_size"] - result["new_size"]
+                
+                # Drop renditions cut from the old encoding
+                if not args.dry_run:
+                    relative = url_to_path(row.image_url).relative_to(settings.upload_dir)
+                    RenditionService.invalidate(str(relative))
+            
+            if has_metadata and result["metadata"]:
+                updates.append({"id": row.id, **result["metadata"]})
+        
+        if updates and not args.dry_run:
+            db.bulk_update_mappings(model, updates)
+            db.commit()
+        
+        checkpoint["last_ids"][key] = rows[-1].id
+        if not args.dry_run:
+            save_checkpoint(args.checkpoint, checkpoint)
+        print(
+            f"[{key}] {stats['processed']} processed, {stats['shrunk']} shrunk, "
+            f"{stats['bytes_saved'] / 1024 / 1024:.1f}MB saved"
+        )
+        
+        # Throttle: hold the batch to --rate images/sec, plus any fixed pause
+        if args.rate:
+            remaining = len(rows) / args.rate - (time.monotonic() - started)
+            if remaining > 0:
+                time.sleep(remaining)
+        if args.pause:
+            time.sleep(args.pause)
+
+
+def reprocess_images(args) -> None:
+    """Reprocess every image table, resuming from the checkpoint."""
+    if args.reset and args.checkpoint.exists():
+        args.checkpoint.unlink()
+    checkpoint = load_checkpoint(args.checkpoint)
+    
+    db = SessionLocal()
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            for key, model, has_metadata in TABLES:
+                reprocess_table(pool, db, key, model, has_metadata, checkpoint, args)
+    finally:
+        db.close()
+    
+    print("Done.")
+    print(json.dumps(checkpoint["stats"], indent=2))
+
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Reprocess stored images with current optimization settings.")
+    parser.add_argument("--workers", type=int, default=2, help="Worker processes (default 2)")
+    parser.add_argument("--batch-size", type=int, default=50, help="Images per batch and DB commit (default 50)")
+    parser.add_argument("--rate", type=float, default=0, help="Max images per second, 0 for unlimited")
+    parser.add_argument("--pause", type=float, default=0, help="Seconds to sleep between batches")
+    parser.add_argument("--checkpoint", type=Path, default=Path("reprocess_images.checkpoint.json"))
+    parser.add_argument("--reset", action="store_true", help="Ignore any checkpoint and start over")
+    parser.add_argument("--dry-run", action="store_true", help="Report savings without writing files or DB rows")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    reprocess_images(parse_args())